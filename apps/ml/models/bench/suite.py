@@ -0,0 +1,251 @@
+from __future__ import annotations
+
+import json
+import logging
+import math
+import pathlib
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+import numpy as np
+import pandas as pd
+
+from bench.synthetic import SyntheticScale, write_bronze
+from shared.data_loader import build_gold_multiyear, load_bronze
+from shared.features import FORECAST_HORIZONS, build_feature_matrix_all_years
+from shared.run_report import RunReport
+from shared.temporal import TemporalFeatureEngineering, TemporalProjector
+from train_model import BASE_KEYS, CVStep, TrainConfig, build_models
+
+LOG = logging.getLogger("train")
+
+BASELINE_VERSION = 1
+
+# Stages timed at every scale, in pipeline order.
+STAGES: tuple[str, ...] = ("load_bronze", "build_gold_multiyear", "compute_lag_features", "cv", "fit_projector", "project_batch")
+
+
+@dataclass(frozen=True)
+class BenchSettings:
+    """
+    Knobs that change what a stage does (not just how big its input is);
+    results are only compared against a baseline recorded with the same
+    settings.
+    """
+
+    # Trees / boosting rounds per model (None: the tuned counts).  Capped by
+    # default so the larger scales finish in minutes.
+    n_estimators: Optional[int] = 50
+    cv_splits: int = 5
+    # Countries projected by project_batch (None: all).  Its cost is per
+    # country, so a cap keeps the big scales tractable without hiding a
+    # superlinear step: the stage's ``n`` records how many ran.
+    project_countries: Optional[int] = 2000
+    bronze_workers: int = 5
+
+
+def _models(settings: BenchSettings, n_jobs: int) -> dict[str, Any]:
+    models = build_models(n_jobs=n_jobs)
+    if settings.n_estimators is not None:
+        for mdl in models.values():
+            mdl.set_params(n_estimators=min(mdl.n_estimators, settings.n_estimators))
+    return models
+
+
+def run_scale(
+    name: str,
+    scale: SyntheticScale,
+    data_dir: pathlib.Path,
+    settings: BenchSettings,
+    report: RunReport,
+) -> dict[str, dict[str, Any]]:
+    """
+    Generate (or reuse) the synthetic bronze CSVs for ``scale`` in
+    ``data_dir`` and time each of ``STAGES`` on them as ``<name>/<stage>``
+    in ``report``.  Returns per stage its wall time, peak memory and ``n``,
+    the input size its cost should scale with.
+    """
+    marker = data_dir / "rows.json"
+    if marker.exists() and json.loads(marker.read_text()).get("scale") == asdict(scale):
+        rows = json.loads(marker.read_text())["rows"]
+    else:
+        rows = write_bronze(data_dir, scale)
+        marker.write_text(json.dumps({"scale": asdict(scale), "rows": rows}))
+
+    cfg = TrainConfig(data_dir=data_dir, hyperparams_path=None, cv_splits=settings.cv_splits, forecast_cv_strategy="time")
+    tfe = TemporalFeatureEngineering
+    sizes: dict[str, int] = {}
+    with report.stage(name):
+        with report.stage("load_bronze"):
+            bronze = load_bronze(data_dir).materialize(workers=settings.bronze_workers)
+        sizes["load_bronze"] = sum(rows.values())
+
+        with report.stage("build_gold_multiyear"):
+            gold = build_gold_multiyear(bronze)
+        sizes["build_gold_multiyear"] = len(bronze["fts_req"]) + len(bronze["fts_cluster"]) + len(bronze["fts_out_cbpf"])
+
+        feat_all, _X, _y = build_feature_matrix_all_years(gold)
+        with report.stage("compute_lag_features"):
+            feat_t = tfe.compute_lag_features(feat_all)
+        sizes["compute_lag_features"] = len(feat_all)
+
+        dataset = tfe.build_temporal_multi_horizon_dataset(feat_t)
+        cv = CVStep(cfg)
+        with report.stage("cv"):
+            jobs = [
+                cv.cv_job(
+                    label,
+                    _models(settings, cv.budget.threads_per_worker),
+                    dataset.X,
+                    dataset.target(label),
+                    dataset.meta.iloc[dataset.rows(label)].reset_index(drop=True),
+                    cfg.forecast_cv_strategy,
+                    cfg.cv_splits,
+                    time_splits=cfg.forecast_time_splits,
+                    rows=dataset.rows(label),
+                )
+                for label, _years in FORECAST_HORIZONS
+            ]
+            cv_results = cv.run_jobs(jobs)
+        sizes["cv"] = sum(len(job.y) for job in jobs)
+
+        with report.stage("fit_projector"):
+            scaler, _X_scaled = tfe.fit_temporal_scaler(feat_t)
+            X_scaled = scaler.transform(dataset.X)
+            fitted: dict[str, dict[str, Any]] = {}
+            for label, _years in FORECAST_HORIZONS:
+                models = cv.with_iterations(label, _models(settings, cv.budget.fit_threads))
+                rows_h, y_h = dataset.rows(label), dataset.target(label)
+                fitted[label] = {k: models[k].fit(X_scaled[rows_h], y_h) for k in BASE_KEYS}
+        sizes["fit_projector"] = sizes["cv"]
+
+        snapshot = feat_t.sort_values("year").groupby("country_iso3", observed=True).tail(1)
+        if settings.project_countries is not None:
+            snapshot = snapshot.head(settings.project_countries)
+        projector = TemporalProjector(fitted["1yr"], fitted["2yr"], cv_results["1yr"], cv_results["2yr"], scaler)
+        with report.stage("project_batch"):
+            projector.project_batch(snapshot)
+        sizes["project_batch"] = len(snapshot)
+
+    by_path = {s["path"]: s for s in report.stages}
+    return {
+        stage: {
+            "n":            sizes[stage],
+            "wall_s":       by_path[f"{name}/{stage}"]["wall_s"],
+            "rss_peak_mb":  by_path[f"{name}/{stage}"]["rss_peak_mb"],
+            "heap_peak_mb": by_path[f"{name}/{stage}"]["heap_peak_mb"],
+        }
+        for stage in STAGES
+    }
+
+
+def scaling_exponents(results: dict[str, dict[str, dict[str, Any]]], min_wall_s: float = 0.5) -> dict[str, list[dict[str, Any]]]:
+    """
+    Per stage, the empirical exponent ``k`` in ``time ~ n**k`` between each
+    pair of consecutive scales (ordered by ``n``): ~1 is linear, ~2
+    quadratic.  Pairs where the larger run took under ``min_wall_s`` are
+    noise and reported as None.
+    """
+    out: dict[str, list[dict[str, Any]]] = {}
+    for stage in STAGES:
+        runs = sorted(((name, r[stage]) for name, r in results.items() if stage in r), key=lambda item: item[1]["n"])
+        pairs = []
+        for (a, ra), (b, rb) in zip(runs, runs[1:]):
+            k = None
+            if rb["n"] > ra["n"] > 0 and rb["wall_s"] >= min_wall_s and ra["wall_s"] > 0:
+                k = round(math.log(rb["wall_s"] / ra["wall_s"]) / math.log(rb["n"] / ra["n"]), 2)
+            pairs.append({"from": a, "to": b, "exponent": k})
+        out[stage] = pairs
+    return out
+
+
+def load_baseline(path: pathlib.Path) -> dict[str, Any]:
+    if not pathlib.Path(path).exists():
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_baseline(
+    path: pathlib.Path,
+    results: dict[str, dict[str, dict[str, Any]]],
+    scales: dict[str, SyntheticScale],
+    settings: BenchSettings,
+    report: RunReport,
+) -> None:
+    """Record ``results`` as the baseline for their scales; other scales already in ``path`` are kept."""
+    doc = load_baseline(path)
+    if doc.get("settings") != asdict(settings):
+        doc = {}
+    entries = dict(doc.get("scales", {}))
+    for name, stages in results.items():
+        entries[name] = {"scale": asdict(scales[name]), "stages": stages}
+    doc = {
+        "version":  BASELINE_VERSION,
+        "created":  datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "host":     report.to_dict()["host"],
+        "settings": asdict(settings),
+        "scales":   entries,
+    }
+    path = pathlib.Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(doc, f, indent=2)
+    LOG.info("Benchmark baseline written: %s (%s)", path.as_posix(), ", ".join(sorted(entries)))
+
+
+def compare(
+    results: dict[str, dict[str, dict[str, Any]]],
+    scales: dict[str, SyntheticScale],
+    settings: BenchSettings,
+    baseline: dict[str, Any],
+    time_tolerance: float = 0.5,
+    memory_tolerance: float = 0.25,
+    min_wall_s: float = 0.1,
+) -> list[str]:
+    """
+    Regressions of ``results`` against ``baseline``: a stage slower than
+    ``1 + time_tolerance`` times, or with an RSS peak more than
+    ``1 + memory_tolerance`` times, its baseline at the same scale.  Stages
+    under ``min_wall_s`` are timer noise and only checked for memory.
+    Scales whose size or settings differ from the baseline's are skipped.
+    """
+    if not baseline:
+        LOG.info("No benchmark baseline; nothing to compare")
+        return []
+    if baseline.get("settings") != asdict(settings):
+        LOG.warning("Benchmark settings differ from the baseline's %s; not comparing", baseline.get("settings"))
+        return []
+
+    regressions: list[str] = []
+    for name, stages in results.items():
+        ref = baseline.get("scales", {}).get(name)
+        if ref is None or ref.get("scale") != asdict(scales[name]):
+            LOG.info("  %-6s no baseline at this size", name)
+            continue
+        for stage, cur in stages.items():
+            old = ref["stages"].get(stage)
+            if old is None:
+                continue
+            for metric, tol in (("wall_s", time_tolerance), ("rss_peak_mb", memory_tolerance)):
+                if metric == "wall_s" and cur[metric] < min_wall_s:
+                    continue
+                if old[metric] and cur[metric] > old[metric] * (1 + tol):
+                    regressions.append(f"{name}/{stage}: {metric} {cur[metric]:.2f} vs baseline {old[metric]:.2f} (> +{tol:.0%})")
+    return regressions
+
+
+def summary_table(results: dict[str, dict[str, dict[str, Any]]], baseline: dict[str, Any]) -> pd.DataFrame:
+    """One row per (scale, stage) with the baseline wall time alongside, for logging."""
+    rows = []
+    for name, stages in results.items():
+        ref = baseline.get("scales", {}).get(name, {}).get("stages", {})
+        for stage, r in stages.items():
+            base = ref.get(stage, {}).get("wall_s")
+            rows.append({
+                "scale": name, "stage": stage, "n": r["n"], "wall_s": r["wall_s"],
+                "baseline_s": base, "ratio": round(r["wall_s"] / base, 2) if base else np.nan,
+                "rss_peak_mb": r["rss_peak_mb"],
+            })
+    return pd.DataFrame(rows)
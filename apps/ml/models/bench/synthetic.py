@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import logging
+import pathlib
+import string
+from dataclasses import dataclass, replace
+
+import numpy as np
+import pandas as pd
+
+from shared.data_loader import BRONZE_SOURCES, CLUSTER_MAP
+
+LOG = logging.getLogger("train")
+
+_LETTERS = np.array(list(string.ascii_uppercase))
+_ORG_TYPES = np.array(["Pooled Fund", "UN Agency", "NGO", "Pooled Fund;UN Agency", "Government", ""], dtype=object)
+_POP_GROUPS = ("T_TL", "F_TL", "M_TL")
+
+
+@dataclass(frozen=True)
+class SyntheticScale:
+    """
+    Size of a synthetic bronze dataset.  ``countries`` are the entity keys
+    (three-letter codes, widening past 17,576 so admin1-sized panels fit);
+    each can be scaled on its own.  The defaults are roughly today's data.
+    """
+
+    countries: int = 200
+    years: int = 30
+    clusters: int = 10
+    flows: int = 50_000
+    last_year: int = 2026
+    seed: int = 0
+
+    def times(self, factor: float) -> "SyntheticScale":
+        """Same shape with ``factor`` x the countries and flow rows."""
+        return replace(self, countries=max(1, round(self.countries * factor)), flows=max(1, round(self.flows * factor)))
+
+    @property
+    def label(self) -> str:
+        return f"{self.countries}c_{self.years}y_{self.clusters}k_{self.flows}f"
+
+
+def unit_codes(n: int) -> np.ndarray:
+    """``n`` distinct upper-case codes: AAA, AAB, ... (four letters and up past 26**3)."""
+    width = 3
+    while 26 ** width < n:
+        width += 1
+    digits = (np.arange(n)[:, None] // 26 ** np.arange(width - 1, -1, -1)) % 26
+    return np.array(["".join(row) for row in _LETTERS[digits]], dtype=object)
+
+
+def cluster_codes(n: int) -> tuple[np.ndarray, np.ndarray]:
+    """HNO cluster codes and their FTS names: the real ``CLUSTER_MAP`` first, then made-up ones."""
+    codes, names = list(CLUSTER_MAP), list(CLUSTER_MAP.values())
+    codes += [f"X{i:02d}" for i in range(len(codes), n)]
+    names += [f"Cluster {i}" for i in range(len(names), n)]
+    return np.array(codes[:n], dtype=object), np.array(names[:n], dtype=object)
+
+
+def _pick_per_row(rng: np.random.Generator, n_rows: int, n_choices: int, k: int) -> np.ndarray:
+    # k distinct choices per row without a Python loop (argsort of noise).
+    k = min(k, n_choices)
+    return np.argsort(rng.random((n_rows, n_choices)), axis=1)[:, :k]
+
+
+def _write_hxl(df: pd.DataFrame, tags: list[str], path: pathlib.Path) -> None:
+    # Sources carry an HXL hashtag row under the header, as HDX exports do.
+    pd.DataFrame([tags], columns=df.columns).to_csv(path, index=False)
+    df.to_csv(path, mode="a", header=False, index=False)
+
+
+def _hno(rng: np.random.Generator, units: np.ndarray, codes: np.ndarray) -> pd.DataFrame:
+    n = len(units)
+    picked = _pick_per_row(rng, n, len(codes), 6)
+    cluster_units = np.repeat(units, picked.shape[1])
+    return pd.DataFrame({
+        "Country ISO3": np.concatenate([units, cluster_units]),
+        "Cluster":      np.concatenate([np.full(n, "ALL", dtype=object), codes[picked.ravel()]]),
+        "In Need":      np.concatenate([rng.integers(10_000, 10_000_000, n), rng.integers(1_000, 1_000_000, len(cluster_units))]),
+        "Targeted":     np.concatenate([rng.integers(1_000, 1_000_000, n), rng.integers(1_000, 100_000, len(cluster_units))]),
+    })
+
+
+def _funded_share(rng: np.random.Generator, propensity: np.ndarray) -> np.ndarray:
+    # Each country's funding level persists across years (plus noise), so
+    # the lag features carry signal and early stopping behaves as on real data.
+    return np.clip(propensity + rng.normal(0.0, 0.15, len(propensity)), 0.0, 1.1)
+
+
+def _fts_req(rng: np.random.Generator, units: np.ndarray, years: np.ndarray, propensity: np.ndarray) -> pd.DataFrame:
+    # ~70% of country-years have an appeal; some have two plans.
+    u, y = np.nonzero(rng.random((len(units), len(years))) < 0.7)
+    plans = rng.integers(1, 3, len(u))
+    u, y = np.repeat(u, plans), np.repeat(y, plans)
+    plan_no = np.arange(len(u)) - np.repeat(np.cumsum(plans) - plans, plans)
+    req = rng.integers(0, 500_000_000, len(u)).astype(float)
+    funded = req * _funded_share(rng, propensity[u])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        pct = np.where(req > 0, funded / req * 100, 0.0)
+    return pd.DataFrame({
+        "countryCode":   units[u],
+        "requirements":  req,
+        "funding":       funded.round(0),
+        "percentFunded": pct.round(2),
+        "name":          pd.Series(units[u]) + " Response Plan " + pd.Series(years[y]).astype(str) + " #" + pd.Series(plan_no + 1).astype(str),
+        "year":          years[y],
+    })
+
+
+def _fts_cluster(rng: np.random.Generator, units: np.ndarray, years: np.ndarray, names: np.ndarray, propensity: np.ndarray) -> pd.DataFrame:
+    # ~60% of country-years report up to five clusters each.
+    u, y = np.nonzero(rng.random((len(units), len(years))) < 0.6)
+    picked = _pick_per_row(rng, len(u), len(names), 5)
+    k = picked.shape[1]
+    req = rng.integers(0, 50_000_000, len(u) * k).astype(float)
+    funded = (req * _funded_share(rng, np.repeat(propensity[u], k))).round(0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        pct = np.where(req > 0, funded / req * 100, 0.0)
+    return pd.DataFrame({
+        "countryCode":   np.repeat(units[u], k),
+        "cluster":       names[picked.ravel()],
+        "requirements":  req,
+        "funding":       funded,
+        "percentFunded": pct.round(2),
+        "year":          np.repeat(years[y], k),
+    })
+
+
+def _fts_out(rng: np.random.Generator, units: np.ndarray, years: np.ndarray, n: int) -> pd.DataFrame:
+    # One or two destination countries per flow; a few flows have no
+    # location or budget year, like the real dump.
+    first = pd.Series(units[rng.integers(0, len(units), n)])
+    second = pd.Series(units[rng.integers(0, len(units), n)])
+    locs = first.where(rng.random(n) >= 0.3, first + "," + second).where(rng.random(n) >= 0.05, None)
+    budget_year = np.where(rng.random(n) < 0.03, np.nan, years[rng.integers(0, len(years), n)])
+    return pd.DataFrame({
+        "id":                    np.arange(1, n + 1),
+        "amountUSD":             rng.integers(1_000, 10_000_000, n).astype(float),
+        "budgetYear":            budget_year,
+        "destOrganizationTypes": _ORG_TYPES[rng.integers(0, len(_ORG_TYPES), n)],
+        "destLocations":         locs,
+        "description":           "Synthetic flow " + pd.Series(np.arange(1, n + 1)).astype(str),
+    })
+
+
+def _pop(rng: np.random.Generator, units: np.ndarray) -> pd.DataFrame:
+    total = rng.integers(100_000, 100_000_000, len(units))
+    female = (total * rng.uniform(0.48, 0.52, len(units))).astype(np.int64)
+    return pd.DataFrame({
+        "ISO3":             np.repeat(units, len(_POP_GROUPS)),
+        "Population_group": np.tile(np.array(_POP_GROUPS, dtype=object), len(units)),
+        "Population":       np.column_stack([total, female, total - female]).ravel(),
+    })
+
+
+def write_bronze(out_dir: pathlib.Path, scale: SyntheticScale) -> dict[str, int]:
+    """
+    Write the five bronze CSVs ``load_bronze`` reads (same file names,
+    columns and HXL tag rows as the HDX / FTS downloads) for ``scale`` into
+    ``out_dir``.  Output is a pure function of ``scale`` (including its
+    seed).  Returns the data rows written per bronze table.
+    """
+    out_dir = pathlib.Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    rng = np.random.default_rng(scale.seed)
+    units = unit_codes(scale.countries)
+    years = np.arange(scale.last_year - scale.years + 1, scale.last_year + 1)
+    codes, names = cluster_codes(scale.clusters)
+    propensity = rng.beta(2.0, 2.0, len(units))
+
+    tables = {
+        "hno_2026":     (_hno(rng, units, codes),                              ["#country+code", "#sector+code", "#inneed", "#targeted"]),
+        "fts_req":      (_fts_req(rng, units, years, propensity),              ["#country+code", "#value+funding+required+usd", "#value+funding+total+usd", "#value+funding+pct", "#activity+appeal+name", "#date+year"]),
+        "fts_cluster":  (_fts_cluster(rng, units, years, names, propensity),   ["#country+code", "#sector+cluster+name", "#value+funding+required+usd", "#value+funding+total+usd", "#value+funding+pct", "#date+year"]),
+        "fts_out_cbpf": (_fts_out(rng, units, years, scale.flows),             ["#activity+id", "#value+funding+usd", "#date+year+budget", "#org+type+dest", "#country+code+dest", "#description"]),
+        "pop_total":    (_pop(rng, units),                                     ["#country+code", "#population+group", "#population"]),
+    }
+    rows: dict[str, int] = {}
+    for name, (df, tags) in tables.items():
+        _write_hxl(df, tags, out_dir / BRONZE_SOURCES[name][0])
+        rows[name] = len(df)
+    LOG.info("Synthetic bronze %s -> %s  %s", scale.label, out_dir.as_posix(), rows)
+    return rows
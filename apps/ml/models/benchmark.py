@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import argparse
+import logging
+import pathlib
+import sys
+import tempfile
+import warnings
+from dataclasses import asdict
+from pathlib import Path
+from typing import List, Optional
+
+warnings.filterwarnings("ignore")
+
+_HERE = pathlib.Path(__file__).parent.resolve()
+if str(_HERE) not in sys.path:
+    sys.path.insert(0, str(_HERE))
+
+from bench.suite import BenchSettings, compare, load_baseline, run_scale, save_baseline, scaling_exponents, summary_table
+from bench.synthetic import SyntheticScale
+from shared.run_report import RunReport
+
+LOG = logging.getLogger("train")
+
+DEFAULT_BASELINE = _HERE / "bench" / "baseline.json"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Time and memory benchmark of the training pipeline's stages on synthetic bronze data.",
+    )
+    parser.add_argument("--scales", nargs="+", type=float, default=[1, 10],
+                        help="multiples of the base size (countries and flow rows) to run")
+    base = SyntheticScale()
+    parser.add_argument("--countries", type=int, default=base.countries, help="countries (or admin1 units) at 1x")
+    parser.add_argument("--years", type=int, default=base.years, help="years of history (not scaled)")
+    parser.add_argument("--clusters", type=int, default=base.clusters, help="clusters (not scaled)")
+    parser.add_argument("--flows", type=int, default=base.flows, help="FTS outgoing flow rows at 1x")
+    parser.add_argument("--seed", type=int, default=base.seed)
+    parser.add_argument("--n-estimators", type=int, default=BenchSettings.n_estimators,
+                        help="cap on trees / boosting rounds per model (0: tuned counts)")
+    parser.add_argument("--project-countries", type=int, default=BenchSettings.project_countries,
+                        help="countries projected by project_batch (0: all)")
+    parser.add_argument("--work-dir", type=Path,
+                        help="where the synthetic CSVs go; reused across runs when given (default: a temp dir)")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="record this run as the baseline for its scales")
+    parser.add_argument("--time-tolerance", type=float, default=0.5, help="allowed slowdown vs baseline (0.5 = +50%%)")
+    parser.add_argument("--memory-tolerance", type=float, default=0.25, help="allowed RSS peak growth vs baseline")
+    parser.add_argument("--trace-memory", action="store_true", help="also record Python-heap peaks (slow)")
+    parser.add_argument("--out", type=Path, help="write the full run report JSON here")
+    args = parser.parse_args(argv)
+
+    base = SyntheticScale(args.countries, args.years, args.clusters, args.flows, seed=args.seed)
+    scales = {f"{factor:g}x": base.times(factor) for factor in args.scales}
+    settings = BenchSettings(
+        n_estimators=args.n_estimators or None,
+        project_countries=args.project_countries or None,
+    )
+
+    report = RunReport(trace_memory=args.trace_memory)
+    tmp = tempfile.TemporaryDirectory(prefix="crisislens-bench-") if args.work_dir is None else None
+    work_dir = Path(tmp.name) if tmp is not None else args.work_dir
+    try:
+        results = {
+            name: run_scale(name, scale, work_dir / scale.label, settings, report)
+            for name, scale in scales.items()
+        }
+    finally:
+        if tmp is not None:
+            tmp.cleanup()
+
+    baseline = load_baseline(args.baseline)
+    LOG.info("Benchmark results:\n%s", summary_table(results, baseline).to_string(index=False))
+    exponents = scaling_exponents(results)
+    for stage, pairs in exponents.items():
+        for p in pairs:
+            if p["exponent"] is not None and p["exponent"] > 1.5:
+                LOG.warning("%s grows superlinearly: time ~ n^%.2f from %s to %s", stage, p["exponent"], p["from"], p["to"])
+
+    regressions = compare(results, scales, settings, baseline, args.time_tolerance, args.memory_tolerance)
+    for r in regressions:
+        LOG.error("Regression: %s", r)
+
+    if args.out is not None:
+        report.add("benchmark", {"settings": asdict(settings), "results": results, "scaling": exponents, "regressions": regressions})
+        report.write(args.out)
+    if args.save_baseline:
+        save_baseline(args.baseline, results, scales, settings, report)
+        return 0
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,8 +3,16 @@ from __future__ import annotations
 import numpy as np
 
 
+def blend_weight(model_cv):
+    # Pooled out-of-fold R² when the CV pass recorded it, else the mean fold R².
+    w = model_cv.get("oof_r2", float("nan"))
+    if not np.isfinite(w):
+        w = model_cv.get("mean", 0.0)
+    return max(w, 0.0)
+
+
 def weighted_average_ensemble(predictions, cv_results, base_model_keys):
-    weights = {k: max(cv_results[k]["mean"], 0.0) for k in base_model_keys}
+    weights = {k: blend_weight(cv_results[k]) for k in base_model_keys}
     total   = max(sum(weights.values()), 1e-9)
     blended = sum(weights[k] * predictions[k] for k in base_model_keys) / total
     return np.clip(blended, 0, 100)
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+from sklearn.base import clone
+from sklearn.metrics import get_scorer, r2_score
+
+
+class OOFStackingRegressor:
+    """
+    Stacked model over already-fitted base pipelines, for prediction only.
+
+    ``final_estimator`` was fit on the base models' out-of-fold predictions
+    (see ``fit_meta_model``), so building the stack costs no extra base
+    fits; ``predict`` feeds it the base models' predictions on ``X``.  It
+    is deliberately not an sklearn estimator: there is no ``fit`` to clone
+    or refit, the parts are trained by the CV pass.
+    """
+
+    def __init__(self, estimators: Sequence[Tuple[str, object]], final_estimator: object) -> None:
+        self.estimators = estimators
+        self.final_estimator = final_estimator
+
+    def predict(self, X) -> np.ndarray:
+        base = np.column_stack([est.predict(X) for _name, est in self.estimators])
+        return self.final_estimator.predict(base)
+
+
+def _complete_rows(oof: np.ndarray) -> np.ndarray:
+    # Rows never held out (e.g. the first TimeSeriesSplit chunk) have no OOF prediction.
+    return ~np.isnan(oof).any(axis=1)
+
+
+def fit_meta_model(oof: np.ndarray, y: np.ndarray, meta_model: object) -> object:
+    """Fit a clone of ``meta_model`` on every row with a complete OOF vector."""
+    rows = _complete_rows(oof)
+    return clone(meta_model).fit(oof[rows], y[rows])
+
+
+def stacking_cv_scores(
+    oof: np.ndarray,
+    y: np.ndarray,
+    splits: Sequence[Tuple[np.ndarray, np.ndarray]],
+    meta_model: object,
+    scoring: str = "r2",
+    inner_oof: Optional[Sequence[np.ndarray]] = None,
+) -> np.ndarray:
+    """
+    Score the stack on the same folds as its base models: for fold k the
+    meta-learner is scored on fold k's OOF rows.  Folds with no usable
+    training rows are skipped.
+
+    Without ``inner_oof`` it is fit on the OOF rows inside fold k's
+    training set.  That is only honest for time-ordered splits (a row's
+    OOF prediction saw earlier rows only, and fold k trains on rows
+    before its test rows); under shuffled or grouped K-fold those OOF
+    predictions came from base models fit on fold k's test rows, so the
+    score is optimistic.  ``inner_oof[k]`` nests it instead: the OOF
+    matrix of fold k's training rows (in that order) from base models
+    cross-validated on those rows alone.
+    """
+    rows = _complete_rows(oof)
+    scorer = get_scorer(scoring)
+    scores: List[float] = []
+    for k, (train, test) in enumerate(splits):
+        X_tr, y_tr = (oof[train], y[train]) if inner_oof is None else (inner_oof[k], y[train])
+        keep = _complete_rows(X_tr)
+        te = test[rows[test]]
+        if not keep.any() or len(te) == 0:
+            continue
+        meta = clone(meta_model).fit(X_tr[keep], y_tr[keep])
+        scores.append(float(scorer(meta, oof[te], y[te])))
+    return np.asarray(scores, dtype=float)
+
+
+def oof_r2(pred: np.ndarray, y: np.ndarray) -> float:
+    """R² of one model's pooled out-of-fold predictions."""
+    rows = ~np.isnan(pred)
+    return float(r2_score(y[rows], pred[rows])) if rows.sum() > 1 else float("nan")
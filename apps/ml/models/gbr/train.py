@@ -1,7 +1,23 @@
+from itertools import islice
+
+import numpy as np
+from scipy.stats import loguniform, randint, uniform
 from sklearn.ensemble import GradientBoostingRegressor
+from sklearn.metrics import mean_squared_error
+
+
+# Searched by search_hyperparams.py (n_estimators is the halving budget).
+SEARCH_SPACE = {
+    "learning_rate":    loguniform(0.01, 0.2),
+    "max_depth":        randint(2, 7),
+    "min_samples_leaf": randint(1, 20),
+    "subsample":        uniform(0.6, 0.4),
+}
 
 
-def build_model():
+def build_model(n_jobs: int = -1):
+    # GradientBoostingRegressor is single-threaded; n_jobs keeps the factory
+    # signature uniform with the other models.
     return GradientBoostingRegressor(
         n_estimators=300,
         learning_rate=0.05,
@@ -9,3 +25,40 @@ def build_model():
         subsample=0.80,
         random_state=42,
     )
+
+
+def fit_early_stopping(model, X, y, X_val, y_val, patience: int) -> int:
+    # Grow stages `patience` at a time (warm_start) and stop once the best
+    # validation loss is `patience` stages old, then drop the stages past
+    # the best one so the model predicts with the count it returns.
+    n_max = model.n_estimators
+    model.set_params(warm_start=True)
+    best, best_loss, n = 0, np.inf, 0
+    while n < n_max and n - best < patience:
+        start, n = n, min(n + patience, n_max)
+        model.set_params(n_estimators=n).fit(X, y)
+        for i, pred in enumerate(islice(model.staged_predict(X_val), start, None), start=start + 1):
+            loss = mean_squared_error(y_val, pred)
+            if loss < best_loss:
+                best, best_loss = i, loss
+    model.set_params(warm_start=False, n_estimators=best)
+    model.estimators_ = model.estimators_[:best]
+    model.train_score_ = model.train_score_[:best]
+    if hasattr(model, "oob_scores_"):
+        model.oob_improvement_ = model.oob_improvement_[:best]
+        model.oob_scores_ = model.oob_scores_[:best]
+        model.oob_score_ = model.oob_scores_[-1]
+    model.n_estimators_ = best
+    return best
+
+
+def n_rounds(model) -> int:
+    # Stages the fitted model holds (fit_early_stopping truncates them).
+    return int(model.n_estimators_)
+
+
+def warm_update(model, X, y, n_estimators: int):
+    # Keep the fitted stages and boost n_estimators more on X (the new rows).
+    model.set_params(warm_start=True, n_estimators=model.n_estimators + n_estimators)
+    model.fit(X, y)
+    return model.set_params(warm_start=False)
@@ -1,7 +1,21 @@
 import lightgbm as lgb
+from scipy.stats import loguniform, randint, uniform
 
 
-def build_model():
+# Hyperparameter search space (see search_hyperparams.py); n_estimators is
+# the successive-halving budget, so it is not searched directly.
+SEARCH_SPACE = {
+    "learning_rate":     loguniform(0.01, 0.2),
+    "max_depth":         randint(3, 9),
+    "num_leaves":        randint(8, 64),
+    "min_child_samples": randint(5, 40),
+    "colsample_bytree":  uniform(0.5, 0.5),
+    "reg_alpha":         loguniform(1e-3, 1.0),
+    "reg_lambda":        loguniform(1e-3, 1.0),
+}
+
+
+def build_model(n_jobs: int = -1):
     return lgb.LGBMRegressor(
         n_estimators=400,
         learning_rate=0.04,
@@ -13,4 +27,26 @@ def build_model():
         reg_lambda=0.1,
         random_state=42,
         verbose=-1,
+        n_jobs=n_jobs,
     )
+
+
+def fit_early_stopping(model, X, y, X_val, y_val, patience: int) -> int:
+    # Stop once the validation loss has not improved for `patience` rounds;
+    # predict() then uses the best iteration.
+    model.fit(X, y, eval_set=[(X_val, y_val)], callbacks=[lgb.early_stopping(patience, verbose=False)])
+    return int(model.best_iteration_ or model.n_estimators)
+
+
+def n_rounds(model) -> int:
+    # Boosting rounds the fitted booster holds (after early stopping and
+    # earlier warm updates), not the n_estimators it was asked for.
+    return int(model.booster_.current_iteration())
+
+
+def warm_update(model, X, y, n_estimators: int):
+    # Continue boosting from the fitted booster: the new trees start from the
+    # existing model's predictions and are fit on X (the new rows) only.
+    booster = model.booster_
+    model.set_params(n_estimators=n_estimators)
+    return model.fit(X, y, init_model=booster)
@@ -1,12 +1,33 @@
+from scipy.stats import randint, uniform
 from sklearn.ensemble import RandomForestRegressor
 
 
-def build_model():
+# Searched by search_hyperparams.py (n_estimators is the halving budget).
+SEARCH_SPACE = {
+    "max_depth":        randint(3, 13),
+    "min_samples_leaf": randint(1, 10),
+    "max_features":     uniform(0.3, 0.7),
+}
+
+
+def build_model(n_jobs: int = -1):
     return RandomForestRegressor(
         n_estimators=300,
         max_depth=6,
         min_samples_leaf=2,
         max_features=0.7,
         random_state=42,
-        n_jobs=-1,
+        n_jobs=n_jobs,
     )
+
+
+def n_rounds(model) -> int:
+    # Trees the fitted forest holds.
+    return len(model.estimators_)
+
+
+def warm_update(model, X, y, n_estimators: int):
+    # Keep the fitted trees and grow n_estimators more on X (the new rows).
+    model.set_params(warm_start=True, n_estimators=model.n_estimators + n_estimators)
+    model.fit(X, y)
+    return model.set_params(warm_start=False)
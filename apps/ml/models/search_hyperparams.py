@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import argparse
+import logging
+import pathlib
+import sys
+import warnings
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+warnings.filterwarnings("ignore")
+
+_HERE = pathlib.Path(__file__).parent.resolve()
+if str(_HERE) not in sys.path:
+    sys.path.insert(0, str(_HERE))
+
+from shared.early_stopping import EarlyStoppingRegressor
+from shared.features import FORECAST_HORIZONS
+from shared.hyperparams import save_hyperparams
+from shared.search import halving_search
+from train_model import MODEL_DEFS, TrainConfig, TrainOrchestrator
+
+LOG = logging.getLogger("train")
+
+
+def search(
+    cfg: TrainConfig,
+    label: str = "current",
+    models: Optional[List[str]] = None,
+    n_candidates: int = 27,
+    factor: int = 3,
+    out: Optional[Path] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Tune each base model with successive halving over its definition
+    module's ``SEARCH_SPACE``, on the same features and CV folds training
+    uses for ``label``, and write the winners as ``label``'s set in the
+    next version of ``out`` (default ``cfg.hyperparams_path``).
+    Candidates are the pipelines training cross-validates, early-stopping
+    wrapper included, and start from ``label``'s currently tuned
+    parameters, so the budget is their tuned n_estimators.
+    """
+    orchestrator = TrainOrchestrator(cfg)
+    cv = orchestrator.cv_step
+    job = orchestrator.cv_job(label, orchestrator.features())
+    X = job.X if job.rows is None else np.asarray(job.X[job.rows])
+
+    results: Dict[str, Dict[str, Any]] = {}
+    for name in models or list(MODEL_DEFS):
+        LOG.info("Searching %s (%s, %d candidates, factor %d)", name, label, n_candidates, factor)
+        pipeline = job.estimators[name]
+        wrapped = isinstance(pipeline.named_steps["model"], EarlyStoppingRegressor)
+        model = pipeline.named_steps["model"].estimator if wrapped else pipeline.named_steps["model"]
+        results[name] = halving_search(
+            pipeline,
+            MODEL_DEFS[name].SEARCH_SPACE,
+            X, job.y, job.splits,
+            max_estimators=model.n_estimators,
+            scoring=cfg.scoring,
+            n_candidates=n_candidates,
+            factor=factor,
+            n_workers=cv.budget.cv_workers,
+            inner_threads=cv.budget.threads_per_worker,
+            random_state=cfg.random_state,
+            model_path="model__estimator" if wrapped else "model",
+        )
+        r = results[name]
+        LOG.info("  %-13s %s=%.4f  %d fits in %.1fs  %s", name, cfg.scoring, r["cv_score"], r["n_fits"], r["search_s"], r["params"])
+
+    save_hyperparams(
+        out or cfg.hyperparams_path,
+        label,
+        results,
+        meta={"label": label, "scoring": cfg.scoring, "n_candidates": n_candidates, "factor": factor},
+    )
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Successive-halving hyperparameter search for the CrisisLens base models.")
+    parser.add_argument("--label", default="current", choices=["current", *(h for h, _years in FORECAST_HORIZONS)],
+                        help="model set whose training data and CV folds are searched")
+    parser.add_argument("--models", nargs="+", choices=list(MODEL_DEFS), help="models to tune (default: all)")
+    parser.add_argument("--n-candidates", type=int, default=27, help="random candidates per model in the first round")
+    parser.add_argument("--factor", type=int, default=3, help="keep 1/factor of the candidates per round, with factor x the trees")
+    parser.add_argument("--out", type=Path, help="hyperparameter file to write (default: TrainConfig.hyperparams_path)")
+    args = parser.parse_args(argv)
+
+    cfg = TrainConfig(
+        data_dir=Path("../../../data/"),
+        out_dir=Path("models/artifacts"),
+        model_dir=Path("models"),
+        cv_strategy="group_country",
+        forecast_cv_strategy="time",
+    )
+    search(cfg, label=args.label, models=args.models, n_candidates=args.n_candidates, factor=args.factor, out=args.out)
+
+
+if __name__ == "__main__":
+    main()
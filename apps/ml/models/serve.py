@@ -0,0 +1,234 @@
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import pathlib
+import sys
+import warnings
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+from fastapi import FastAPI, HTTPException, Request
+from pydantic import BaseModel, Field
+
+warnings.filterwarnings("ignore")
+
+_HERE = pathlib.Path(__file__).parent.resolve()
+if str(_HERE) not in sys.path:
+    sys.path.insert(0, str(_HERE))
+
+from shared.allocation import ALLOCATION_MODES, AllocationSpec
+from shared.features import FEATURE_COLS, FUTURE_STEPS, STEP_TO_HORIZON
+from shared.inference import BASE_KEYS, InferenceModels, feature_matrix
+from shared.scenarios import ScenarioSpec
+from shared.temporal import TEMPORAL_FEATURE_COLS
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s | %(levelname)s | %(message)s",
+)
+LOG = logging.getLogger("train")
+
+# Where train_model.py writes (its model_dir / out_dir, run from this directory).
+MODEL_DIR = Path(os.environ.get("CRISISLENS_MODEL_DIR", _HERE / "models"))
+ARTIFACT_DIR = Path(os.environ.get("CRISISLENS_ARTIFACT_DIR", MODEL_DIR / "artifacts"))
+
+# Response keys per model, as in gold_country_scores.json.
+SCORE_KEYS: Dict[str, str] = {
+    "LightGBM":     "lgbm",
+    "RandomForest": "rf",
+    "XGBoost":      "xgb",
+    "GBR":          "gbr",
+    "Stacking":     "stacking",
+    "Ensemble":     "ensemble",
+}
+
+FeatureValue = Union[float, int, str, None]
+
+
+class FeatureRows(BaseModel):
+    # One dict per country; features missing from a row (or null) are
+    # treated as 0, values that are not numbers are rejected with a 422.
+    # ``country_iso3`` is echoed back when present.
+    rows: List[Dict[str, FeatureValue]] = Field(..., min_length=1)
+
+
+class ProjectRequest(FeatureRows):
+    n_steps: int = Field(8, ge=1, le=40)
+    step_years: float = Field(0.25, gt=0, le=5)
+
+
+class ScenarioRequest(ProjectRequest):
+    n_scenarios: int = Field(ScenarioSpec.n_scenarios, ge=1, le=20_000)
+    funding_shock_sd: float = Field(ScenarioSpec.funding_shock_sd, ge=0)
+    sensitivity_sigma: float = Field(ScenarioSpec.sensitivity_sigma, ge=0)
+    seed: int = ScenarioSpec.seed
+
+
+class OptimizeRequest(FeatureRows):
+    envelope_usd: float = Field(..., ge=0)
+    target_steps: List[int] = Field([4, 8], min_length=1)
+    mode: str = Field(AllocationSpec.mode, pattern="^(" + "|".join(ALLOCATION_MODES) + ")$")
+    increments: int = Field(AllocationSpec.increments, ge=1, le=1000)
+    max_share: float = Field(AllocationSpec.max_share, gt=0, le=1)
+    step_years: float = Field(AllocationSpec.step_years, gt=0, le=5)
+    # Per-row objective weights (e.g. people in need); all 1 when omitted.
+    weights: Optional[List[float]] = None
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    app.state.models = InferenceModels.load(MODEL_DIR, ARTIFACT_DIR)
+    yield
+
+
+app = FastAPI(title="CrisisLens inference", lifespan=lifespan)
+
+
+def _models(request: Request) -> InferenceModels:
+    return request.app.state.models
+
+
+def _iso3(rows: List[Dict[str, FeatureValue]]) -> List[Optional[str]]:
+    return [None if r.get("country_iso3") is None else str(r["country_iso3"]) for r in rows]
+
+
+def _features(rows: List[Dict[str, FeatureValue]], columns: List[str]) -> np.ndarray:
+    try:
+        return feature_matrix(rows, columns)
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from exc
+
+
+def _temporal_frame(rows: List[Dict[str, FeatureValue]]) -> pd.DataFrame:
+    # Results are matched to rows by position, so country_iso3 may repeat or be None.
+    return pd.DataFrame(_features(rows, TEMPORAL_FEATURE_COLS), columns=TEMPORAL_FEATURE_COLS).assign(country_iso3=_iso3(rows))
+
+
+def _r2(x: Any) -> float:
+    return round(float(x), 2)
+
+
+@app.get("/health")
+def health(request: Request) -> Dict[str, Any]:
+    models = _models(request)
+    return {
+        "scoring":  sorted(models.scoring),
+        "forecast": sorted(models.forecast),
+        "projector": models.projector is not None,
+        "features": {"score": FEATURE_COLS, "project": TEMPORAL_FEATURE_COLS},
+    }
+
+
+@app.post("/score")
+def score(body: FeatureRows, request: Request) -> Dict[str, Any]:
+    """Current-year neglect scores for each row (``FEATURE_COLS`` features)."""
+    preds = _models(request).score(_features(body.rows, FEATURE_COLS))
+    return {
+        "scores": [
+            {
+                "iso3": iso,
+                "modelScores": {key: _r2(preds[name][i]) for name, key in SCORE_KEYS.items()},
+                "ensembleScore": _r2(preds["Ensemble"][i]),
+                "modelAgreement": _r2(preds["agreement"][i]),
+            }
+            for i, iso in enumerate(_iso3(body.rows))
+        ],
+    }
+
+
+@app.post("/forecast")
+def forecast(body: FeatureRows, request: Request) -> Dict[str, Any]:
+    """``futureProjections`` per row, as in gold_country_scores.json."""
+    models = _models(request)
+    if not models.forecast:
+        raise HTTPException(status_code=503, detail="forecast models are not trained yet")
+    X = _features(body.rows, FEATURE_COLS)
+    steps = models.forecast_steps(X, current=models.score(X))
+    return {
+        "forecasts": [
+            {
+                "iso3": iso,
+                "futureProjections": [
+                    {
+                        "step": label,
+                        "monthsAhead": int(round(years * 12)),
+                        "horizonModel": STEP_TO_HORIZON[label],
+                        "scores": {
+                            "neglectScore":  _r2(steps[label]["LightGBM"][i]),
+                            "ensembleScore": _r2(steps[label]["Ensemble"][i]),
+                            **{SCORE_KEYS[k]: _r2(steps[label][k][i]) for k in BASE_KEYS},
+                        },
+                    }
+                    for label, years in FUTURE_STEPS
+                ],
+            }
+            for i, iso in enumerate(_iso3(body.rows))
+        ],
+    }
+
+
+@app.post("/project")
+def project(body: ProjectRequest, request: Request) -> Dict[str, Any]:
+    """Quarter-by-quarter ``TemporalProjector`` trajectories per row (``TEMPORAL_FEATURE_COLS`` features)."""
+    models = _models(request)
+    if models.projector is None:
+        raise HTTPException(status_code=503, detail="projector models are not trained yet")
+    trajectories = models.project(_temporal_frame(body.rows), n_steps=body.n_steps, step_years=body.step_years)
+    return {"projections": [{"iso3": iso, "steps": steps} for iso, steps in zip(_iso3(body.rows), trajectories)]}
+
+
+@app.post("/scenarios")
+def scenarios(body: ScenarioRequest, request: Request) -> Dict[str, Any]:
+    """p10/p50/p90 ensemble neglect per quarter across Monte Carlo funding scenarios, one entry per row in order."""
+    models = _models(request)
+    if models.projector is None:
+        raise HTTPException(status_code=503, detail="projector models are not trained yet")
+    spec = ScenarioSpec(
+        n_scenarios=body.n_scenarios,
+        funding_shock_sd=body.funding_shock_sd,
+        sensitivity_sigma=body.sensitivity_sigma,
+        seed=body.seed,
+    )
+    bands = models.scenarios(_temporal_frame(body.rows), spec, n_steps=body.n_steps, step_years=body.step_years)
+    return {"nScenarios": bands.n_scenarios, "scenarios": bands.records()}
+
+
+@app.post("/optimize")
+def optimize(body: OptimizeRequest, request: Request) -> Dict[str, Any]:
+    """Split ``envelope_usd`` of CBPF funding across the rows to minimize projected ensemble neglect at ``target_steps``."""
+    models = _models(request)
+    if models.projector is None:
+        raise HTTPException(status_code=503, detail="projector models are not trained yet")
+    if body.weights is not None and len(body.weights) != len(body.rows):
+        raise HTTPException(status_code=422, detail="weights must have one value per row")
+    if min(body.target_steps) < 1 or max(body.target_steps) > 40:
+        raise HTTPException(status_code=422, detail="target_steps must be between 1 and 40")
+    spec = AllocationSpec(
+        envelope_usd=body.envelope_usd,
+        target_steps=tuple(body.target_steps),
+        mode=body.mode,
+        increments=body.increments,
+        max_share=body.max_share,
+        step_years=body.step_years,
+    )
+    return models.optimize(_temporal_frame(body.rows), spec, body.weights).records()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Serve the trained CrisisLens models over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args(argv)
+    # One process: the models are loaded once and shared by the request threads.
+    uvicorn.run(app, host=args.host, port=args.port, workers=1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,263 @@
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from typing import Iterable, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from shared.temporal import TEMPORAL_FEATURE_COLS, TemporalProjector
+
+LOG = logging.getLogger("train")
+
+ALLOCATION_MODES: tuple[str, ...] = ("greedy", "coordinate")
+
+_C = {c: TEMPORAL_FEATURE_COLS.index(c) for c in (
+    "fgi_score", "cmi_score", "cbpf_share", "log_req_usd", "log_cbpf", "funded_pct", "cbpf_per_pin", "req_per_pin",
+    "fgi_score_lag1", "fgi_score_lag2", "funded_pct_lag1", "delta_fgi_1yr", "delta_funded_pct_1yr", "trend_fgi_2yr",
+)}
+
+
+def apply_allocation(states: np.ndarray, allocation_usd: np.ndarray) -> np.ndarray:
+    """
+    Copy of ``states`` (rows x ``TEMPORAL_FEATURE_COLS``) with
+    ``allocation_usd`` per row added to the current year's CBPF funding.
+    Funded and CBPF USD both grow by it; the features derived from them
+    (as ``build_gold_multiyear`` defines them) move by the matching
+    amount, so a zero allocation leaves a row unchanged.  Lags are last
+    year's and stay put.
+    """
+    s = np.array(states, dtype=np.float64)
+    alloc = np.asarray(allocation_usd, dtype=np.float64)
+    req = np.expm1(s[:, _C["log_req_usd"]])
+    funded_usd = s[:, _C["funded_pct"]] / 100.0 * req
+    cbpf_usd = np.expm1(s[:, _C["log_cbpf"]])
+    # Points of the requirement the allocation covers.
+    pts = np.divide(alloc * 100.0, req, out=np.zeros_like(req), where=req > 0)
+    # pin is not in the state; recover it from req_per_pin (no change when unknown).
+    req_per_pin = s[:, _C["req_per_pin"]]
+    pin = np.divide(req, req_per_pin, out=np.zeros_like(req), where=req_per_pin > 0)
+
+    old_fgi, old_funded = s[:, _C["fgi_score"]].copy(), s[:, _C["funded_pct"]].copy()
+    fgi = np.clip(old_fgi - pts, 0.0, 100.0)
+    funded = np.clip(old_funded + pts, 0.0, 100.0)
+    # (share * funded + alloc) / (funded + alloc), written to be exact at alloc == 0.
+    old_share = s[:, _C["cbpf_share"]]
+    total = funded_usd + alloc
+    share = np.clip(old_share + np.divide(alloc * (1.0 - old_share), total, out=np.zeros_like(total), where=total > 0), 0.0, 1.0)
+    s[:, _C["fgi_score"]] = fgi
+    s[:, _C["funded_pct"]] = funded
+    s[:, _C["cbpf_share"]] = share
+    s[:, _C["cmi_score"]] = np.where(alloc > 0, fgi * (1.0 - share), s[:, _C["cmi_score"]])
+    s[:, _C["log_cbpf"]] += np.log1p(alloc / (1.0 + cbpf_usd))
+    s[:, _C["cbpf_per_pin"]] += np.divide(alloc, pin, out=np.zeros_like(pin), where=pin > 0)
+    s[:, _C["delta_fgi_1yr"]] += fgi - old_fgi
+    s[:, _C["delta_funded_pct_1yr"]] += funded - old_funded
+    s[:, _C["trend_fgi_2yr"]] += (fgi - old_fgi) / 2.0
+    return s
+
+
+@dataclass(frozen=True)
+class AllocationSpec:
+    """
+    A CBPF envelope to split across countries so that the summed ensemble
+    neglect at ``target_steps`` (quarters ahead, averaged per country) is
+    lowest.  Allocations move on a grid of ``envelope_usd / increments``;
+    "coordinate" then halves that unit ``refinements`` times, moving one
+    unit between countries while a move improves the objective.
+    """
+
+    envelope_usd: float
+    target_steps: tuple[int, ...] = (4, 8)
+    mode: str = "coordinate"
+    increments: int = 20
+    refinements: int = 2
+    # Greedy looks up to this many increments ahead, so a country whose
+    # score only moves past a tree split still gets picked.
+    lookahead: int = 4
+    # Cap on one country's share of the envelope.
+    max_share: float = 1.0
+    step_years: float = 0.25
+    max_moves: int = 1000
+
+
+class _ResponseCache:
+    """
+    Objective term per (country, allocation units), memoized.  Rows of the
+    projector do not interact, so a country's term depends only on its own
+    allocation and every candidate is a sum of cached terms; only the
+    (country, units) pairs never seen before are projected, together in
+    one batch.
+    """
+
+    def __init__(self, projector: TemporalProjector, states: np.ndarray, weights: np.ndarray, unit_usd: float, spec: AllocationSpec) -> None:
+        self._projector = projector
+        self._states = states
+        self._weights = weights
+        self.unit_usd = unit_usd
+        self._targets = np.asarray(spec.target_steps) - 1
+        self._n_steps = max(spec.target_steps)
+        self._step_years = spec.step_years
+        self._values: dict[tuple[int, int], float] = {}
+        self.rows_projected = 0
+        self.batches = 0
+
+    def targets(self, countries: np.ndarray, units: np.ndarray) -> np.ndarray:
+        """(countries x target steps) ensemble neglect with ``units`` allocated to each."""
+        states = apply_allocation(self._states[countries], units * self.unit_usd)
+        proj = self._projector.simulate(states, self._n_steps, self._step_years, record_states=False)
+        self.rows_projected += len(countries)
+        self.batches += 1
+        return proj.scores["Ensemble"][self._targets].T
+
+    def get(self, pairs: Iterable[tuple[int, int]]) -> np.ndarray:
+        pairs = list(pairs)
+        missing = list(dict.fromkeys(p for p in pairs if p not in self._values))
+        if missing:
+            countries = np.array([c for c, _u in missing])
+            values = self.targets(countries, np.array([u for _c, u in missing], dtype=np.float64)).mean(axis=1) * self._weights[countries]
+            self._values.update(zip(missing, values.tolist()))
+        return np.array([self._values[p] for p in pairs], dtype=np.float64)
+
+
+@dataclass(frozen=True)
+class AllocationResult:
+    """``before`` / ``after`` are (countries x ``target_steps``) ensemble neglect without and with ``allocation_usd``."""
+
+    isos: list[Optional[str]]
+    allocation_usd: np.ndarray
+    target_steps: tuple[int, ...]
+    before: np.ndarray
+    after: np.ndarray
+    objective_before: float
+    objective_after: float
+    unallocated_usd: float
+    rows_projected: int
+    batches: int
+
+    def records(self) -> dict:
+        keys = [f"q{t}" for t in self.target_steps]
+        order = np.argsort(-self.allocation_usd, kind="stable")
+        return {
+            "objectiveBefore": round(self.objective_before, 4),
+            "objectiveAfter":  round(self.objective_after, 4),
+            "unallocatedUsd":  round(self.unallocated_usd, 2),
+            "allocations": [
+                {
+                    "row": int(c),
+                    "iso3": self.isos[c],
+                    "allocationUsd": round(float(self.allocation_usd[c]), 2),
+                    "neglectBefore": {k: round(float(v), 2) for k, v in zip(keys, self.before[c])},
+                    "neglectAfter":  {k: round(float(v), 2) for k, v in zip(keys, self.after[c])},
+                }
+                for c in order
+            ],
+        }
+
+
+def _greedy(cache: _ResponseCache, alloc: np.ndarray, cur: np.ndarray, remaining: int, step: int, cap: int, lookahead: int) -> int:
+    # Repeatedly give the country with the best gain per unit (over up to
+    # ``lookahead`` steps ahead) its steps, until no country gains.
+    n = len(alloc)
+    while remaining >= step:
+        cand = [(c, k) for c in range(n) for k in range(1, lookahead + 1) if alloc[c] + k * step <= cap and k * step <= remaining]
+        if not cand:
+            break
+        values = cache.get((c, int(alloc[c]) + k * step) for c, k in cand)
+        per_unit = np.array([(cur[c] - v) / k for (c, k), v in zip(cand, values)])
+        best = int(np.argmax(per_unit))
+        if per_unit[best] <= 0:
+            break
+        c, k = cand[best]
+        alloc[c] += k * step
+        cur[c] = values[best]
+        remaining -= k * step
+    return remaining
+
+
+def _coordinate(cache: _ResponseCache, alloc: np.ndarray, cur: np.ndarray, remaining: int, step: int, cap: int, max_moves: int) -> tuple[int, int]:
+    # Move ``step`` units from the unallocated pool, or from the country
+    # losing least, to the country gaining most, while that helps.
+    n = len(alloc)
+    moves = 0
+    while moves < max_moves:
+        up_ok = alloc + step <= cap
+        down_ok = alloc >= step
+        gain = np.full(n, -np.inf)
+        loss = np.full(n, np.inf)
+        up = cache.get((c, int(alloc[c]) + step) for c in np.flatnonzero(up_ok))
+        down = cache.get((c, int(alloc[c]) - step) for c in np.flatnonzero(down_ok))
+        gain[up_ok] = cur[up_ok] - up
+        loss[down_ok] = down - cur[down_ok]
+        r = int(np.argmax(gain))
+        if gain[r] <= 1e-12:
+            break
+        if remaining >= step:
+            alloc[r] += step
+            remaining -= step
+        else:
+            loss[r] = np.inf
+            d = int(np.argmin(loss))
+            if gain[r] - loss[d] <= 1e-12:
+                break
+            alloc[r] += step
+            alloc[d] -= step
+            cur[d] += loss[d]
+        cur[r] -= gain[r]
+        moves += 1
+    return remaining, moves
+
+
+def optimize_allocation(
+    projector: TemporalProjector,
+    feat_df: pd.DataFrame,
+    spec: AllocationSpec,
+    weights: Optional[Sequence[float]] = None,
+) -> AllocationResult:
+    """
+    Split ``spec.envelope_usd`` of CBPF funding across the countries in
+    ``feat_df`` (``TEMPORAL_FEATURE_COLS`` plus ``country_iso3``) to
+    minimize the (``weights``-weighted) sum of their projected ensemble
+    neglect at ``spec.target_steps``.  Money no country benefits from is
+    left unallocated.
+    """
+    if spec.mode not in ALLOCATION_MODES:
+        raise ValueError(f"unknown allocation mode {spec.mode!r}; expected one of {ALLOCATION_MODES}")
+    if spec.envelope_usd < 0 or spec.increments < 1 or min(spec.target_steps, default=0) < 1:
+        raise ValueError("envelope_usd must be >= 0, increments >= 1 and target_steps >= 1")
+
+    isos = [None if pd.isna(iso) else str(iso) for iso in feat_df["country_iso3"]] if "country_iso3" in feat_df.columns else [None] * len(feat_df)
+    states = projector.initial_states(feat_df)
+    n = len(states)
+    w = np.ones(n) if weights is None else np.asarray(weights, dtype=np.float64)
+    scale = 2 ** spec.refinements if spec.mode == "coordinate" else 1
+    total = spec.increments * scale
+    cap = int(np.floor(spec.max_share * total + 1e-9))
+    cache = _ResponseCache(projector, states, w, spec.envelope_usd / total, spec)
+
+    alloc = np.zeros(n, dtype=np.int64)
+    remaining = total
+    moves = 0
+    if n and spec.envelope_usd > 0:
+        cur = cache.get((c, 0) for c in range(n))
+        remaining = _greedy(cache, alloc, cur, remaining, scale, cap, spec.lookahead)
+        if spec.mode == "coordinate":
+            step = scale
+            while step >= 1:
+                remaining, m = _coordinate(cache, alloc, cur, remaining, step, cap, spec.max_moves)
+                moves += m
+                step //= 2
+
+    allocation_usd = alloc * cache.unit_usd
+    before = cache.targets(np.arange(n), np.zeros(n))
+    after = cache.targets(np.arange(n), alloc.astype(np.float64))
+    LOG.info(
+        "Allocation (%s): %d countries, %d coordinate moves, %d projector rows in %d batches",
+        spec.mode, n, moves, cache.rows_projected, cache.batches,
+    )
+    return AllocationResult(
+        isos, allocation_usd, tuple(spec.target_steps), before, after,
+        float((before.mean(axis=1) * w).sum()), float((after.mean(axis=1) * w).sum()),
+        remaining * cache.unit_usd, cache.rows_projected, cache.batches,
+    )
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import pathlib
+import threading
+from typing import Any, Callable
+
+import numpy as np
+import pandas as pd
+
+from shared.encoding import key_values
+
+LOG = logging.getLogger("train")
+
+# Bump whenever a bronze cleaner changes its output so stale caches rebuild.
+BRONZE_CACHE_VERSION = 3
+
+MANIFEST_NAME = "manifest.json"
+_HASH_CHUNK_BYTES = 1 << 20
+
+
+def file_sha256(path: pathlib.Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK_BYTES), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class BronzeCache:
+    """
+    Parquet cache of cleaned bronze tables.
+
+    Each entry is keyed by its source file's size, mtime and SHA-256.  When
+    size and mtime match the manifest the stored hash is trusted; otherwise
+    the file is re-hashed, so a touched-but-identical file still hits.
+    ``manifest.json`` records the fingerprints, each table's distinct key
+    values (so the key dictionary can be built without reading the tables)
+    and which tables the last run rebuilt.
+    """
+
+    def __init__(self, cache_dir: pathlib.Path) -> None:
+        self.cache_dir = pathlib.Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.manifest_path = self.cache_dir / MANIFEST_NAME
+        self._manifest = self._read_manifest()
+        self.rebuilt: list[str] = []
+        self.reused: list[str] = []
+        # load() may be called from several ingestion threads at once.
+        self._lock = threading.RLock()
+
+    def _read_manifest(self) -> dict[str, Any]:
+        try:
+            with open(self.manifest_path) as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return {"version": BRONZE_CACHE_VERSION, "tables": {}}
+        if manifest.get("version") != BRONZE_CACHE_VERSION:
+            return {"version": BRONZE_CACHE_VERSION, "tables": {}}
+        return manifest
+
+    def fingerprint(self, name: str, path: pathlib.Path) -> dict[str, Any]:
+        st = path.stat()
+        prev = self._manifest["tables"].get(name, {})
+        if prev.get("size") == st.st_size and prev.get("mtime_ns") == st.st_mtime_ns:
+            sha = prev.get("sha256") or file_sha256(path)
+        else:
+            sha = file_sha256(path)
+        return {
+            "source":   path.name,
+            "size":     st.st_size,
+            "mtime_ns": st.st_mtime_ns,
+            "sha256":   sha,
+        }
+
+    def key_values(self, name: str, path: pathlib.Path) -> dict[str, list[str]] | None:
+        """Cached distinct key values for ``name``, or None if the cache is stale."""
+        prev = self._manifest["tables"].get(name, {})
+        if "keys" not in prev or not (self.cache_dir / f"{name}.parquet").exists():
+            return None
+        if self.fingerprint(name, path)["sha256"] != prev.get("sha256"):
+            return None
+        return prev["keys"]
+
+    def load(
+        self,
+        name: str,
+        path: pathlib.Path,
+        loader: Callable[[pathlib.Path], pd.DataFrame],
+    ) -> pd.DataFrame:
+        fp = self.fingerprint(name, path)
+        prev = self._manifest["tables"].get(name, {})
+        cache_file = self.cache_dir / f"{name}.parquet"
+
+        if prev.get("sha256") == fp["sha256"] and cache_file.exists():
+            try:
+                df = _from_parquet(cache_file)
+            except Exception as exc:  # corrupt / partially written cache file
+                LOG.warning("bronze cache: %s unreadable (%s); rebuilding", cache_file.name, exc)
+            else:
+                keys = prev.get("keys") or key_values(df)
+                self._record(name, {**fp, "file": cache_file.name, "keys": keys, "rebuilt": False})
+                return df
+
+        df = loader(path)
+        df.to_parquet(cache_file, index=False)
+        self._record(name, {**fp, "file": cache_file.name, "keys": key_values(df), "rebuilt": True})
+        return df
+
+    def _record(self, name: str, entry: dict[str, Any]) -> None:
+        with self._lock:
+            (self.rebuilt if entry["rebuilt"] else self.reused).append(name)
+            self._manifest["tables"][name] = entry
+            self.write_manifest()
+        LOG.info("bronze cache: %s %s", "rebuilt" if entry["rebuilt"] else "reused", name)
+
+    def write_manifest(self) -> None:
+        with self._lock:
+            self._manifest["rebuilt"] = sorted(self.rebuilt)
+            tmp = self.manifest_path.with_suffix(".json.tmp")
+            with open(tmp, "w") as f:
+                json.dump(self._manifest, f, indent=2)
+            tmp.replace(self.manifest_path)
+
+
+def _from_parquet(cache_file: pathlib.Path) -> pd.DataFrame:
+    df = pd.read_parquet(cache_file)
+    # Parquet round-trips string nulls as None; the CSV reader yields NaN.
+    obj_cols = df.columns[df.dtypes == object]
+    if len(obj_cols):
+        df[obj_cols] = df[obj_cols].fillna(np.nan)
+    return df
@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+import hashlib
+import inspect
+import json
+import logging
+import pathlib
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence
+
+import joblib
+
+LOG = logging.getLogger("train")
+
+# Bump to invalidate every stored checkpoint (e.g. after a pickling change).
+CHECKPOINT_VERSION = 1
+
+MANIFEST_NAME = "steps.json"
+
+
+def _digest(obj: Any) -> str:
+    return hashlib.sha256(json.dumps(obj, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def _code_digest(objs: Sequence[Any]) -> str:
+    h = hashlib.sha256()
+    for obj in objs:
+        try:
+            h.update(inspect.getsource(obj).encode())
+        except (OSError, TypeError):
+            h.update(repr(obj).encode())
+    return h.hexdigest()
+
+
+@dataclass
+class Step:
+    """
+    One node of the training DAG.
+
+    ``run`` receives ``{upstream_name: outputs}`` for every name in
+    ``inputs`` and returns this step's outputs as a dict.  The step's key
+    hashes its name, the listed ``config`` fields, the source of ``code``,
+    ``sources()`` (fingerprints of external inputs such as data files) and
+    the keys of its inputs, so a change anywhere upstream changes every key
+    downstream.  ``persist=False`` steps are never cached (e.g. the
+    artifact writer, whose outputs are files).
+    """
+
+    name: str
+    run: Callable[[Dict[str, Dict[str, Any]]], Dict[str, Any]]
+    inputs: Sequence[str] = ()
+    config: Sequence[str] = ()
+    code: Sequence[Any] = ()
+    sources: Optional[Callable[[], Mapping[str, str]]] = None
+    persist: bool = True
+
+
+class CheckpointStore:
+    """
+    Content-addressed step outputs: ``objects/<key>.joblib`` plus a
+    ``steps.json`` manifest mapping each step to its latest key.  Objects
+    no longer referenced by the manifest are pruned on save.
+    """
+
+    def __init__(self, root: pathlib.Path) -> None:
+        self.root = pathlib.Path(root)
+        self.objects = self.root / "objects"
+        self.objects.mkdir(parents=True, exist_ok=True)
+        self.manifest_path = self.root / MANIFEST_NAME
+        self._manifest = self._read_manifest()
+
+    def _read_manifest(self) -> Dict[str, Any]:
+        try:
+            with open(self.manifest_path) as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return {"version": CHECKPOINT_VERSION, "steps": {}}
+        if manifest.get("version") != CHECKPOINT_VERSION:
+            return {"version": CHECKPOINT_VERSION, "steps": {}}
+        return manifest
+
+    def _path(self, key: str) -> pathlib.Path:
+        return self.objects / f"{key}.joblib"
+
+    def latest_key(self, name: str) -> Optional[str]:
+        return self._manifest["steps"].get(name, {}).get("key")
+
+    def has(self, key: str) -> bool:
+        return self._path(key).exists()
+
+    def load(self, key: str) -> Dict[str, Any]:
+        return joblib.load(self._path(key))
+
+    def save(self, name: str, key: str, outputs: Dict[str, Any]) -> None:
+        tmp = self._path(key).with_suffix(".tmp")
+        joblib.dump(outputs, tmp)
+        tmp.replace(self._path(key))
+        self._manifest["steps"][name] = {"key": key, "outputs": sorted(outputs), "saved": time.strftime("%Y-%m-%dT%H:%M:%S")}
+        tmp_manifest = self.manifest_path.with_suffix(".json.tmp")
+        with open(tmp_manifest, "w") as f:
+            json.dump(self._manifest, f, indent=2)
+        tmp_manifest.replace(self.manifest_path)
+        live = {f"{s['key']}.joblib" for s in self._manifest["steps"].values()}
+        for p in self.objects.glob("*.joblib"):
+            if p.name not in live:
+                p.unlink(missing_ok=True)
+
+
+@dataclass
+class StepRunner:
+    """
+    Runs ``steps`` (in dependency order) against an optional store.
+
+    A persisted step is skipped when the store holds its current key.
+    ``from_step`` forces that step and everything after it to run.
+    ``only_step`` runs just that step, feeding it the latest stored
+    outputs of its inputs even if their keys are stale, and stops; its
+    output is keyed on the input checkpoints it actually read, so a later
+    run with fresh inputs does not take it as up to date.
+    Outputs of skipped steps are only loaded if a running step needs them.
+    """
+
+    steps: Sequence[Step]
+    config: Any
+    store: Optional[CheckpointStore] = None
+    stage: Optional[Callable[[str], Any]] = None
+    status: Dict[str, Dict[str, str]] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        self._by_name = {s.name: s for s in self.steps}
+        self._outputs: Dict[str, Dict[str, Any]] = {}
+        self._keys: Dict[str, str] = {}
+        # Key of the checkpoint each loaded output came from.
+        self._loaded: Dict[str, str] = {}
+
+    def _key(self, step: Step, keys: Mapping[str, str]) -> str:
+        return _digest({
+            "version": CHECKPOINT_VERSION,
+            "step":    step.name,
+            "config":  {c: getattr(self.config, c) for c in step.config},
+            "code":    _code_digest(step.code),
+            "sources": dict(step.sources()) if step.sources is not None else {},
+            "inputs":  {i: keys[i] for i in step.inputs},
+        })
+
+    def _check(self, name: Optional[str]) -> None:
+        if name is not None and name not in self._by_name:
+            raise ValueError(f"unknown step {name!r}; expected one of {list(self._by_name)}")
+
+    def _outputs_of(self, name: str, keys: Mapping[str, str], stale_ok: bool = False) -> Dict[str, Any]:
+        if name not in self._outputs:
+            key = keys[name]
+            if self.store is not None and not self.store.has(key) and stale_ok:
+                latest = self.store.latest_key(name)
+                if latest is not None and self.store.has(latest):
+                    LOG.warning("step %s: using stale checkpoint %s (current key %s)", name, latest[:12], key[:12])
+                    key = latest
+            if self.store is None or not self.store.has(key):
+                raise RuntimeError(f"step {name!r} has no checkpoint; run it first (e.g. --from-step {name})")
+            self._outputs[name] = self.store.load(key)
+            self._loaded[name] = key
+            self.status.setdefault(name, {"key": key, "status": "loaded"})
+        return self._outputs[name]
+
+    def _execute(self, step: Step, key: str, keys: Mapping[str, str], stale_ok: bool) -> None:
+        inputs = {i: self._outputs_of(i, keys, stale_ok=stale_ok) for i in step.inputs}
+        LOG.info("step %s: running (key %s)", step.name, key[:12])
+        if self.stage is not None:
+            with self.stage(step.name):
+                outputs = step.run(inputs)
+        else:
+            outputs = step.run(inputs)
+        self._outputs[step.name] = outputs
+        if self.store is not None and step.persist:
+            self.store.save(step.name, key, outputs)
+        self.status[step.name] = {"key": key, "status": "ran"}
+
+    def run(
+        self,
+        from_step: Optional[str] = None,
+        only_step: Optional[str] = None,
+        until: Optional[str] = None,
+    ) -> Dict[str, Dict[str, Any]]:
+        """Run the DAG (see the class docstring); ``until`` stops after that step."""
+        self._check(from_step)
+        self._check(only_step)
+        self._check(until)
+        names: List[str] = [s.name for s in self.steps]
+        keys: Dict[str, str] = {}
+        for step in self.steps:
+            keys[step.name] = self._key(step, keys)
+        self._keys = keys
+
+        if only_step is not None:
+            step = self._by_name[only_step]
+            for name in step.inputs:
+                self._outputs_of(name, keys, stale_ok=True)
+            read = {**keys, **{name: self._loaded[name] for name in step.inputs}}
+            self._execute(step, self._key(step, read), keys, stale_ok=True)
+            return self._outputs
+
+        forced = set(names[names.index(from_step):]) if from_step is not None else set()
+        for step in self.steps:
+            key = keys[step.name]
+            cached = (
+                step.name not in forced and step.persist
+                and self.store is not None and self.store.has(key)
+            )
+            if cached:
+                LOG.info("step %s: up to date (key %s), skipped", step.name, key[:12])
+                self.status[step.name] = {"key": key, "status": "cached"}
+            else:
+                self._execute(step, key, keys, stale_ok=False)
+            if step.name == until:
+                break
+        return self._outputs
+
+    def previous(self, name: str) -> Optional[Dict[str, Any]]:
+        """Outputs of the last stored run of ``name`` whatever its key, or None."""
+        key = self.store.latest_key(name) if self.store is not None else None
+        if key is None or not self.store.has(key):
+            return None
+        return self.store.load(key)
+
+    def outputs(self, name: str) -> Dict[str, Any]:
+        """Outputs of ``name`` from this run, loading its checkpoint if it was skipped."""
+        return self._outputs_of(name, self._keys)
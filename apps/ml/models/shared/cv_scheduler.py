@@ -0,0 +1,255 @@
+from __future__ import annotations
+
+import logging
+import pathlib
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import joblib
+import numpy as np
+from sklearn.base import BaseEstimator, RegressorMixin, clone
+from sklearn.metrics import get_scorer
+
+from shared.early_stopping import EarlyStoppingRegressor
+
+LOG = logging.getLogger("train")
+
+Split = Tuple[np.ndarray, np.ndarray]
+
+
+@dataclass
+class CVJob:
+    """
+    Cross-validation of several models on one dataset.
+
+    ``splits`` are the materialized (train, test) index pairs, so every
+    (model, fold) pair of every job is an independent task.  ``label`` is
+    the key the job's results come back under ("current", "1yr", ...).
+    After a run ``oof`` holds each model's out-of-fold predictions aligned
+    with ``y`` (NaN for rows no fold held out) and ``timings`` each model's
+    summed fold fit / predict seconds.  Early-stopped models (see
+    ``shared.early_stopping``) also report each fold's best iteration count
+    in ``iterations``.
+
+    With ``rows`` set, ``X`` is a matrix shared by several jobs (usually
+    memory-mapped, see ``share_readonly``) and the job's dataset is
+    ``X[rows]``; ``y``, ``splits`` and ``oof`` are in job-row order.
+
+    ``nested`` optionally holds one job per fold, cross-validating the
+    same models on that fold's training rows only; their OOF predictions
+    never saw the fold's test rows (see ``stacking_cv_scores``).  They are
+    scheduled by the caller, with ``report=False`` to keep their scores
+    out of the log.
+    """
+
+    label: str
+    estimators: Dict[str, Any]
+    X: np.ndarray
+    y: np.ndarray
+    splits: List[Split]
+    scoring: str = "r2"
+    header: str = ""
+    indent: int = 2
+    rows: Optional[np.ndarray] = None
+    oof: Dict[str, np.ndarray] = field(default_factory=dict)
+    timings: Dict[str, Dict[str, float]] = field(default_factory=dict)
+    iterations: Dict[str, List[int]] = field(default_factory=dict)
+    nested: List["CVJob"] = field(default_factory=list)
+    report: bool = True
+
+
+@dataclass
+class FitTask:
+    """One full fit of ``estimator`` on ``X[rows]`` (all of ``X`` if rows is None)."""
+
+    key: Tuple[str, str]
+    estimator: Any
+    X: np.ndarray
+    y: np.ndarray
+    rows: Optional[np.ndarray] = None
+
+
+def share_readonly(arr: np.ndarray, directory: pathlib.Path, name: str) -> np.ndarray:
+    """
+    Write ``arr`` once under ``directory`` and return a read-only memmap of
+    it.  joblib pickles a memmap as its file path, so every worker maps the
+    same pages instead of receiving its own copy.
+    """
+    path = pathlib.Path(directory) / f"{name}.mmap"
+    joblib.dump(np.ascontiguousarray(arr), path)
+    return joblib.load(path, mmap_mode="r")
+
+
+def _take(X: np.ndarray, rows: Optional[np.ndarray], idx: np.ndarray) -> np.ndarray:
+    return X[idx] if rows is None else X[rows[idx]]
+
+
+def _fit_and_score(estimator: Any, X: np.ndarray, y: np.ndarray, train: np.ndarray, test: np.ndarray, scoring: str, rows: Optional[np.ndarray] = None) -> Tuple[float, float, float, np.ndarray, Optional[int]]:
+    # Mirrors cross_val_score: a fresh clone per fold, scored on the held-out
+    # rows; the held-out predictions are returned for the OOF matrix, with
+    # the early-stopping iteration when the (final) estimator is an
+    # EarlyStoppingRegressor (LightGBM has its own, unrelated best_iteration_).
+    t0 = time.perf_counter()
+    est = clone(estimator)
+    est.fit(_take(X, rows, train), y[train])
+    t1 = time.perf_counter()
+    pred = est.predict(_take(X, rows, test))
+    t2 = time.perf_counter()
+    score = _score_predictions(scoring, y[test], pred)
+    final = est[-1] if hasattr(est, "steps") else est
+    return score, t1 - t0, t2 - t1, pred, final.best_iteration_ if isinstance(final, EarlyStoppingRegressor) else None
+
+
+class _Predicted(RegressorMixin, BaseEstimator):
+    """Stands in for a fitted regressor whose ``predict`` output is already known."""
+
+    def __init__(self, pred: np.ndarray) -> None:
+        self.pred = pred
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        return self.pred
+
+
+def _score_predictions(scoring: str, y_true: np.ndarray, pred: np.ndarray) -> float:
+    # The named scorer applied to predictions already made, so a fold
+    # predicts its test rows once.  Regression scorers all score ``predict``
+    # output; the rows passed alongside are never looked at.
+    return float(get_scorer(scoring)(_Predicted(pred), np.empty((len(pred), 0)), y_true))
+
+
+def _fit(estimator: Any, X: np.ndarray, y: np.ndarray, rows: Optional[np.ndarray]) -> Tuple[Any, float]:
+    t0 = time.perf_counter()
+    fitted = estimator.fit(X if rows is None else X[rows], y)
+    return fitted, time.perf_counter() - t0
+
+
+def available_cores() -> int:
+    """Cores this process may use (respects affinity masks and cgroup quotas)."""
+    return max(int(joblib.cpu_count()), 1)
+
+
+@dataclass(frozen=True)
+class CpuBudget:
+    """
+    How training splits its cores between levels of parallelism.
+
+    ``cv_workers`` processes each run one CV task with ``threads_per_worker``
+    model threads, so ``cv_workers * threads_per_worker <= cores``.  Full
+    fits run one at a time in the main process with ``fit_threads``.
+    """
+
+    cores: int
+    cv_workers: int
+    threads_per_worker: int
+    fit_threads: int
+
+    @classmethod
+    def plan(cls, cores: Optional[int] = None, cv_workers: Optional[int] = None) -> "CpuBudget":
+        """Budget for ``cores`` (default and cap: available cores)."""
+        total = min(cores or available_cores(), available_cores())
+        workers = max(min(cv_workers or total, total), 1)
+        return cls(cores=total, cv_workers=workers, threads_per_worker=max(total // workers, 1), fit_threads=total)
+
+    def pool(self, n_tasks: int) -> Tuple[int, int]:
+        """(workers, threads per worker) for ``n_tasks`` independent tasks."""
+        workers = max(min(self.cv_workers, n_tasks), 1)
+        return workers, max(self.cores // workers, 1)
+
+    def as_dict(self) -> Dict[str, int]:
+        return {
+            "cores":              self.cores,
+            "cv_workers":         self.cv_workers,
+            "threads_per_worker": self.threads_per_worker,
+            "fit_threads":        self.fit_threads,
+        }
+
+
+def run_cv_jobs(
+    jobs: Sequence[CVJob],
+    n_workers: Optional[int] = None,
+    inner_threads: Optional[int] = None,
+) -> Dict[str, Dict[str, Dict[str, float]]]:
+    """
+    Run every (job, model, fold) task of ``jobs`` in one process pool and
+    return ``{label: {model: {"mean", "std"}}}``; scores match
+    ``cross_val_score`` run model by model.
+
+    The pool is sized to ``n_workers`` (default: all available cores),
+    capped at the number of tasks; one worker runs the tasks in-process.
+    ``inner_threads`` caps OpenMP / BLAS threads inside each worker.
+    Large arrays are memory-mapped into the workers by joblib instead of
+    being pickled per task.
+    """
+    tasks = [
+        (j, name, fold, job.estimators[name], job.X, job.y, train, test, job.scoring, job.rows)
+        for j, job in enumerate(jobs)
+        for name in job.estimators
+        for fold, (train, test) in enumerate(job.splits)
+    ]
+    workers = min(n_workers or available_cores(), max(len(tasks), 1))
+    LOG.info("CV scheduler: %d tasks (%d jobs) on %d workers x %s threads", len(tasks), len(jobs), workers, inner_threads or "default")
+
+    t0 = time.perf_counter()
+    backend = "loky" if workers > 1 else "sequential"
+    with joblib.parallel_config(backend=backend, inner_max_num_threads=inner_threads if workers > 1 else None):
+        results = joblib.Parallel(n_jobs=workers)(
+            joblib.delayed(_fit_and_score)(est, X, y, train, test, scoring, rows)
+            for (_j, _name, _fold, est, X, y, train, test, scoring, rows) in tasks
+        )
+    busy = sum(fit_s + predict_s for _score, fit_s, predict_s, _pred, _n_iter in results)
+    wall = time.perf_counter() - t0
+    LOG.info("CV scheduler: %.1fs wall, %.1fs task time (%.1fx)", wall, busy, busy / max(wall, 1e-9))
+
+    scores: Dict[Tuple[int, str], List[float]] = {}
+    for job in jobs:
+        job.oof = {name: np.full(len(job.y), np.nan) for name in job.estimators}
+        job.timings = {name: {"cv_fit_s": 0.0, "cv_predict_s": 0.0, "folds": 0} for name in job.estimators}
+        job.iterations = {}
+    for (j, name, fold, *_rest), (score, fit_s, predict_s, pred, n_iter) in zip(tasks, results):
+        scores.setdefault((j, name), []).append(score)
+        jobs[j].oof[name][jobs[j].splits[fold][1]] = pred
+        if n_iter is not None:
+            jobs[j].iterations.setdefault(name, []).append(int(n_iter))
+        t = jobs[j].timings[name]
+        t["cv_fit_s"] += fit_s
+        t["cv_predict_s"] += predict_s
+        t["folds"] += 1
+
+    out: Dict[str, Dict[str, Dict[str, float]]] = {}
+    for j, job in enumerate(jobs):
+        if job.header and job.report:
+            LOG.info(job.header)
+        pad = " " * job.indent
+        res: Dict[str, Dict[str, float]] = {}
+        for name in job.estimators:
+            s = np.asarray(scores.get((j, name), []), dtype=float)
+            res[name] = {"mean": float(s.mean()), "std": float(s.std())}
+            if job.report:
+                LOG.info("%s%-15s R2=%.4f ± %.4f", pad, name, s.mean(), s.std())
+        out[job.label] = res
+    return out
+
+
+def fit_many(
+    tasks: Sequence[FitTask],
+    n_workers: int = 1,
+    inner_threads: Optional[int] = None,
+    timings: Optional[Dict[Tuple[str, str], float]] = None,
+) -> Dict[Tuple[str, str], Any]:
+    """
+    Run independent full fits concurrently and return ``{key: fitted}``.
+    Estimators are fit in the workers and pickled back; inputs are best
+    passed as ``share_readonly`` memmaps with ``rows``.  If ``timings`` is
+    given, each fit's seconds are written into it.
+    """
+    workers = min(max(n_workers, 1), max(len(tasks), 1))
+    LOG.info("Fit pool: %d fits on %d workers x %s threads", len(tasks), workers, inner_threads or "default")
+    backend = "loky" if workers > 1 else "sequential"
+    with joblib.parallel_config(backend=backend, inner_max_num_threads=inner_threads if workers > 1 else None):
+        fitted = joblib.Parallel(n_jobs=workers)(
+            joblib.delayed(_fit)(t.estimator, t.X, t.y, t.rows) for t in tasks
+        )
+    if timings is not None:
+        timings.update({t.key: secs for t, (_f, secs) in zip(tasks, fitted)})
+    return {t.key: f for t, (f, _secs) in zip(tasks, fitted)}
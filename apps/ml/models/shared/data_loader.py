@@ -1,10 +1,23 @@
 from __future__ import annotations
 
+import logging
 import pathlib
+import time
+from collections.abc import Mapping
+from functools import cached_property, partial
+from typing import Any, Callable, Iterable
 
 import numpy as np
 import pandas as pd
 
+from shared.bronze_cache import BronzeCache, file_sha256
+from shared.encoding import KeyCodec, key_values
+from shared.kernels import GroupOffsets, group_zscore
+from shared.lazy import LazyTables
+from shared.multiyear_store import MultiYearGoldStore
+
+LOG = logging.getLogger("train")
+
 CLUSTER_MAP: dict[str, str] = {
     "EDU": "Education",
     "FSC": "Food Security",
@@ -27,11 +40,14 @@ def load_csv(data_dir: pathlib.Path, fname: str) -> pd.DataFrame:
     return df
 
 
-def load_bronze(data_dir: pathlib.Path) -> dict[str, pd.DataFrame]:
-    hno_2026 = load_csv(data_dir, "hpc_hno_2026.csv")
+def _load_hno_2026(path: pathlib.Path) -> pd.DataFrame:
+    hno_2026 = load_csv(path.parent, path.name)
     hno_2026.rename(columns={"Country ISO3": "country_iso3"}, inplace=True)
+    return hno_2026
 
-    fts_req = load_csv(data_dir, "fts_requirements_funding_global.csv")
+
+def _load_fts_req(path: pathlib.Path) -> pd.DataFrame:
+    fts_req = load_csv(path.parent, path.name)
     fts_req.rename(columns={
         "countryCode": "country_iso3", "requirements": "req_usd",
         "funding": "funded_usd", "percentFunded": "pct_funded",
@@ -40,8 +56,11 @@ def load_bronze(data_dir: pathlib.Path) -> dict[str, pd.DataFrame]:
     for c in ["req_usd", "funded_usd", "pct_funded"]:
         fts_req[c] = pd.to_numeric(fts_req[c], errors="coerce")
     fts_req["year"] = pd.to_numeric(fts_req["year"], errors="coerce")
+    return fts_req
+
 
-    fts_cluster = load_csv(data_dir, "fts_requirements_funding_cluster_global.csv")
+def _load_fts_cluster(path: pathlib.Path) -> pd.DataFrame:
+    fts_cluster = load_csv(path.parent, path.name)
     fts_cluster.rename(columns={
         "countryCode": "country_iso3", "cluster": "cluster_name",
         "requirements": "cluster_req_usd", "funding": "cluster_funded_usd",
@@ -50,104 +69,288 @@ def load_bronze(data_dir: pathlib.Path) -> dict[str, pd.DataFrame]:
     for c in ["cluster_req_usd", "cluster_funded_usd"]:
         fts_cluster[c] = pd.to_numeric(fts_cluster[c], errors="coerce")
     fts_cluster["year"] = pd.to_numeric(fts_cluster["year"], errors="coerce")
+    return fts_cluster
+
+
+# Only these columns of the outgoing-flows dump are ever used downstream.
+# The numeric ones are read as text and coerced per chunk, so a stray cell
+# like "2019-2020" becomes NaN instead of failing the whole read.
+FTS_OUT_DTYPES: dict[str, str] = {
+    "destOrganizationTypes": "object",
+    "destLocations":         "object",
+    "amountUSD":             "object",
+    "budgetYear":            "object",
+}
+FTS_OUT_CHUNK_ROWS = 250_000
+
+
+def _cbpf_chunk_sums(chunk: pd.DataFrame) -> pd.DataFrame:
+    cbpf = chunk[chunk["destOrganizationTypes"].str.contains("Pooled Fund", na=False)]
+    exploded = (
+        pd.DataFrame({
+            "country_iso3":   cbpf["destLocations"].str.split(","),
+            "year":           pd.to_numeric(cbpf["budgetYear"], errors="coerce"),
+            "cbpf_alloc_usd": pd.to_numeric(cbpf["amountUSD"], errors="coerce"),
+        })
+        .explode("country_iso3")
+        .assign(country_iso3=lambda d: d["country_iso3"].str.strip())
+    )
+    return (
+        exploded.dropna(subset=["country_iso3"])
+        .groupby(["country_iso3", "year"], dropna=False, as_index=False)["cbpf_alloc_usd"].sum()
+    )
+
+
+def stream_cbpf_allocations(
+    path: pathlib.Path,
+    chunksize: int = FTS_OUT_CHUNK_ROWS,
+) -> pd.DataFrame:
+    """
+    Stream the FTS outgoing-flows file and return CBPF allocation sums per
+    (country_iso3, budget year).  Only ``FTS_OUT_DTYPES`` columns are read,
+    in ``chunksize``-row chunks; each chunk is filtered to "Pooled Fund"
+    destinations, exploded on ``destLocations`` and folded into a running
+    total, so peak memory is bounded by the chunk size, not the file size.
+    Rows without a budget year keep ``year=NaN`` so all-years totals match.
+    """
+    head = pd.read_csv(path, nrows=1, dtype=str)
+    has_hxl = len(head) > 0 and str(head.iloc[0, 0]).startswith("#")
+
+    total = pd.DataFrame({
+        "country_iso3":   pd.Series(dtype=object),
+        "year":           pd.Series(dtype="float64"),
+        "cbpf_alloc_usd": pd.Series(dtype="float64"),
+    })
+    reader = pd.read_csv(
+        path,
+        usecols=list(FTS_OUT_DTYPES),
+        dtype=FTS_OUT_DTYPES,
+        skiprows=[1] if has_hxl else None,
+        chunksize=chunksize,
+    )
+    with reader:
+        for chunk in reader:
+            total = (
+                pd.concat([total, _cbpf_chunk_sums(chunk)], ignore_index=True)
+                .groupby(["country_iso3", "year"], dropna=False, as_index=False)["cbpf_alloc_usd"].sum()
+            )
+    return total
 
-    fts_out = load_csv(data_dir, "fts_outgoing_funding_global.csv")
-    fts_out["amountUSD"] = pd.to_numeric(fts_out["amountUSD"], errors="coerce")
 
-    pop = load_csv(data_dir, "cod_population_admin0.csv")
+def _load_pop_total(path: pathlib.Path) -> pd.DataFrame:
+    pop = load_csv(path.parent, path.name)
     pop.rename(columns={"ISO3": "country_iso3"}, inplace=True)
     pop["Population"] = pd.to_numeric(pop["Population"], errors="coerce")
-    pop_total = (
+    return (
         pop[pop["Population_group"] == "T_TL"]
         .groupby("country_iso3", as_index=False)["Population"].sum()
         .rename(columns={"Population": "population"})
     )
 
-    return {
-        "hno_2026":   hno_2026,
-        "fts_req":    fts_req,
-        "fts_cluster": fts_cluster,
-        "fts_out":    fts_out,
-        "pop_total":  pop_total,
-    }
 
+# Bronze table name -> (source CSV, cleaner).  Each cleaner reads exactly one
+# file, so its output can be cached against that file's fingerprint.
+BRONZE_SOURCES: dict[str, tuple[str, Callable[[pathlib.Path], pd.DataFrame]]] = {
+    "hno_2026":     ("hpc_hno_2026.csv",                            _load_hno_2026),
+    "fts_req":      ("fts_requirements_funding_global.csv",         _load_fts_req),
+    "fts_cluster":  ("fts_requirements_funding_cluster_global.csv", _load_fts_cluster),
+    "fts_out_cbpf": ("fts_outgoing_funding_global.csv",             stream_cbpf_allocations),
+    "pop_total":    ("cod_population_admin0.csv",                   _load_pop_total),
+}
 
-def build_silver(bronze: dict[str, pd.DataFrame]) -> dict[str, pd.DataFrame]:
-    hno_2026    = bronze["hno_2026"]
-    fts_cluster = bronze["fts_cluster"]
-    fts_out     = bronze["fts_out"]
 
+class BronzeTables(LazyTables):
+    """
+    Lazy bronze layer.  Each table is parsed (or read from the bronze cache)
+    and key-encoded on first access.  ``materialize`` parses the pending
+    sources concurrently before encoding them.
+    """
+
+    def __init__(self, raw: LazyTables, codec: Callable[[], KeyCodec]) -> None:
+        self.raw = raw
+        self._codec = LazyTables({"codec": codec}, layer="codec")
+        super().__init__(
+            {name: partial(self._encoded, name) for name in raw},
+            layer="bronze",
+        )
+
+    @property
+    def codec(self) -> KeyCodec:
+        return self._codec["codec"]
+
+    def _encoded(self, name: str) -> pd.DataFrame:
+        return self.codec.encode(self.raw[name])
+
+    def materialize(self, names: Iterable[str] | None = None, workers: int = 1) -> "BronzeTables":
+        names = list(names if names is not None else self)
+        t0 = time.perf_counter()
+        self.raw.materialize(names, workers=workers)
+        super().materialize(names)
+        LOG.info("  bronze wall time %.2fs (workers=%d)", time.perf_counter() - t0, workers)
+        return self
+
+
+def load_bronze(
+    data_dir: pathlib.Path,
+    cache_dir: pathlib.Path | None = None,
+    timings: dict[str, float] | None = None,
+) -> BronzeTables:
+    """
+    Return the five bronze tables as a lazy ``BronzeTables``; a source is
+    only parsed when one of its tables (or something built from it) is
+    accessed.  Call ``materialize(workers=...)`` to parse everything up front
+    in a thread pool (the CSV and Parquet readers release the GIL while
+    parsing).
+
+    When ``cache_dir`` is given, each cleaned table is stored there as Parquet
+    keyed by its source file's size, mtime and SHA-256, and reused while the
+    source is unchanged.  Country and cluster keys come back
+    dictionary-encoded (see ``shared.encoding``); the dictionary is built
+    from the cache manifest where possible, so on a warm cache partial jobs
+    never touch unrelated sources.  Per-source load time is logged and, if
+    ``timings`` is given, written into it.
+    """
+    cache = BronzeCache(cache_dir) if cache_dir is not None else None
+
+    def _load(name: str) -> pd.DataFrame:
+        fname, loader = BRONZE_SOURCES[name]
+        path = data_dir / fname
+        t0 = time.perf_counter()
+        df = loader(path) if cache is None else cache.load(name, path, loader)
+        secs = time.perf_counter() - t0
+        LOG.info("  bronze %-13s %7.2fs  rows=%d", name, secs, len(df))
+        if timings is not None:
+            timings[name] = secs
+        return df
+
+    raw = LazyTables({name: partial(_load, name) for name in BRONZE_SOURCES}, layer="bronze-raw")
+
+    def _codec() -> KeyCodec:
+        per_table = []
+        for name, (fname, _) in BRONZE_SOURCES.items():
+            keys = None
+            if cache is not None and not raw.is_loaded(name):
+                keys = cache.key_values(name, data_dir / fname)
+            per_table.append(keys if keys is not None else key_values(raw[name]))
+        return KeyCodec.from_key_values(per_table, extra_clusters=CLUSTER_MAP.values())
+
+    return BronzeTables(raw, _codec)
+
+
+def source_fingerprints(data_dir: pathlib.Path, cache_dir: pathlib.Path | None = None) -> dict[str, str]:
+    """
+    SHA-256 of every bronze source file ("missing" if absent).  With a
+    ``cache_dir`` the bronze cache manifest's hashes are reused for files
+    whose size and mtime are unchanged, so this rarely reads the CSVs.
+    """
+    cache = BronzeCache(cache_dir) if cache_dir is not None else None
+    out: dict[str, str] = {}
+    for name, (fname, _) in BRONZE_SOURCES.items():
+        path = data_dir / fname
+        if not path.exists():
+            out[name] = "missing"
+        elif cache is not None:
+            out[name] = cache.fingerprint(name, path)["sha256"]
+        else:
+            out[name] = file_sha256(path)
+    return out
+
+
+class CbpfAllocationIndex:
+    """
+    CBPF allocation sums at (country_iso3, budget year) grain, built once per
+    bronze load and shared by ``build_silver`` and ``build_gold_multiyear``.
+    ``yearly`` drops flows without a budget year; ``totals`` keeps them so it
+    equals the all-years sum over the raw flows.
+    """
+
+    def __init__(self, fts_out_cbpf: pd.DataFrame) -> None:
+        self.allocations = (
+            fts_out_cbpf.dropna(subset=["country_iso3"])
+            .groupby(["country_iso3", "year"], dropna=False, observed=True, as_index=False)["cbpf_alloc_usd"].sum()
+        )
+
+    @cached_property
+    def yearly(self) -> pd.DataFrame:
+        yearly = (
+            self.allocations.dropna(subset=["year"])
+            .rename(columns={"cbpf_alloc_usd": "cbpf_total_usd"})
+            .reset_index(drop=True)
+        )
+        yearly["year"] = yearly["year"].astype(int)
+        return yearly
+
+    @cached_property
+    def totals(self) -> pd.DataFrame:
+        return (
+            self.allocations.groupby("country_iso3", observed=True)["cbpf_alloc_usd"].sum()
+            .reset_index().rename(columns={"cbpf_alloc_usd": "cbpf_total_usd"})
+        )
+
+
+def _hno26_clean(hno_2026: pd.DataFrame) -> pd.DataFrame:
     hno26_clean = hno_2026.copy()
     hno26_clean["cluster"]  = hno26_clean.get("Cluster",  hno26_clean.get("cluster", ""))
     hno26_clean["pin"]      = pd.to_numeric(hno26_clean.get("In Need",  np.nan), errors="coerce")
     hno26_clean["targeted"] = pd.to_numeric(hno26_clean.get("Targeted", np.nan), errors="coerce")
+    return hno26_clean
 
-    silver_severity = (
+
+def _silver_severity(hno26_clean: pd.DataFrame) -> pd.DataFrame:
+    return (
         hno26_clean[hno26_clean["cluster"].astype(str).str.upper() == "ALL"]
         [["country_iso3", "pin", "targeted"]].dropna(subset=["pin"])
         .drop_duplicates("country_iso3")
     )
 
-    cbpf_out = fts_out[
-        fts_out["destOrganizationTypes"].astype(str).str.contains("Pooled Fund", na=False)
-    ].copy()
-    cbpf_out.rename(columns={
-        "destLocations": "country_iso3", "amountUSD": "cbpf_alloc_usd"
-    }, inplace=True)
-    cbpf_out = (
-        cbpf_out
-        .assign(country_iso3=cbpf_out["country_iso3"].str.split(","))
-        .explode("country_iso3")
-        .assign(country_iso3=lambda d: d["country_iso3"].str.strip())
-    )
-    cbpf_by_iso = (
-        cbpf_out.groupby("country_iso3")["cbpf_alloc_usd"].sum()
-        .reset_index().rename(columns={"cbpf_alloc_usd": "cbpf_total_usd"})
-    )
-
-    silver_hrp = fts_cluster.dropna(subset=["country_iso3", "cluster_name"]).copy()
-
-    return {
-        "hno26_clean":     hno26_clean,
-        "silver_severity": silver_severity,
-        "cbpf_by_iso":     cbpf_by_iso,
-        "silver_hrp":      silver_hrp,
-    }
 
+def build_silver(bronze: Mapping[str, pd.DataFrame]) -> LazyTables:
+    silver = LazyTables(layer="silver")
+    silver.define("hno26_clean",     lambda: _hno26_clean(bronze["hno_2026"]))
+    silver.define("silver_severity", lambda: _silver_severity(silver["hno26_clean"]))
+    silver.define("cbpf_index",      lambda: CbpfAllocationIndex(bronze["fts_out_cbpf"]))
+    silver.define("cbpf_by_iso",     lambda: silver["cbpf_index"].totals)
+    silver.define("silver_hrp",      lambda: bronze["fts_cluster"].dropna(subset=["country_iso3", "cluster_name"]).copy())
+    return silver
 
-def _z_score(x: pd.Series) -> pd.Series:
-    mu, sigma = x.mean(), x.std()
-    return (x - mu) / sigma if sigma > 0 else pd.Series(0, index=x.index)
 
-
-def build_gold_multiyear(bronze: dict[str, pd.DataFrame]) -> pd.DataFrame:
+def build_gold_multiyear(
+    bronze: Mapping[str, pd.DataFrame],
+    cbpf_index: CbpfAllocationIndex | None = None,
+    store: MultiYearGoldStore | None = None,
+) -> pd.DataFrame:
     """
     Build a multi-year gold table (one row per country-year) for forecast
     model training.  Covers all years where req_usd > 0 in fts_req, using
     CBPF outgoing flows and cluster-level BBR proxy z-scores per year.
+    Pass the silver ``cbpf_index`` to reuse it instead of rebuilding it.
+
+    With a ``store`` the table is persisted partitioned by year and only the
+    years whose source rows changed are recomputed; every step below works
+    within a single year, so unchanged partitions are reused as-is.
     """
     fts_req     = bronze["fts_req"]
     pop_total   = bronze["pop_total"]
-    fts_out     = bronze["fts_out"]
     fts_cluster = bronze["fts_cluster"]
-
-    # ── CBPF allocation by country and budget year ─────────────────────────
-    cbpf_out = fts_out[
-        fts_out["destOrganizationTypes"].astype(str).str.contains("Pooled Fund", na=False)
-    ].copy()
-    cbpf_out["year"] = pd.to_numeric(cbpf_out["budgetYear"], errors="coerce")
-    cbpf_out = (
-        cbpf_out.assign(country_iso3=cbpf_out["destLocations"].str.split(","))
-        .explode("country_iso3")
-        .assign(country_iso3=lambda d: d["country_iso3"].str.strip())
-    )
-    cbpf_yearly = (
-        cbpf_out.dropna(subset=["country_iso3", "year"])
-        .groupby(["country_iso3", "year"])["amountUSD"].sum()
-        .reset_index().rename(columns={"amountUSD": "cbpf_total_usd"})
+    if cbpf_index is None:
+        cbpf_index = CbpfAllocationIndex(bronze["fts_out_cbpf"])
+    cbpf_yearly = cbpf_index.yearly
+
+    if store is None:
+        return _gold_multiyear_frame(fts_req, fts_cluster, cbpf_yearly, pop_total)
+    return store.refresh(
+        by_year={"fts_req": fts_req, "fts_cluster": fts_cluster, "cbpf_yearly": cbpf_yearly},
+        shared={"pop_total": pop_total},
+        build=lambda t: _gold_multiyear_frame(t["fts_req"], t["fts_cluster"], t["cbpf_yearly"], t["pop_total"]),
     )
-    cbpf_yearly["year"] = cbpf_yearly["year"].astype(int)
 
+
+def _gold_multiyear_frame(
+    fts_req: pd.DataFrame,
+    fts_cluster: pd.DataFrame,
+    cbpf_yearly: pd.DataFrame,
+    pop_total: pd.DataFrame,
+) -> pd.DataFrame:
     # ── Cluster-level BBR proxy z-score by year ────────────────────────────
     # bbr_proxy = funded / req  (higher = better funded; z-score within cluster×year)
     cl = fts_cluster.copy()
@@ -156,13 +359,13 @@ def build_gold_multiyear(bronze: dict[str, pd.DataFrame]) -> pd.DataFrame:
     cl["bbr_proxy"] = (
         cl["cluster_funded_usd"].fillna(0) / cl["cluster_req_usd"]
     ).clip(0, 10)
-    cl["bbr_proxy_z"] = cl.groupby(
-        ["year", "cluster_name"]
-    )["bbr_proxy"].transform(_z_score)
+    cl["bbr_proxy_z"] = group_zscore(
+        cl["bbr_proxy"], GroupOffsets.from_frame(cl, ["year", "cluster_name"])
+    )
     cl["bbr_anomaly"] = cl["bbr_proxy_z"].abs() > 2
 
     bbr_yearly = (
-        cl.groupby(["country_iso3", "year"]).agg(
+        cl.groupby(["country_iso3", "year"], observed=True).agg(
             bbr_median_z        = ("bbr_proxy_z", "median"),
             bbr_max_z           = ("bbr_proxy_z", "max"),
             n_cluster_anomalies = ("bbr_anomaly",  "sum"),
@@ -175,7 +378,7 @@ def build_gold_multiyear(bronze: dict[str, pd.DataFrame]) -> pd.DataFrame:
     base = (
         fts_req.dropna(subset=["country_iso3", "req_usd", "funded_usd", "year"])
         .query("req_usd > 0")
-        .groupby(["country_iso3", "year"], as_index=False)
+        .groupby(["country_iso3", "year"], observed=True, as_index=False)
         .agg(req_usd=("req_usd", "sum"),
              funded_usd=("funded_usd", "sum"),
              plan_name=("plan_name", "first"))
@@ -208,13 +411,11 @@ def build_gold_multiyear(bronze: dict[str, pd.DataFrame]) -> pd.DataFrame:
     return base
 
 
-def build_gold(bronze: dict[str, pd.DataFrame],silver: dict[str, pd.DataFrame]):
+def _build_gold_fgi(bronze: Mapping[str, pd.DataFrame], silver: Mapping[str, Any]) -> pd.DataFrame:
     fts_req = bronze["fts_req"]
     pop_total  = bronze["pop_total"]
     silver_severity = silver["silver_severity"]
     cbpf_by_iso = silver["cbpf_by_iso"]
-    silver_hrp = silver["silver_hrp"]
-    hno26_clean= silver["hno26_clean"]
 
     latest = (
         fts_req.dropna(subset=["req_usd", "funded_usd"])
@@ -234,6 +435,12 @@ def build_gold(bronze: dict[str, pd.DataFrame],silver: dict[str, pd.DataFrame]):
     gold_fgi["cmi_score"] = gold_fgi["fgi_score"] * (1 - gold_fgi["cbpf_share"])
     gold_fgi = gold_fgi.merge(silver_severity[["country_iso3", "pin"]], on="country_iso3", how="left")
     gold_fgi = gold_fgi.merge(pop_total, on="country_iso3", how="left")
+    return gold_fgi
+
+
+def _build_gold_efficiency(silver: Mapping[str, Any]) -> pd.DataFrame:
+    silver_hrp = silver["silver_hrp"]
+    hno26_clean= silver["hno26_clean"]
 
     hno26_clusters = (
         hno26_clean[hno26_clean["cluster"].astype(str).str.upper().isin(CLUSTER_MAP)]
@@ -242,6 +449,7 @@ def build_gold(bronze: dict[str, pd.DataFrame],silver: dict[str, pd.DataFrame]):
     )
     hno26_clusters["cluster_name"] = (
         hno26_clusters["cluster"].map(CLUSTER_MAP).fillna(hno26_clusters["cluster"])
+        .astype(silver_hrp["cluster_name"].dtype)
     )
     fts_cluster_2026 = (
         silver_hrp[silver_hrp["year"] == 2026].dropna(subset=["cluster_req_usd"]).copy()
@@ -252,7 +460,7 @@ def build_gold(bronze: dict[str, pd.DataFrame],silver: dict[str, pd.DataFrame]):
     )
     bbr_df = bbr_df[bbr_df["cluster_req_usd"] > 0].copy()
     bbr_df["bbr"] = bbr_df["pin"] / bbr_df["cluster_req_usd"]
-    bbr_df["bbr_z_score"] = bbr_df.groupby("cluster_name")["bbr"].transform(_z_score)
+    bbr_df["bbr_z_score"] = group_zscore(bbr_df["bbr"], GroupOffsets.from_frame(bbr_df, "cluster_name"))
     bbr_df["bbr_anomaly"] = bbr_df["bbr_z_score"].abs() > 2
 
     gold_efficiency = bbr_df[
@@ -261,4 +469,11 @@ def build_gold(bronze: dict[str, pd.DataFrame],silver: dict[str, pd.DataFrame]):
          "bbr", "bbr_z_score", "bbr_anomaly"]
     ].copy()
 
-    return {"gold_fgi": gold_fgi, "gold_efficiency": gold_efficiency}
+    return gold_efficiency
+
+
+def build_gold(bronze: Mapping[str, pd.DataFrame], silver: Mapping[str, Any]) -> LazyTables:
+    return LazyTables({
+        "gold_fgi":        lambda: _build_gold_fgi(bronze, silver),
+        "gold_efficiency": lambda: _build_gold_efficiency(silver),
+    }, layer="gold")
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+from typing import Any, Callable
+
+import numpy as np
+from sklearn.base import BaseEstimator, RegressorMixin, clone
+
+# (model, X, y, X_val, y_val, patience) -> best iteration count; each boosted
+# model module defines one as ``fit_early_stopping``.
+StopFn = Callable[[Any, np.ndarray, np.ndarray, np.ndarray, np.ndarray, int], int]
+
+
+class EarlyStoppingRegressor(RegressorMixin, BaseEstimator):
+    """
+    Fits a boosted ``estimator`` with early stopping on a validation split
+    of the rows it is given, so inside CV the split comes from each fold's
+    training rows only.
+
+    With ``time_ordered`` the rows are assumed sorted by time and the
+    latest ``validation_fraction`` of them validate (no look-ahead);
+    otherwise a seeded random subset does.  ``best_iteration_`` is the
+    stopping point, for refits on all rows (None if it did not stop early
+    because the set was too small).  Training sets under
+    ``min_rows`` are fit without stopping: holding rows out of them starves
+    the trees (LightGBM's min_child_samples alone can forbid every split).
+    """
+
+    def __init__(
+        self,
+        estimator: Any,
+        stop: StopFn,
+        validation_fraction: float = 0.2,
+        patience: int = 30,
+        time_ordered: bool = False,
+        min_rows: int = 100,
+        random_state: int = 42,
+    ) -> None:
+        self.estimator = estimator
+        self.stop = stop
+        self.validation_fraction = validation_fraction
+        self.patience = patience
+        self.time_ordered = time_ordered
+        self.min_rows = min_rows
+        self.random_state = random_state
+
+    def _split(self, n: int):
+        n_val = int(round(n * self.validation_fraction))
+        if n < self.min_rows or n_val == 0:
+            return None
+        if self.time_ordered:
+            return np.arange(n - n_val), np.arange(n - n_val, n)
+        perm = np.random.default_rng(self.random_state).permutation(n)
+        return np.sort(perm[n_val:]), np.sort(perm[:n_val])
+
+    def fit(self, X, y):
+        X, y = np.asarray(X), np.asarray(y)
+        self.estimator_ = clone(self.estimator)
+        split = self._split(len(y))
+        if split is None:
+            self.estimator_.fit(X, y)
+            self.best_iteration_ = None
+        else:
+            train, val = split
+            self.best_iteration_ = int(self.stop(self.estimator_, X[train], y[train], X[val], y[val], self.patience))
+        return self
+
+    def predict(self, X) -> np.ndarray:
+        return self.estimator_.predict(X)
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Iterable
+
+import pandas as pd
+
+# Key column -> KeyCodec attribute holding its dictionary.
+KEY_COLUMNS: dict[str, str] = {
+    "country_iso3": "iso3",
+    "cluster_name": "cluster",
+}
+
+
+def key_values(df: pd.DataFrame) -> dict[str, list[str]]:
+    """Distinct non-null values of each key column present in ``df``."""
+    return {
+        col: sorted(str(v) for v in pd.unique(df[col].dropna()))
+        for col in KEY_COLUMNS if col in df.columns
+    }
+
+
+@dataclass(frozen=True)
+class KeyCodec:
+    """
+    Dictionary encoding for the pipeline's join keys.
+
+    ``country_iso3`` and ``cluster_name`` are stored as pandas categoricals
+    sharing one dtype per key across every table, so merges and groupbys run
+    on the integer codes.  Categories are sorted, which keeps groupby output
+    order identical to the plain-string version.  Decode with
+    ``decode_keys`` only when writing artifacts.
+    """
+
+    iso3: pd.CategoricalDtype
+    cluster: pd.CategoricalDtype
+
+    @classmethod
+    def from_key_values(
+        cls,
+        per_table: Iterable[dict[str, list[str]]],
+        extra_clusters: Iterable[str] = (),
+    ) -> "KeyCodec":
+        """Build the shared dictionaries from ``key_values`` of every table."""
+        iso3: set[str] = set()
+        cluster: set[str] = set(extra_clusters)
+        for keys in per_table:
+            iso3.update(keys.get("country_iso3", ()))
+            cluster.update(keys.get("cluster_name", ()))
+        return cls(
+            iso3=pd.CategoricalDtype(sorted(iso3), ordered=False),
+            cluster=pd.CategoricalDtype(sorted(cluster), ordered=False),
+        )
+
+    def encode(self, df: pd.DataFrame) -> pd.DataFrame:
+        for col, attr in KEY_COLUMNS.items():
+            if col in df.columns:
+                df[col] = df[col].astype(getattr(self, attr))
+        return df
+
+
+def decode_keys(df: pd.DataFrame) -> pd.DataFrame:
+    """Return ``df`` with encoded key columns converted back to plain strings."""
+    cols = [c for c in KEY_COLUMNS if c in df.columns and isinstance(df[c].dtype, pd.CategoricalDtype)]
+    if not cols:
+        return df
+    out = df.copy()
+    for c in cols:
+        out[c] = out[c].astype(object)
+    return out
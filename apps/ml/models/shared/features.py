@@ -1,9 +1,15 @@
 from __future__ import annotations
 
+from dataclasses import dataclass
+from typing import Sequence
+
 import numpy as np
 import pandas as pd
 from sklearn.preprocessing import RobustScaler
 
+from shared.kernels import band, minmax_scale
+from shared.lags import PanelIndex
+
 # ── Future-step definitions (must stay in sync with lib/simulation.ts) ────────
 FUTURE_STEPS: list[tuple[str, float]] = [
     ("6mo",  0.5),
@@ -43,22 +49,23 @@ FEATURE_COLS: list[str] = [
 ]
 
 
+# fgi_score lower bounds of MEDIUM / HIGH / CRITICAL
+SEVERITY_EDGES: list[float] = [31, 61, 86]
+SEVERITY_LABELS: list[str] = ["LOW", "MEDIUM", "HIGH", "CRITICAL"]
+
+
 def _norm01(s):
-    lo, hi = s.min(), s.max()
-    return (s - lo) / (hi - lo + 1e-9)
+    return pd.Series(minmax_scale(s), index=s.index)
 
 
 def severity_band(fgi):
-    if fgi >= 86: return "CRITICAL"
-    if fgi >= 61: return "HIGH"
-    if fgi >= 31: return "MEDIUM"
-    return "LOW"
+    return band([fgi], SEVERITY_EDGES, SEVERITY_LABELS)[0]
 
 
 def build_feature_matrix(gold_fgi,gold_efficiency, pop_total):
 
     bbr_country = (
-        gold_efficiency.groupby("country_iso3").agg(
+        gold_efficiency.groupby("country_iso3", observed=True).agg(
             bbr_median_z        = ("bbr_z_score", "median"),
             bbr_max_z           = ("bbr_z_score", "max"),
             n_cluster_anomalies = ("bbr_anomaly",  "sum"),
@@ -96,7 +103,7 @@ def build_feature_matrix(gold_fgi,gold_efficiency, pop_total):
         0.10 * _norm01(feat["bbr_max_z"].clip(0))
     ) * 100
 
-    feat["anomaly_severity"] = feat["fgi_score"].apply(severity_band)
+    feat["anomaly_severity"] = band(feat["fgi_score"], SEVERITY_EDGES, SEVERITY_LABELS)
 
     X = feat[FEATURE_COLS].fillna(0).values
     y = feat["neglect_score"].values
@@ -141,6 +148,70 @@ def build_feature_matrix_all_years(gold_multiyear: "pd.DataFrame"):
     return feat, X, y
 
 
+@dataclass(frozen=True)
+class MultiHorizonDataset:
+    """
+    Forecast pairs for several horizons sharing one feature matrix.
+
+    ``X`` holds one row per base observation (year >= min_year, in
+    ``feat_all`` order); ``y[:, j]`` is the target ``horizons[j]`` years
+    later and ``valid[:, j]`` marks rows whose target year exists.
+    """
+
+    X: np.ndarray
+    y: np.ndarray
+    valid: np.ndarray
+    meta: pd.DataFrame
+    horizons: tuple[str, ...]
+
+    def rows(self, label: str) -> np.ndarray:
+        """Indices into ``X`` of the rows that have a target for ``label``."""
+        return np.nonzero(self.valid[:, self.horizons.index(label)])[0]
+
+    def target(self, label: str) -> np.ndarray:
+        return self.y[self.rows(label), self.horizons.index(label)]
+
+    def horizon(self, label: str):
+        """(X, y, meta) for one horizon, as ``build_forecast_dataset`` returns."""
+        rows = self.rows(label)
+        return np.asarray(self.X[rows]), self.target(label), self.meta.iloc[rows].reset_index(drop=True)
+
+
+def build_multi_horizon_dataset(
+    feat_all: "pd.DataFrame",
+    horizons: Sequence[tuple[str, int]] = FORECAST_HORIZONS,
+    min_year: int = 2015,
+    feature_cols: Sequence[str] = FEATURE_COLS,
+    target_col: str = "neglect_score",
+) -> MultiHorizonDataset:
+    """
+    Build forecast pairs for every horizon in one pass.
+
+    The (country, year) index is built once and each horizon's target is a
+    ``PanelIndex.lookup`` instead of a merge, so adding horizons only adds
+    one searchsorted each.
+    """
+    index = PanelIndex.from_frame(feat_all)
+    base = (feat_all["year"] >= min_year).to_numpy()
+    target = feat_all[target_col].to_numpy()
+
+    y = np.full((int(base.sum()), len(horizons)), np.nan)
+    valid = np.zeros(y.shape, dtype=bool)
+    for j, (_label, h) in enumerate(horizons):
+        hit = index.lookup(h)[base]
+        valid[:, j] = hit >= 0
+        y[valid[:, j], j] = target[hit[valid[:, j]]]
+
+    rows = feat_all[base]
+    return MultiHorizonDataset(
+        X=rows[list(feature_cols)].fillna(0).values,
+        y=y,
+        valid=valid,
+        meta=rows[["country_iso3", "year"]].reset_index(drop=True),
+        horizons=tuple(label for label, _h in horizons),
+    )
+
+
 def build_forecast_dataset(
     feat_all: "pd.DataFrame",
     horizon_years: int,
@@ -158,23 +229,6 @@ def build_forecast_dataset(
 
     Returns (X, y, meta) where meta is a DataFrame with country_iso3 / year.
     """
-    df = feat_all[feat_all["year"] >= min_year].copy()
-
-    # Build a target lookup: neglect_score at year T+horizon
-    targets = (
-        feat_all[["country_iso3", "year", "neglect_score"]]
-        .rename(columns={"year": "year_target", "neglect_score": "future_neglect"})
-        .copy()
-    )
-    targets["year"] = targets["year_target"] - horizon_years
-
-    paired = df.merge(
-        targets[["country_iso3", "year", "future_neglect"]],
-        on=["country_iso3", "year"],
-        how="inner",
-    )
-
-    X    = paired[FEATURE_COLS].fillna(0).values
-    y    = paired["future_neglect"].values
-    meta = paired[["country_iso3", "year"]].reset_index(drop=True)
-    return X, y, meta
+    label = f"{horizon_years}yr"
+    ds = build_multi_horizon_dataset(feat_all, [(label, horizon_years)], min_year=min_year)
+    return ds.horizon(label)
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import json
+import logging
+import pathlib
+import shutil
+from datetime import datetime, timezone
+from typing import Any, Dict, Mapping, Optional
+
+import numpy as np
+
+LOG = logging.getLogger("train")
+
+
+def _plain(value: Any) -> Any:
+    # numpy scalars from scipy distributions -> JSON-native values.
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def _sets(doc: Mapping[str, Any]) -> Dict[str, Dict[str, Any]]:
+    # Files written before parameters were kept per model set hold one
+    # top-level "models" entry, tuned on the set named by "label".
+    if "sets" in doc:
+        return {label: dict(entry) for label, entry in doc["sets"].items()}
+    if "models" in doc:
+        return {doc.get("label", "current"): {"models": doc["models"]}}
+    return {}
+
+
+def load_hyperparams(path: Optional[pathlib.Path]) -> Dict[str, Dict[str, Dict[str, Any]]]:
+    """
+    Tuned parameters per model set label ("current", "1yr", ...) and model
+    name from a ``hyperparams.json`` written by ``save_hyperparams``; empty
+    (use the model modules' defaults) when ``path`` is None or does not
+    exist.  Sets missing from the file use the defaults too.
+    """
+    if path is None or not pathlib.Path(path).exists():
+        return {}
+    with open(path) as f:
+        doc = json.load(f)
+    LOG.info("Hyperparameters: %s version %s", pathlib.Path(path).name, doc.get("version"))
+    return {
+        label: {name: dict(entry.get("params", {})) for name, entry in tuned.get("models", {}).items()}
+        for label, tuned in _sets(doc).items()
+    }
+
+
+def save_hyperparams(
+    path: pathlib.Path,
+    label: str,
+    results: Mapping[str, Mapping[str, Any]],
+    meta: Optional[Mapping[str, Any]] = None,
+) -> int:
+    """
+    Write ``results`` (``{model: {"params": {...}, ...}}``), tuned on the
+    model set ``label``, as the next version of ``path``.  Other sets, and
+    models of ``label`` missing from ``results``, keep their current
+    entry; the version being replaced is kept alongside as
+    ``<stem>.v<N>.json``.  Returns the new version number.
+    """
+    path = pathlib.Path(path)
+    previous: Dict[str, Any] = {}
+    if path.exists():
+        with open(path) as f:
+            previous = json.load(f)
+        shutil.copyfile(path, path.with_name(f"{path.stem}.v{previous.get('version', 0)}.json"))
+
+    sets = _sets(previous)
+    models = dict(sets.get(label, {}).get("models", {}))
+    for name, entry in results.items():
+        models[name] = {k: ({p: _plain(v) for p, v in val.items()} if k == "params" else _plain(val)) for k, val in entry.items()}
+    sets[label] = {**dict(meta or {}), "models": models}
+
+    version = int(previous.get("version", 0)) + 1
+    doc = {
+        "version": version,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "sets":    sets,
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".json.tmp")
+    with open(tmp, "w") as f:
+        json.dump(doc, f, indent=2)
+    tmp.replace(path)
+    LOG.info("Hyperparameters written: %s (version %d, set %s)", path.as_posix(), version, label)
+    return version
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import copy
+import hashlib
+import math
+from dataclasses import dataclass
+from typing import Any, Callable, Literal, Optional
+
+import numpy as np
+import pandas as pd
+from sklearn.pipeline import Pipeline
+
+UpdateMode = Literal["full", "incremental"]
+
+
+def row_digests(X: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """One 64-bit hash per (features, target) row; a revised row hashes as new."""
+    return pd.util.hash_pandas_object(pd.DataFrame(np.column_stack([X, y])), index=False).to_numpy()
+
+
+@dataclass(frozen=True)
+class TrainingSnapshot:
+    """
+    The rows a model set was trained on (as sorted row digests), plus the
+    feature / target mean and std of its last full retrain, which drift is
+    measured against.  ``n_full`` rows went into that retrain and
+    ``n_incremental`` rows were added or removed since.
+    """
+
+    digests: np.ndarray
+    mean: np.ndarray
+    std: np.ndarray
+    n_full: int
+    n_incremental: int = 0
+
+    @classmethod
+    def full(cls, X: np.ndarray, y: np.ndarray) -> "TrainingSnapshot":
+        Xy = np.column_stack([X, y]).astype(float)
+        return cls(
+            digests=np.sort(row_digests(X, y)),
+            mean=np.nanmean(Xy, axis=0),
+            std=np.nanstd(Xy, axis=0),
+            n_full=len(y),
+        )
+
+    @property
+    def id(self) -> str:
+        h = hashlib.sha256(self.digests.tobytes())
+        h.update(f"{self.n_full}:{self.n_incremental}".encode())
+        return h.hexdigest()
+
+
+@dataclass(frozen=True)
+class UpdatePlan:
+    """
+    How to refresh one model set.  ``incremental`` means: take the models
+    trained on snapshot ``base_id`` and warm-update them on rows ``delta``
+    (positions in the new training set).  ``snapshot`` describes the new
+    training set either way.
+    """
+
+    mode: UpdateMode
+    reason: str
+    snapshot: TrainingSnapshot
+    delta: np.ndarray
+    base_id: Optional[str] = None
+
+
+def full_plan(X: np.ndarray, y: np.ndarray, reason: str) -> UpdatePlan:
+    return UpdatePlan("full", reason, TrainingSnapshot.full(X, y), np.arange(len(y)))
+
+
+def drift_score(snapshot: TrainingSnapshot, X: np.ndarray, y: np.ndarray) -> float:
+    """
+    Largest z-statistic of any feature's (or the target's) mean over the
+    given rows against ``snapshot``: the mean shift in standard errors
+    ``std / sqrt(n)`` of an ``n``-row sample, so a handful of rows drawn
+    from an unchanged distribution stays near 1 whatever ``n`` is.
+    """
+    if len(y) == 0:
+        return 0.0
+    Xy = np.column_stack([X, y]).astype(float)
+    n = (~np.isnan(Xy)).sum(axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        diff = np.abs(np.nanmean(Xy, axis=0) - snapshot.mean)
+        z = np.where(snapshot.std > 0, diff / (snapshot.std / np.sqrt(n)), np.where(diff > 1e-12, np.inf, 0.0))
+    return float(np.nanmax(np.where(n > 0, z, 0.0)))
+
+
+def plan_update(
+    prev: Optional[TrainingSnapshot],
+    X: np.ndarray,
+    y: np.ndarray,
+    max_delta: float = 0.25,
+    max_drift: float = 4.0,
+) -> UpdatePlan:
+    """
+    Decide between warm-updating the models trained on ``prev`` and a full
+    retrain on ``(X, y)``.  Falls back to a full retrain when there is no
+    previous snapshot, the feature set changed, the rows added or removed
+    since the last full retrain (a revised row counts as both) exceed
+    ``max_delta`` of it, or the new rows' mean of any column is more than
+    ``max_drift`` standard errors from the reference mean (see
+    ``drift_score``; the default 4 keeps chance exceedances across ~24
+    columns well under 1%).
+    """
+    if prev is None:
+        return full_plan(X, y, "no previous training snapshot")
+    if X.shape[1] + 1 != len(prev.mean):
+        return full_plan(X, y, "feature set changed")
+
+    digests = row_digests(X, y)
+    delta = np.flatnonzero(~np.isin(digests, prev.digests))
+    removed = int((~np.isin(prev.digests, digests)).sum())
+    changed = prev.n_incremental + len(delta) + removed
+    if changed > max_delta * prev.n_full:
+        return full_plan(X, y, f"{changed} rows changed since the last full retrain (> {max_delta:.0%} of {prev.n_full})")
+
+    drift = drift_score(prev, X[delta], y[delta])
+    if drift > max_drift:
+        return full_plan(X, y, f"new rows drifted z={drift:.2f} (> {max_drift})")
+
+    snapshot = TrainingSnapshot(np.sort(digests), prev.mean, prev.std, prev.n_full, changed)
+    return UpdatePlan("incremental", f"{len(delta)} new rows, drift z={drift:.2f}", snapshot, delta, base_id=prev.id)
+
+
+def new_estimators(base: int, n_delta: int, n_rows: int, floor: int = 10) -> int:
+    """
+    Trees / boosting rounds to add for ``n_delta`` new rows: the delta's
+    share of the ``base`` rounds already fit, at least ``floor`` (but never
+    more than ``base`` for the floor alone).
+    """
+    return max(min(floor, base), math.ceil(base * n_delta / max(n_rows, 1)))
+
+
+def warm_update_pipeline(
+    pipe: Pipeline,
+    X: np.ndarray,
+    y: np.ndarray,
+    update: Callable[[Any, np.ndarray, np.ndarray], Any],
+) -> Pipeline:
+    """
+    Copy of a fitted scaler + model pipeline with ``update(model, X_scaled,
+    y)`` applied.  The scaler stays as fit on the full history so existing
+    trees keep seeing the inputs they were grown on.
+    """
+    pipe = copy.deepcopy(pipe)
+    if len(y):
+        update(pipe.named_steps["model"], pipe.named_steps["scaler"].transform(X), y)
+    return pipe
@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import json
+import logging
+import pathlib
+from dataclasses import dataclass
+from typing import Any, Mapping, Optional, Sequence
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from ensemble.blend import compute_agreement, weighted_average_ensemble
+from shared.allocation import AllocationResult, AllocationSpec, optimize_allocation
+from shared.features import FEATURE_COLS, FUTURE_STEPS, STEP_TO_HORIZON
+from shared.scenarios import ScenarioBands, ScenarioSpec, run_funding_scenarios
+from shared.temporal import TemporalProjector
+
+LOG = logging.getLogger("train")
+
+# Model name -> file stem used under every model directory.
+MODEL_FILES: dict[str, str] = {
+    "LightGBM":     "lgbm",
+    "RandomForest": "rf",
+    "XGBoost":      "xgb",
+    "GBR":          "gbr",
+    "Stacking":     "stack",
+}
+BASE_KEYS: list[str] = [name for name in MODEL_FILES if name != "Stacking"]
+
+CV_RESULTS_FILE = "cv_results.json"
+FORECAST_CV_FILE = "forecast_cv_results.json"
+PROJECTOR_CV_FILE = "projector_cv_results.json"
+TEMPORAL_SCALER_FILE = "temporal_scaler.pkl"
+
+
+def scoring_model_path(model_dir: pathlib.Path, name: str) -> pathlib.Path:
+    stem = MODEL_FILES[name]
+    return pathlib.Path(model_dir) / stem / f"{stem}_neglect.pkl"
+
+
+def forecast_model_path(model_dir: pathlib.Path, horizon: str, name: str) -> pathlib.Path:
+    return pathlib.Path(model_dir) / "forecast" / horizon / f"{MODEL_FILES[name]}_neglect.pkl"
+
+
+def projector_model_path(model_dir: pathlib.Path, horizon: str, name: str) -> pathlib.Path:
+    return pathlib.Path(model_dir) / "projector" / horizon / f"{MODEL_FILES[name]}_neglect.pkl"
+
+
+def _read_json(path: pathlib.Path) -> Any:
+    with open(path) as f:
+        return json.load(f)
+
+
+def feature_matrix(rows: Sequence[Mapping[str, Any]], columns: Sequence[str] = FEATURE_COLS) -> np.ndarray:
+    """
+    (rows x columns) float matrix; missing or null features are 0, as
+    ``fillna(0)`` makes them in training.  Raises ValueError naming the
+    first few values that are present but not numbers.
+    """
+    X = pd.DataFrame.from_records(list(rows)).reindex(columns=list(columns))
+    numeric = X.apply(pd.to_numeric, errors="coerce")
+    bad_rows, bad_cols = np.nonzero((numeric.isna() & X.notna()).to_numpy())
+    if len(bad_rows):
+        shown = ", ".join(f"row {i} {columns[j]}={X.iat[i, j]!r}" for i, j in zip(bad_rows[:5], bad_cols[:5]))
+        raise ValueError(f"{len(bad_rows)} non-numeric feature value(s): {shown}")
+    return numeric.fillna(0).to_numpy(dtype=np.float64)
+
+
+@dataclass
+class InferenceModels:
+    """
+    Trained pipelines for serving, loaded once from the training artifacts:
+    the current-year scoring models, the per-horizon forecast models and
+    (when trained) the temporal projector.  Every method predicts a whole
+    batch of rows with one ``predict`` call per model.
+    """
+
+    scoring: dict[str, Any]
+    scoring_cv: dict[str, dict[str, float]]
+    forecast: dict[str, dict[str, Any]]
+    forecast_cv: dict[str, dict[str, dict[str, float]]]
+    projector: Optional[TemporalProjector] = None
+    clip_min: float = 0.0
+    clip_max: float = 100.0
+
+    @classmethod
+    def load(cls, model_dir: pathlib.Path, out_dir: pathlib.Path) -> "InferenceModels":
+        """
+        Load what ``train_model.py`` wrote to ``model_dir`` / ``out_dir``.
+        Forecast and projector models are optional (empty / None when a
+        run has not produced them yet); the scoring models are required.
+        """
+        model_dir, out_dir = pathlib.Path(model_dir), pathlib.Path(out_dir)
+        scoring = {name: joblib.load(scoring_model_path(model_dir, name)) for name in MODEL_FILES}
+        scoring_cv = _read_json(out_dir / CV_RESULTS_FILE)
+
+        forecast: dict[str, dict[str, Any]] = {}
+        forecast_cv: dict[str, dict[str, dict[str, float]]] = {}
+        if (out_dir / FORECAST_CV_FILE).exists():
+            forecast_cv = _read_json(out_dir / FORECAST_CV_FILE)
+            forecast = {h: {name: joblib.load(forecast_model_path(model_dir, h, name)) for name in MODEL_FILES} for h in forecast_cv}
+
+        projector = None
+        if (out_dir / PROJECTOR_CV_FILE).exists() and (out_dir / TEMPORAL_SCALER_FILE).exists():
+            projector_cv = _read_json(out_dir / PROJECTOR_CV_FILE)
+            models = {h: {name: joblib.load(projector_model_path(model_dir, h, name)) for name in BASE_KEYS} for h in projector_cv}
+            projector = TemporalProjector(
+                models["1yr"], models["2yr"], projector_cv["1yr"], projector_cv["2yr"],
+                joblib.load(out_dir / TEMPORAL_SCALER_FILE),
+            )
+
+        LOG.info(
+            "Loaded %d scoring models, forecast horizons %s, projector %s",
+            len(scoring), sorted(forecast) or "none", "yes" if projector is not None else "no",
+        )
+        return cls(scoring, scoring_cv, forecast, forecast_cv, projector)
+
+    def _predict(self, models: Mapping[str, Any], cv: Mapping[str, Mapping[str, float]], X: np.ndarray) -> dict[str, np.ndarray]:
+        preds = {name: np.clip(pipe.predict(X), self.clip_min, self.clip_max) for name, pipe in models.items()}
+        preds["Ensemble"] = weighted_average_ensemble(preds, cv, BASE_KEYS)
+        return preds
+
+    def score(self, X: np.ndarray) -> dict[str, np.ndarray]:
+        """Current-year neglect per model, their CV-weighted "Ensemble" and "agreement" (std across base models)."""
+        preds = self._predict(self.scoring, self.scoring_cv, X)
+        preds["agreement"] = compute_agreement(preds, BASE_KEYS)
+        return preds
+
+    def forecast_steps(self, X: np.ndarray, current: Optional[Mapping[str, np.ndarray]] = None) -> dict[str, dict[str, np.ndarray]]:
+        """
+        Predictions per ``FUTURE_STEPS`` label, as training's
+        ``forecast_future`` makes them: each horizon's models predict once
+        and steps sharing a horizon reuse it, except that "6mo" is the
+        midpoint of ``current`` and "12mo" when both map to one horizon.
+        """
+        by_horizon = {h: self._predict(self.forecast[h], self.forecast_cv[h], X) for h in sorted(set(STEP_TO_HORIZON.values()))}
+        steps = {label: by_horizon[STEP_TO_HORIZON[label]] for label, _years in FUTURE_STEPS}
+        if current is not None and "6mo" in steps and "12mo" in steps and STEP_TO_HORIZON["6mo"] == STEP_TO_HORIZON["12mo"]:
+            steps["6mo"] = {
+                k: np.clip(0.5 * (current[k] + v), self.clip_min, self.clip_max) if k in current else v
+                for k, v in steps["12mo"].items()
+            }
+        return steps
+
+    def _projector(self) -> TemporalProjector:
+        if self.projector is None:
+            raise LookupError("no projector models; run train_model.py to train them")
+        return self.projector
+
+    def project(self, feat: pd.DataFrame, n_steps: int = 8, step_years: float = 0.25) -> list[list[dict]]:
+        """One trajectory per row of ``feat``, in order (rows of the same country stay separate)."""
+        projector = self._projector()
+        if len(feat) == 0:
+            return []
+        return projector.simulate(projector.initial_states(feat), n_steps, step_years).records()
+
+    def scenarios(self, feat: pd.DataFrame, spec: ScenarioSpec, n_steps: int = 8, step_years: float = 0.25) -> ScenarioBands:
+        return run_funding_scenarios(self._projector(), feat, spec, n_steps=n_steps, step_years=step_years)
+
+    def optimize(self, feat: pd.DataFrame, spec: AllocationSpec, weights: Optional[Sequence[float]] = None) -> AllocationResult:
+        return optimize_allocation(self._projector(), feat, spec, weights)
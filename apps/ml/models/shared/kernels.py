@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+from typing import Sequence
+
+import numpy as np
+import pandas as pd
+
+# Grouped reductions on sorted group offsets.
+#
+# Rows are ordered once by group code (stable, so each group keeps its row
+# order); sums then run per *group length* rather than per group: all groups
+# of length L are gathered into one (n_groups, L) block and reduced along
+# axis 1.  NumPy reduces each contiguous row exactly as it reduces a 1-D
+# array of length L, so sums, means and standard deviations are bit-for-bit
+# the values pandas' ``Series.mean`` / ``Series.std`` give group by group.
+# The Python loop is over distinct group sizes, never over groups.
+
+
+class GroupOffsets:
+    """Sorted-offset view of a grouping; rows with a missing key are in no group."""
+
+    def __init__(self, codes: np.ndarray) -> None:
+        codes = np.asarray(codes, dtype=np.int64)
+        self.n_rows = len(codes)
+        self.codes = codes
+        self.n_groups = int(codes.max()) + 1 if self.n_rows and codes.max() >= 0 else 0
+        member = np.nonzero(codes >= 0)[0]
+        self.order = member[np.argsort(codes[member], kind="stable")]
+        self.sizes = np.bincount(codes[member], minlength=self.n_groups)
+        self.starts = np.concatenate([[0], np.cumsum(self.sizes)[:-1]]).astype(np.int64)
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, by: str | Sequence[str]) -> "GroupOffsets":
+        """Groups as ``df.groupby(by, observed=True)`` forms them (NaN keys dropped)."""
+        codes = df.groupby(by, observed=True, sort=True).ngroup()
+        return cls(codes.fillna(-1).to_numpy(dtype=np.int64))
+
+    @classmethod
+    def single(cls, n: int) -> "GroupOffsets":
+        return cls(np.zeros(n, dtype=np.int64))
+
+    def broadcast(self, per_group: np.ndarray) -> np.ndarray:
+        """Per-group values repeated onto rows (NaN for rows in no group)."""
+        out = np.full(self.n_rows, np.nan)
+        member = self.codes >= 0
+        out[member] = per_group[self.codes[member]]
+        return out
+
+    def _blocks(self):
+        for length in np.unique(self.sizes[self.sizes > 0]):
+            groups = np.nonzero(self.sizes == length)[0]
+            rows = self.order[self.starts[groups][:, None] + np.arange(length)]
+            yield groups, rows
+
+
+def _values(v) -> np.ndarray:
+    return np.asarray(v, dtype=np.float64)
+
+
+def group_sum(v, groups: GroupOffsets) -> np.ndarray:
+    """NaN-skipping per-group sum (0.0 for all-NaN groups)."""
+    v = np.where(np.isnan(_values(v)), 0.0, _values(v))
+    out = np.zeros(groups.n_groups)
+    for g, rows in groups._blocks():
+        out[g] = v[rows].sum(axis=1)
+    return out
+
+
+def group_count(v, groups: GroupOffsets) -> np.ndarray:
+    valid = ~np.isnan(_values(v))
+    member = groups.codes >= 0
+    return np.bincount(groups.codes[member], weights=valid[member], minlength=groups.n_groups)
+
+
+def group_mean(v, groups: GroupOffsets) -> np.ndarray:
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return group_sum(v, groups) / group_count(v, groups)
+
+
+def group_std(v, groups: GroupOffsets, ddof: int = 1) -> np.ndarray:
+    """Per-group standard deviation, NaN where a group has <= ddof values."""
+    v = _values(v)
+    avg = groups.broadcast(group_mean(v, groups))
+    sqr = (avg - v) ** 2
+    count = group_count(v, groups)
+    d = np.where(count > ddof, count - ddof, np.nan)
+    return np.sqrt(group_sum(sqr, groups) / d)
+
+
+def group_zscore(v, groups: GroupOffsets) -> np.ndarray:
+    """
+    ``(x - mean) / std`` within each group, and 0 where the group's std is
+    not positive (constant or single-row groups).
+    """
+    v = _values(v)
+    mu = groups.broadcast(group_mean(v, groups))
+    sigma = groups.broadcast(group_std(v, groups))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        z = np.where(sigma > 0, (v - mu) / sigma, 0.0)
+    return np.where(groups.codes >= 0, z, np.nan)
+
+
+def _group_extreme(v, groups: GroupOffsets, ufunc) -> np.ndarray:
+    v = _values(v)[groups.order]
+    out = np.full(groups.n_groups, np.nan)
+    nonempty = groups.sizes > 0
+    if nonempty.any():
+        out[nonempty] = ufunc.reduceat(v, groups.starts[nonempty])
+    return out
+
+
+def group_min(v, groups: GroupOffsets) -> np.ndarray:
+    return _group_extreme(v, groups, np.fmin)
+
+
+def group_max(v, groups: GroupOffsets) -> np.ndarray:
+    return _group_extreme(v, groups, np.fmax)
+
+
+def minmax_scale(v, groups: GroupOffsets | None = None, eps: float = 1e-9) -> np.ndarray:
+    """``(x - min) / (max - min + eps)`` over all rows, or within each group."""
+    v = _values(v)
+    if groups is None:
+        groups = GroupOffsets.single(len(v))
+    lo = groups.broadcast(group_min(v, groups))
+    hi = groups.broadcast(group_max(v, groups))
+    return (v - lo) / (hi - lo + eps)
+
+
+def band(v, edges: Sequence[float], labels: Sequence[str]) -> np.ndarray:
+    """
+    Label each value by the half-open bins ``[edges[i-1], edges[i])``; values
+    below ``edges[0]`` and NaNs get ``labels[0]``.
+    """
+    v = _values(v)
+    idx = np.searchsorted(np.asarray(edges, dtype=np.float64), v, side="right")
+    idx[np.isnan(v)] = 0
+    return np.asarray(labels, dtype=object)[idx]
@@ -0,0 +1,253 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+
+# ── Feature specs ─────────────────────────────────────────────────────────────
+# Specs are evaluated in order, so later specs may read earlier outputs
+# (e.g. a Diff against a Lag, or a Lag filled from another Lag).
+
+@dataclass(frozen=True)
+class Lag:
+    """Value ``k`` steps back within the entity; NaN-filled from ``fill``."""
+    col: str
+    k: int = 1
+    fill: str | None = None
+    name: str | None = None
+
+    @property
+    def out(self) -> str:
+        return self.name or f"{self.col}_lag{self.k}"
+
+
+@dataclass(frozen=True)
+class Diff:
+    """``(col - ref) / per``, e.g. a 1-step delta or a per-year trend."""
+    name: str
+    col: str
+    ref: str
+    per: float = 1.0
+
+    @property
+    def out(self) -> str:
+        return self.name
+
+
+@dataclass(frozen=True)
+class RollingMean:
+    """Mean of the last ``window`` observations (current included, NaNs skipped)."""
+    col: str
+    window: int
+    min_periods: int = 1
+    name: str | None = None
+
+    @property
+    def out(self) -> str:
+        return self.name or f"{self.col}_mean{self.window}"
+
+
+@dataclass(frozen=True)
+class RollingSlope:
+    """OLS slope per step over the last ``window`` observations."""
+    col: str
+    window: int
+    name: str | None = None
+
+    @property
+    def out(self) -> str:
+        return self.name or f"{self.col}_slope{self.window}"
+
+
+@dataclass(frozen=True)
+class Ewma:
+    """Exponentially weighted mean, as ``Series.ewm(alpha=alpha).mean()`` per entity."""
+    col: str
+    alpha: float
+    name: str | None = None
+
+    @property
+    def out(self) -> str:
+        return self.name or f"{self.col}_ewm{self.alpha:g}"
+
+
+FeatureSpec = Union[Lag, Diff, RollingMean, RollingSlope, Ewma]
+
+
+# ── Exact-time lookup ─────────────────────────────────────────────────────────
+
+class PanelIndex:
+    """
+    Row lookup for (entity, time + k) over a panel with integer time steps.
+
+    Each row gets one composite key ``entity_code * span + (time - t_min)``,
+    which is monotonic within an entity, so ``lookup(k)`` is a single
+    ``searchsorted`` rather than a join.  Rows with a missing entity
+    (code < 0) or time never match.  Positions refer to the arrays as
+    given; they need not be sorted.
+    """
+
+    def __init__(self, codes: np.ndarray, t: np.ndarray) -> None:
+        codes = np.asarray(codes, dtype=np.int64)
+        t = np.asarray(t, dtype=np.float64)
+        n = len(codes)
+        self.has_t = (codes >= 0) & ~np.isnan(t)
+        t_int = np.where(self.has_t, t, 0).astype(np.int64)
+        lo = int(t_int[self.has_t].min()) if self.has_t.any() else 0
+        hi = int(t_int[self.has_t].max()) if self.has_t.any() else 0
+        self.span = hi - lo + 2
+        self.kcodes = np.where(codes >= 0, codes, codes.max() + 1 if n else 0)
+        self.key = self.kcodes * self.span + np.where(self.has_t, t_int - lo, self.span - 1)
+        self.order = np.argsort(self.key, kind="stable")
+        self.sorted_key = self.key[self.order]
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, entity: str = "country_iso3", time: str = "year") -> "PanelIndex":
+        codes, _ = pd.factorize(df[entity], sort=False)
+        return cls(codes, df[time].to_numpy(dtype=np.float64))
+
+    def lookup(self, k: int) -> np.ndarray:
+        """Position of the row at (entity, time + k) for every row, or -1."""
+        n = len(self.key)
+        if not n:
+            return np.zeros(0, dtype=np.int64)
+        target = self.key + k
+        j = np.clip(np.searchsorted(self.sorted_key, target), 0, n - 1)
+        hit = self.order[j]
+        ok = self.has_t & self.has_t[hit] & (self.sorted_key[j] == target) & (self.kcodes[hit] == self.kcodes)
+        return np.where(ok, hit, -1)
+
+
+# ── Engine ────────────────────────────────────────────────────────────────────
+
+class LagWindowEngine:
+    """
+    Computes lag / window features over (entity, time) panels in one sorted
+    pass.  Rows are sorted once by (entity, time); every spec then works on
+    the contiguous per-entity segments with NumPy index arithmetic instead of
+    a ``groupby`` per feature.
+
+    ``exact_time=False`` (training) steps back by position within the
+    entity, like ``groupby().shift(k)``.  ``exact_time=True`` looks up the
+    row at ``time - k`` for the same entity and yields NaN if that year is
+    absent, which is what snapshot enrichment needs.
+    """
+
+    def __init__(self, specs: Sequence[FeatureSpec], entity: str = "country_iso3", time: str = "year") -> None:
+        self.specs = list(specs)
+        self.entity = entity
+        self.time = time
+
+    @property
+    def source_cols(self) -> list[str]:
+        produced = {s.out for s in self.specs}
+        cols: list[str] = []
+        for s in self.specs:
+            for c in ([s.col] if not isinstance(s, Diff) else [s.col, s.ref]) + ([s.fill] if isinstance(s, Lag) and s.fill else []):
+                if c not in produced and c not in cols:
+                    cols.append(c)
+        return cols
+
+    def compute(self, df: pd.DataFrame, exact_time: bool = False, fill_default: float | None = None) -> pd.DataFrame:
+        """
+        Return ``df`` sorted by (entity, time) with every spec's column added.
+        ``fill_default`` replaces NaNs in a Lag's ``fill`` source before use.
+        """
+        out = df.sort_values([self.entity, self.time], kind="stable")
+        codes, _ = pd.factorize(out[self.entity], sort=False)
+        codes = codes.astype(np.int64)
+        n = len(out)
+        starts = np.ones(n, dtype=bool)
+        if n:
+            starts[1:] = codes[1:] != codes[:-1]
+        seg_start = np.maximum.accumulate(np.where(starts, np.arange(n), 0)) if n else np.zeros(0, dtype=np.int64)
+        pos = np.arange(n) - seg_start
+        valid = codes >= 0
+
+        cols: dict[str, np.ndarray] = {}
+
+        def _get(c: str) -> np.ndarray:
+            if c not in cols:
+                cols[c] = out[c].to_numpy(dtype=np.float64)
+            return cols[c]
+
+        def _shift(v: np.ndarray, k: int) -> np.ndarray:
+            res = np.full(n, np.nan)
+            ok = valid & (pos >= k)
+            idx = np.nonzero(ok)[0]
+            res[idx] = v[idx - k]
+            return res
+
+        if exact_time:
+            index = PanelIndex(codes, out[self.time].to_numpy(dtype=np.float64))
+
+            def _lag(v: np.ndarray, k: int) -> np.ndarray:
+                j = index.lookup(-k)
+                res = np.full(n, np.nan)
+                ok = j >= 0
+                res[ok] = v[j[ok]]
+                return res
+        else:
+            _lag = _shift
+
+        for s in self.specs:
+            if isinstance(s, Lag):
+                res = _lag(_get(s.col), s.k)
+                if s.fill is not None:
+                    src = _get(s.fill)
+                    if fill_default is not None:
+                        src = np.where(np.isnan(src), fill_default, src)
+                    res = np.where(np.isnan(res), src, res)
+            elif isinstance(s, Diff):
+                res = (_get(s.col) - _get(s.ref)) / s.per
+            elif isinstance(s, RollingMean):
+                total = np.zeros(n)
+                count = np.zeros(n)
+                for j in range(s.window):
+                    v = _get(s.col) if j == 0 else _shift(_get(s.col), j)
+                    m = ~np.isnan(v)
+                    total += np.where(m, v, 0.0)
+                    count += m
+                res = np.where(count >= s.min_periods, total / np.maximum(count, 1), np.nan)
+            elif isinstance(s, RollingSlope):
+                sx = np.zeros(n); sy = np.zeros(n); sxx = np.zeros(n); sxy = np.zeros(n); cnt = np.zeros(n)
+                for j in range(s.window):
+                    v = _get(s.col) if j == 0 else _shift(_get(s.col), j)
+                    m = ~np.isnan(v)
+                    x = -float(j)
+                    vv = np.where(m, v, 0.0)
+                    sx += m * x; sy += vv; sxx += m * x * x; sxy += vv * x; cnt += m
+                denom = cnt * sxx - sx * sx
+                res = np.where((cnt >= 2) & (denom > 0), (cnt * sxy - sx * sy) / np.where(denom > 0, denom, 1.0), np.nan)
+            elif isinstance(s, Ewma):
+                res = self._ewma(_get(s.col), pos, s.alpha)
+            else:
+                raise TypeError(f"unsupported feature spec: {s!r}")
+            cols[s.out] = res
+        return out.assign(**{s.out: cols[s.out] for s in self.specs})
+
+    @staticmethod
+    def _ewma(v: np.ndarray, pos: np.ndarray, alpha: float) -> np.ndarray:
+        # Recurrence over position-in-segment: each iteration advances every
+        # entity by one step at once, so the Python loop is over time steps,
+        # not entities.
+        n = len(v)
+        num = np.zeros(n)
+        den = np.zeros(n)
+        decay = 1.0 - alpha
+        m = ~np.isnan(v)
+        vv = np.where(m, v, 0.0)
+        order = np.argsort(pos, kind="stable")
+        bounds = np.searchsorted(pos[order], np.arange(int(pos.max()) + 2 if n else 1))
+        for p in range(len(bounds) - 1):
+            i = order[bounds[p]:bounds[p + 1]]
+            if p == 0:
+                num[i] = vv[i]
+                den[i] = m[i]
+            else:
+                num[i] = vv[i] + decay * num[i - 1]
+                den[i] = m[i] + decay * den[i - 1]
+        return np.where(den > 0, num / np.where(den > 0, den, 1.0), np.nan)
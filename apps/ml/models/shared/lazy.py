@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterable, Iterator
+
+
+class LazyTables(Mapping):
+    """
+    Memoizing table set used for the bronze / silver / gold layers.
+
+    Each entry is a zero-argument builder that runs on first access; its
+    result is kept for later lookups.  Builders read their inputs by
+    indexing other ``LazyTables`` (or this one), so dependencies resolve
+    automatically and a job only materializes the tables it touches.
+    Iterating or ``in`` checks never trigger a build; ``values()`` and
+    ``items()`` do, like any ``Mapping``.
+    """
+
+    def __init__(self, builders: Mapping[str, Callable[[], Any]] | None = None, layer: str = "") -> None:
+        self.layer = layer
+        self._builders: dict[str, Callable[[], Any]] = dict(builders or {})
+        self._values: dict[str, Any] = {}
+        self._locks: dict[str, threading.Lock] = {k: threading.Lock() for k in self._builders}
+        self.timings: dict[str, float] = {}
+
+    def define(self, name: str, builder: Callable[[], Any]) -> None:
+        self._builders[name] = builder
+        self._locks[name] = threading.Lock()
+        self._values.pop(name, None)
+
+    def __getitem__(self, name: str) -> Any:
+        if name in self._values:
+            return self._values[name]
+        if name not in self._builders:
+            raise KeyError(name)
+        # Per-entry lock: concurrent first accesses build the table once.
+        with self._locks[name]:
+            if name not in self._values:
+                t0 = time.perf_counter()
+                self._values[name] = self._builders[name]()
+                self.timings[name] = time.perf_counter() - t0
+        return self._values[name]
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._builders
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._builders)
+
+    def __len__(self) -> int:
+        return len(self._builders)
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._values
+
+    @property
+    def loaded(self) -> list[str]:
+        return [k for k in self._builders if k in self._values]
+
+    def materialize(self, names: Iterable[str] | None = None, workers: int = 1) -> "LazyTables":
+        """Build ``names`` (default: all entries), concurrently when ``workers > 1``."""
+        todo = [n for n in (names if names is not None else self._builders) if n not in self._values]
+        if workers > 1 and len(todo) > 1:
+            with ThreadPoolExecutor(max_workers=min(workers, len(todo)), thread_name_prefix=self.layer or "lazy") as pool:
+                list(pool.map(self.__getitem__, todo))
+        else:
+            for n in todo:
+                self[n]
+        return self
+
+    def __repr__(self) -> str:
+        return f"LazyTables({self.layer or '?'}: loaded={self.loaded}, pending={[k for k in self._builders if k not in self._values]})"
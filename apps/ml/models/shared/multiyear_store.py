@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import pathlib
+from typing import Any, Callable, Mapping
+
+import pandas as pd
+
+LOG = logging.getLogger("train")
+
+# Bump whenever build_gold_multiyear changes its output so stored
+# partitions are rebuilt.
+MULTIYEAR_STORE_VERSION = 1
+
+MANIFEST_NAME = "manifest.json"
+
+
+def _frame_digest(df: pd.DataFrame) -> str:
+    h = hashlib.sha256(",".join(map(str, df.columns)).encode())
+    h.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return h.hexdigest()
+
+
+def _year_digests(by_year: Mapping[str, pd.DataFrame]) -> dict[int, str]:
+    """One digest per year over every year-partitioned input's rows for that year."""
+    per_year: dict[int, Any] = {}
+    for name in sorted(by_year):
+        df = by_year[name].dropna(subset=["year"])
+        for year, part in df.groupby(df["year"].astype(int), sort=True):
+            h = per_year.setdefault(int(year), hashlib.sha256())
+            h.update(name.encode())
+            h.update(_frame_digest(part).encode())
+    return {y: h.hexdigest() for y, h in per_year.items()}
+
+
+class MultiYearGoldStore:
+    """
+    Year-partitioned Parquet store for the multi-year gold table.
+
+    ``refresh`` hashes each year's source rows and rebuilds only the years
+    whose hash changed (or whose partition is missing); all other years are
+    read back from ``year=YYYY.parquet``.  A change to a table shared by all
+    years (population) or to ``MULTIYEAR_STORE_VERSION`` rebuilds every
+    year.  ``rebuilt_years`` lists what the last refresh recomputed.
+    """
+
+    def __init__(self, store_dir: pathlib.Path) -> None:
+        self.store_dir = pathlib.Path(store_dir)
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+        self.manifest_path = self.store_dir / MANIFEST_NAME
+        self.rebuilt_years: list[int] = []
+
+    def _read_manifest(self) -> dict[str, Any]:
+        try:
+            with open(self.manifest_path) as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return manifest if manifest.get("version") == MULTIYEAR_STORE_VERSION else {}
+
+    def _partition(self, year: int) -> pathlib.Path:
+        return self.store_dir / f"year={year}.parquet"
+
+    def refresh(
+        self,
+        by_year: Mapping[str, pd.DataFrame],
+        shared: Mapping[str, pd.DataFrame],
+        build: Callable[[dict[str, pd.DataFrame]], pd.DataFrame],
+    ) -> pd.DataFrame:
+        digests = _year_digests(by_year)
+        shared_digest = hashlib.sha256(
+            "".join(_frame_digest(shared[k]) for k in sorted(shared)).encode()
+        ).hexdigest()
+
+        manifest = self._read_manifest()
+        stored = manifest.get("years", {}) if manifest.get("shared") == shared_digest else {}
+        changed = sorted(
+            y for y, d in digests.items()
+            if stored.get(str(y)) != d or not self._partition(y).exists()
+        )
+        for y in manifest.get("years", {}):
+            if int(y) not in digests:
+                self._partition(int(y)).unlink(missing_ok=True)
+
+        parts: list[pd.DataFrame] = [
+            pd.read_parquet(self._partition(y)) for y in sorted(digests) if y not in changed
+        ]
+        if changed:
+            inputs = {k: df[df["year"].isin(changed)] for k, df in by_year.items()}
+            fresh = build({**inputs, **shared})
+            for y in changed:
+                fresh[fresh["year"] == y].to_parquet(self._partition(y), index=False)
+            parts.append(fresh)
+
+        self.rebuilt_years = changed
+        tmp = self.manifest_path.with_suffix(".json.tmp")
+        with open(tmp, "w") as f:
+            json.dump({
+                "version": MULTIYEAR_STORE_VERSION,
+                "shared":  shared_digest,
+                "years":   {str(y): d for y, d in digests.items()},
+                "rebuilt": changed,
+            }, f, indent=2)
+        tmp.replace(self.manifest_path)
+        LOG.info("gold_multiyear store: rebuilt %d of %d years %s", len(changed), len(digests), changed or "")
+
+        # Restore the encoded key dtype (stored partitions may carry an older
+        # dictionary) and the (country, year) order of a full build.
+        key_dtype = by_year["fts_req"]["country_iso3"].dtype
+        out = pd.concat(parts, ignore_index=True)
+        out["country_iso3"] = out["country_iso3"].astype(key_dtype)
+        return out.sort_values(["country_iso3", "year"], kind="stable").reset_index(drop=True)
@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import pathlib
+import platform
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None  # type: ignore[assignment]
+
+LOG = logging.getLogger("train")
+
+_MB = 1024.0 * 1024.0
+
+
+def _proc_status() -> Dict[str, float]:
+    """VmRSS / VmHWM in MB from /proc (Linux only; empty elsewhere)."""
+    out: Dict[str, float] = {}
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith(("VmRSS:", "VmHWM:")):
+                    key, kb = line.split()[:2]
+                    out[key[:-1]] = int(kb) / 1024.0
+    except OSError:
+        pass
+    return out
+
+
+def _reset_hwm() -> bool:
+    # Writing "5" to clear_refs resets this process's RSS high-water mark.
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def _maxrss_mb(who: int) -> Optional[float]:
+    if resource is None:
+        return None
+    rss = resource.getrusage(who).ru_maxrss
+    return rss / _MB if sys.platform == "darwin" else rss / 1024.0
+
+
+def rss_mb() -> Optional[float]:
+    """Current resident set size of this process, if the platform reports it."""
+    return _proc_status().get("VmRSS")
+
+
+class RunReport:
+    """
+    Per-stage wall time, CPU time and memory for one training run.
+
+    ``stage(name)`` is a context manager; stages may nest and are recorded
+    as ``outer/inner``.  Each stage records its Python-heap peak
+    (tracemalloc, when ``trace_memory``) and its RSS high-water mark (Linux
+    resets the mark per stage; elsewhere the process-lifetime peak is
+    reported).  Other sections (parallelism, model timings, ...) are added
+    with ``add`` and everything is written as JSON by ``write``.
+    """
+
+    def __init__(self, trace_memory: bool = False) -> None:
+        self.trace_memory = trace_memory
+        self.started = datetime.now(timezone.utc)
+        self.stages: List[Dict[str, Any]] = []
+        self.sections: Dict[str, Any] = {}
+        self._stack: List[Dict[str, Any]] = []
+        self._owns_tracemalloc = False
+        self._hwm_resettable = _reset_hwm()
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._owns_tracemalloc = True
+
+    def _heap_peak(self) -> float:
+        return tracemalloc.get_traced_memory()[1] / _MB if tracemalloc.is_tracing() else 0.0
+
+    def _rss_peak(self) -> float:
+        if self._hwm_resettable:
+            return _proc_status().get("VmHWM", 0.0)
+        if resource is None:
+            return 0.0
+        return _maxrss_mb(resource.RUSAGE_SELF) or 0.0
+
+    def _reset_peaks(self) -> None:
+        if tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+        if self._hwm_resettable:
+            _reset_hwm()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[Dict[str, Any]]:
+        # Peaks are reset per stage; the enclosing stage keeps the max of
+        # what it saw before the reset and what its children report.
+        if self._stack:
+            parent = self._stack[-1]
+            parent["_heap"] = max(parent["_heap"], self._heap_peak())
+            parent["_rss"] = max(parent["_rss"], self._rss_peak())
+        self._reset_peaks()
+        path = "/".join([s["stage"] for s in self._stack] + [name])
+        entry: Dict[str, Any] = {"stage": name, "path": path, "_heap": 0.0, "_rss": 0.0}
+        self._stack.append(entry)
+        t0, c0 = time.perf_counter(), time.process_time()
+        status = "ok"
+        try:
+            yield entry
+        except BaseException:
+            status = "failed"
+            raise
+        finally:
+            self._stack.pop()
+            heap = max(entry.pop("_heap"), self._heap_peak())
+            rss = max(entry.pop("_rss"), self._rss_peak())
+            entry.pop("stage")
+            entry.update({
+                "status":       status,
+                "wall_s":       round(time.perf_counter() - t0, 4),
+                "cpu_s":        round(time.process_time() - c0, 4),
+                "heap_peak_mb": round(heap, 2) if self.trace_memory else None,
+                "rss_peak_mb":  round(rss, 2),
+                "rss_end_mb":   round(rss_mb() or 0.0, 2),
+            })
+            if self._stack:
+                parent = self._stack[-1]
+                parent["_heap"] = max(parent["_heap"], heap)
+                parent["_rss"] = max(parent["_rss"], rss)
+            self.stages.append(entry)
+            LOG.info("stage %-22s %8.2fs  rss_peak=%.0fMB", path, entry["wall_s"], entry["rss_peak_mb"])
+
+    def add(self, section: str, data: Any) -> None:
+        self.sections[section] = data
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "started":  self.started.isoformat(timespec="seconds"),
+            "wall_s":   round((datetime.now(timezone.utc) - self.started).total_seconds(), 3),
+            "host": {
+                "python":   platform.python_version(),
+                "platform": platform.platform(),
+                "cpu_count": os.cpu_count(),
+            },
+            "memory": {
+                "rss_peak_mb":          _maxrss_mb(resource.RUSAGE_SELF) if resource is not None else None,
+                "children_rss_peak_mb": _maxrss_mb(resource.RUSAGE_CHILDREN) if resource is not None else None,
+                "tracemalloc":          self.trace_memory,
+            },
+            "stages": self.stages,
+            **self.sections,
+        }
+
+    def write(self, path: pathlib.Path) -> pathlib.Path:
+        path = pathlib.Path(path)
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f, indent=2, default=str)
+        if self._owns_tracemalloc:
+            tracemalloc.stop()
+            self._owns_tracemalloc = False
+        LOG.info("Run report written: %s", path.as_posix())
+        return path
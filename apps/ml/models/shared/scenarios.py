@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from shared.temporal import TemporalFeatureEngineering, TemporalProjector
+
+LOG = logging.getLogger("train")
+
+
+@dataclass(frozen=True)
+class ScenarioSpec:
+    """
+    How Monte Carlo funding scenarios are drawn.  Every (scenario, country)
+    pair gets its own feedback sensitivities, the deterministic ones scaled
+    by a lognormal factor with median 1 and log-sd ``sensitivity_sigma``,
+    and its own funding path: AR(1) shocks to funded_pct with
+    ``funding_shock_sd`` points of sd per year and lag-one correlation
+    ``shock_persistence`` between steps.  Draws are seeded, so one spec
+    always gives the same bands.
+    """
+
+    n_scenarios: int = 1000
+    funding_shock_sd: float = 8.0
+    shock_persistence: float = 0.6
+    sensitivity_sigma: float = 0.3
+    quantiles: tuple[float, ...] = (0.1, 0.5, 0.9)
+    seed: int = 0
+    # Projector rows (scenarios x countries) per batch.  A batch holds
+    # every scenario of its countries and is reduced to their bands before
+    # the next one, so memory is bounded by this, not by the country count:
+    # ~170MB over the loaded models at 40 steps.
+    max_batch_rows: int = 50_000
+
+
+@dataclass(frozen=True)
+class ScenarioBands:
+    """``bands`` is (quantiles x steps x rows) ensemble neglect across the scenarios, rows in input order."""
+
+    isos: list[Optional[str]]
+    labels: list[str]
+    months_ahead: list[int]
+    quantiles: tuple[float, ...]
+    bands: np.ndarray
+    n_scenarios: int
+
+    def records(self) -> list[dict]:
+        """
+        One entry per input row, in order (rows of the same country stay
+        separate): its ``iso3`` and one dict per step with the ensemble
+        score at each quantile ("p10", "p50", ...).
+        """
+        keys = [f"p{q * 100:g}" for q in self.quantiles]
+        bands = self.bands.tolist()
+        return [
+            {
+                "iso3": iso,
+                "steps": [
+                    {"step": label, "monthsAhead": months_ahead, "ensembleScore": {key: round(bands[q][t][c], 2) for q, key in enumerate(keys)}}
+                    for t, (label, months_ahead) in enumerate(zip(self.labels, self.months_ahead))
+                ],
+            }
+            for c, iso in enumerate(self.isos)
+        ]
+
+
+def funding_paths(rng: np.random.Generator, n_steps: int, n_rows: int, step_sd: float, persistence: float) -> np.ndarray:
+    """(steps x rows) AR(1) funded_pct shocks, each step with stationary sd ``step_sd``."""
+    shocks = rng.standard_normal((n_steps, n_rows))
+    shocks *= step_sd
+    shocks[1:] *= np.sqrt(1.0 - persistence ** 2)
+    for t in range(1, n_steps):
+        shocks[t] += persistence * shocks[t - 1]
+    return shocks
+
+
+def run_funding_scenarios(
+    projector: TemporalProjector,
+    feat_df: pd.DataFrame,
+    spec: ScenarioSpec = ScenarioSpec(),
+    n_steps: int = 8,
+    step_years: float = 0.25,
+) -> ScenarioBands:
+    """
+    Project ``spec.n_scenarios`` perturbed funding scenarios for every
+    country in ``feat_df`` (``TEMPORAL_FEATURE_COLS`` plus
+    ``country_iso3``) and reduce their ensemble neglect to quantile bands.
+    Scenarios are stacked as projector rows, so each batch of up to
+    ``spec.max_batch_rows`` rows (all scenarios of as many countries as
+    fit, at least one) costs one scaler transform and one predict per
+    model per step.
+    """
+    tfe = TemporalFeatureEngineering
+    isos = [None if pd.isna(iso) else str(iso) for iso in feat_df["country_iso3"]] if "country_iso3" in feat_df.columns else [None] * len(feat_df)
+    base = projector.initial_states(feat_df)
+    n_countries = len(base)
+    labels = [f"q{i}" for i in range(1, n_steps + 1)]
+    months_ahead = [int(round(i * step_years * 12)) for i in range(1, n_steps + 1)]
+    if n_countries == 0:
+        return ScenarioBands(isos, labels, months_ahead, spec.quantiles, np.empty((len(spec.quantiles), n_steps, 0)), spec.n_scenarios)
+
+    base_sens = (tfe.NEGLECT_TO_FUNDING_SENSITIVITY, tfe.NEGLECT_TO_CBPF_SENSITIVITY, tfe.NEGLECT_TO_PIN_SENSITIVITY)
+    step_sd = spec.funding_shock_sd * np.sqrt(step_years)
+    per_batch = max(1, spec.max_batch_rows // spec.n_scenarios)
+    rng = np.random.default_rng(spec.seed)
+    bands = np.empty((len(spec.quantiles), n_steps, n_countries))
+    for start in range(0, n_countries, per_batch):
+        k = min(per_batch, n_countries - start)
+        rows = spec.n_scenarios * k
+        # Row r is scenario r // k of country start + r % k.
+        sens = tuple(s * rng.lognormal(0.0, spec.sensitivity_sigma, rows) for s in base_sens)
+        shocks = funding_paths(rng, n_steps, rows, step_sd, spec.shock_persistence)
+        proj = projector.simulate(np.tile(base[start:start + k], (spec.n_scenarios, 1)), n_steps, step_years, record_states=False, sensitivities=sens, funding_shocks=shocks)
+        ensemble = proj.scores["Ensemble"].reshape(n_steps, spec.n_scenarios, k)
+        bands[:, :, start:start + k] = np.quantile(ensemble, spec.quantiles, axis=1)
+    LOG.info("Funding scenarios: %d x %d rows x %d steps", spec.n_scenarios, n_countries, n_steps)
+    return ScenarioBands(isos, labels, months_ahead, spec.quantiles, bands, spec.n_scenarios)
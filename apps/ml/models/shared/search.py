@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import logging
+import time
+from typing import Any, Dict, Mapping, Optional, Sequence
+
+import joblib
+import numpy as np
+from sklearn.experimental import enable_halving_search_cv  # noqa: F401  (registers HalvingRandomSearchCV)
+from sklearn.model_selection import HalvingRandomSearchCV
+from sklearn.pipeline import Pipeline
+
+from shared.cv_scheduler import Split
+
+LOG = logging.getLogger("train")
+
+
+def halving_search(
+    pipeline: Pipeline,
+    space: Mapping[str, Any],
+    X: np.ndarray,
+    y: np.ndarray,
+    splits: Sequence[Split],
+    max_estimators: int,
+    scoring: str = "r2",
+    n_candidates: int = 27,
+    factor: int = 3,
+    n_workers: int = 1,
+    inner_threads: Optional[int] = None,
+    random_state: int = 42,
+    model_path: str = "model",
+) -> Dict[str, Any]:
+    """
+    Successive-halving random search over ``space`` (parameters of the
+    pipeline's ``model`` step, or of the estimator at ``model_path`` such
+    as ``"model__estimator"`` inside a wrapper) on the given CV ``splits``.
+
+    ``n_estimators`` is the budget: every candidate is first scored with a
+    few trees, each round keeps the best ``1 / factor`` and multiplies the
+    trees by ``factor``, and the last round runs at ``max_estimators``.
+    Rounds run their (candidate, fold) fits on ``n_workers`` processes.
+    Returns the winner's model parameters (including the n_estimators it
+    won at), its mean CV score and the search's size.
+    """
+    search = HalvingRandomSearchCV(
+        pipeline,
+        {f"{model_path}__{name}": dist for name, dist in space.items()},
+        n_candidates=n_candidates,
+        factor=factor,
+        resource=f"{model_path}__n_estimators",
+        max_resources=max_estimators,
+        min_resources="exhaust",
+        cv=list(splits),
+        scoring=scoring,
+        refit=False,
+        random_state=random_state,
+        n_jobs=n_workers,
+    )
+    t0 = time.perf_counter()
+    backend = "loky" if n_workers > 1 else "sequential"
+    with joblib.parallel_config(backend=backend, inner_max_num_threads=inner_threads if n_workers > 1 else None):
+        search.fit(X, y)
+    secs = time.perf_counter() - t0
+
+    n_fits = int(sum(np.asarray(search.n_candidates_) * len(splits)))
+    return {
+        "params":       {name[len(model_path) + 2:]: getattr(value, "item", lambda: value)() for name, value in search.best_params_.items()},
+        "cv_score":     float(search.best_score_),
+        "n_candidates": int(search.n_candidates_[0]),
+        "n_resources":  [int(r) for r in search.n_resources_],
+        "n_fits":       n_fits,
+        "search_s":     round(secs, 2),
+    }
@@ -1,9 +1,15 @@
 from __future__ import annotations
 
+from dataclasses import dataclass
+
 import numpy as np
 import pandas as pd
 from sklearn.preprocessing import RobustScaler
 
+from ensemble.blend import blend_weight
+from shared.features import FORECAST_HORIZONS, MultiHorizonDataset, build_multi_horizon_dataset
+from shared.lags import Diff, FeatureSpec, Lag, LagWindowEngine
+
 
 class TemporalFeatureEngineering:
     NEGLECT_TO_FUNDING_SENSITIVITY: float = -0.18
@@ -11,24 +17,15 @@ class TemporalFeatureEngineering:
     NEGLECT_TO_PIN_SENSITIVITY: float = 0.04
     TEMPORAL_FEATURE_COLS: list[str] = ["fgi_score", "cmi_score", "cbpf_share", "pin_pct_pop", "log_req_usd", "log_cbpf", "funded_pct", "cbpf_per_pin", "req_per_pin", "bbr_median_z", "bbr_max_z", "n_cluster_anomalies", "n_clusters", "fgi_score_lag1", "fgi_score_lag2", "funded_pct_lag1", "cbpf_share_lag1", "pin_pct_pop_lag1", "log_cbpf_lag1", "delta_fgi_1yr", "delta_funded_pct_1yr", "delta_pin_pct_1yr", "trend_fgi_2yr"]
 
+    LAG_SPECS: list[FeatureSpec] = [Lag("fgi_score", 1, fill="fgi_score"), Lag("fgi_score", 2, fill="fgi_score_lag1"), Lag("funded_pct", 1, fill="funded_pct"), Lag("cbpf_share", 1, fill="cbpf_share"), Lag("pin_pct_pop", 1, fill="pin_pct_pop"), Lag("log_cbpf", 1, fill="log_cbpf"), Diff("delta_fgi_1yr", "fgi_score", "fgi_score_lag1"), Diff("delta_funded_pct_1yr", "funded_pct", "funded_pct_lag1"), Diff("delta_pin_pct_1yr", "pin_pct_pop", "pin_pct_pop_lag1"), Diff("trend_fgi_2yr", "fgi_score", "fgi_score_lag2", per=2.0)]
+
     @classmethod
-    def compute_lag_features(cls, gold_multiyear_with_neglect):
-        df = gold_multiyear_with_neglect.copy().sort_values(["country_iso3", "year"])
-        lag_definitions: list[tuple[str, int]] = [("fgi_score", 1), ("fgi_score", 2), ("funded_pct", 1), ("cbpf_share", 1), ("pin_pct_pop", 1), ("log_cbpf", 1)]
-        for col, lag in lag_definitions:
-            new_col = f"{col}_lag{lag}"
-            df[new_col] = df.groupby("country_iso3")[col].shift(lag)
-        df["fgi_score_lag1"] = df["fgi_score_lag1"].fillna(df["fgi_score"])
-        df["fgi_score_lag2"] = df["fgi_score_lag2"].fillna(df["fgi_score_lag1"])
-        df["funded_pct_lag1"] = df["funded_pct_lag1"].fillna(df["funded_pct"])
-        df["cbpf_share_lag1"] = df["cbpf_share_lag1"].fillna(df["cbpf_share"])
-        df["pin_pct_pop_lag1"] = df["pin_pct_pop_lag1"].fillna(df["pin_pct_pop"])
-        df["log_cbpf_lag1"] = df["log_cbpf_lag1"].fillna(df["log_cbpf"])
-        df["delta_fgi_1yr"] = df["fgi_score"] - df["fgi_score_lag1"]
-        df["delta_funded_pct_1yr"] = df["funded_pct"] - df["funded_pct_lag1"]
-        df["delta_pin_pct_1yr"] = df["pin_pct_pop"] - df["pin_pct_pop_lag1"]
-        df["trend_fgi_2yr"] = (df["fgi_score"] - df["fgi_score_lag2"]) / 2.0
-        return df
+    def lag_engine(cls, specs: list[FeatureSpec] | None = None) -> LagWindowEngine:
+        return LagWindowEngine(specs if specs is not None else cls.LAG_SPECS, entity="country_iso3", time="year")
+
+    @classmethod
+    def compute_lag_features(cls, gold_multiyear_with_neglect, specs: list[FeatureSpec] | None = None):
+        return cls.lag_engine(specs).compute(gold_multiyear_with_neglect)
 
     @classmethod
     def fit_temporal_scaler(cls, feat_all_temporal):
@@ -37,34 +34,82 @@ class TemporalFeatureEngineering:
         X_scaled = scaler.fit_transform(X)
         return scaler, X_scaled
 
+    @classmethod
+    def build_temporal_multi_horizon_dataset(cls, feat_all_temporal, horizons=FORECAST_HORIZONS, min_year=2015) -> MultiHorizonDataset:
+        return build_multi_horizon_dataset(feat_all_temporal, horizons, min_year=min_year, feature_cols=cls.TEMPORAL_FEATURE_COLS)
+
     @classmethod
     def build_temporal_forecast_dataset(cls, feat_all_temporal, horizon_years, min_year=2015):
-        df = feat_all_temporal[feat_all_temporal["year"] >= min_year].copy()
-        targets = feat_all_temporal[["country_iso3", "year", "neglect_score"]].rename(columns={"year": "year_target", "neglect_score": "future_neglect"}).copy()
-        targets["year"] = targets["year_target"] - horizon_years
-        paired = df.merge(targets[["country_iso3", "year", "future_neglect"]], on=["country_iso3", "year"], how="inner")
-        X = paired[cls.TEMPORAL_FEATURE_COLS].fillna(0).values
-        y = paired["future_neglect"].values
-        meta = paired[["country_iso3", "year"]].reset_index(drop=True)
-        return X, y, meta
+        label = f"{horizon_years}yr"
+        return cls.build_temporal_multi_horizon_dataset(feat_all_temporal, [(label, horizon_years)], min_year).horizon(label)
 
     @classmethod
-    def enrich_snapshot_with_lags(cls, feat_snapshot: pd.DataFrame, feat_all_temporal: pd.DataFrame) -> pd.DataFrame:
+    def enrich_snapshot_with_lags(cls, feat_snapshot: pd.DataFrame, feat_all_temporal: pd.DataFrame, specs: list[FeatureSpec] | None = None) -> pd.DataFrame:
+        # The snapshot is appended to the history one step after its latest year
+        # and run through the same engine with exact-year lags, so lag1/lag2
+        # come from the latest / previous multi-year rows (falling back to the
+        # snapshot value, or 0, when a country has no such row).
+        engine = cls.lag_engine(specs)
         latest_multi_year = feat_all_temporal["year"].max()
-        lag1_cols = ["country_iso3", "fgi_score", "funded_pct", "cbpf_share", "pin_pct_pop", "log_cbpf"]
-        lag2_cols = ["country_iso3", "fgi_score"]
-        lag1_df = feat_all_temporal[feat_all_temporal["year"] == latest_multi_year][lag1_cols].rename(columns={"fgi_score": "fgi_score_lag1", "funded_pct": "funded_pct_lag1", "cbpf_share": "cbpf_share_lag1", "pin_pct_pop": "pin_pct_pop_lag1", "log_cbpf": "log_cbpf_lag1"})
-        lag2_df = feat_all_temporal[feat_all_temporal["year"] == latest_multi_year - 1][lag2_cols].rename(columns={"fgi_score": "fgi_score_lag2"})
-        enriched = feat_snapshot.copy().merge(lag1_df, on="country_iso3", how="left").merge(lag2_df, on="country_iso3", how="left")
-        for src, dst in [("fgi_score", "fgi_score_lag1"), ("funded_pct", "funded_pct_lag1"), ("cbpf_share", "cbpf_share_lag1"), ("pin_pct_pop", "pin_pct_pop_lag1"), ("log_cbpf", "log_cbpf_lag1")]: enriched[dst] = enriched[dst].fillna(enriched[src].fillna(0))
-        enriched["fgi_score_lag2"] = enriched["fgi_score_lag2"].fillna(enriched["fgi_score_lag1"])
-        enriched["delta_fgi_1yr"] = enriched["fgi_score"] - enriched["fgi_score_lag1"]
-        enriched["delta_funded_pct_1yr"] = enriched["funded_pct"] - enriched["funded_pct_lag1"]
-        enriched["delta_pin_pct_1yr"] = enriched["pin_pct_pop"] - enriched["pin_pct_pop_lag1"]
-        enriched["trend_fgi_2yr"] = (enriched["fgi_score"] - enriched["fgi_score_lag2"]) / 2.0
+        src = engine.source_cols
+        hist = feat_all_temporal[["country_iso3", "year", *src]].assign(_snapshot_row=-1)
+        snap = feat_snapshot[["country_iso3", *src]].assign(year=latest_multi_year + 1, _snapshot_row=np.arange(len(feat_snapshot)))
+        panel = pd.concat([hist, snap], ignore_index=True)
+        panel["country_iso3"] = panel["country_iso3"].astype(object)
+        lagged = engine.compute(panel, exact_time=True, fill_default=0.0)
+        lagged = lagged[lagged["_snapshot_row"] >= 0].sort_values("_snapshot_row")
+        new_cols = [s.out for s in engine.specs]
+        enriched = feat_snapshot.copy().reset_index(drop=True)
+        for c in new_cols: enriched[c] = lagged[c].to_numpy()
         return enriched
 
 
+# Fixed offsets of the projector's state columns in TEMPORAL_FEATURE_COLS.
+_COL: dict[str, int] = {c: i for i, c in enumerate(TemporalFeatureEngineering.TEMPORAL_FEATURE_COLS)}
+_FGI, _CMI, _CBPF, _PIN, _LOG_CBPF, _FUNDED = (_COL[c] for c in ("fgi_score", "cmi_score", "cbpf_share", "pin_pct_pop", "log_cbpf", "funded_pct"))
+_FGI_L1, _FGI_L2, _FUNDED_L1, _CBPF_L1, _PIN_L1, _LOG_CBPF_L1 = (_COL[c] for c in ("fgi_score_lag1", "fgi_score_lag2", "funded_pct_lag1", "cbpf_share_lag1", "pin_pct_pop_lag1", "log_cbpf_lag1"))
+_D_FGI, _D_FUNDED, _D_PIN, _TREND_FGI = (_COL[c] for c in ("delta_fgi_1yr", "delta_funded_pct_1yr", "delta_pin_pct_1yr", "trend_fgi_2yr"))
+# One step's lag rotation: column _LAG_DST[i] takes the value of _LAG_SRC[i].
+_LAG_DST = np.array([_FGI_L2, _FGI_L1, _FUNDED_L1, _CBPF_L1, _PIN_L1, _LOG_CBPF_L1])
+_LAG_SRC = np.array([_FGI_L1, _FGI, _FUNDED, _CBPF, _PIN, _LOG_CBPF])
+# (funding, CBPF, PIN) feedback sensitivities: scalars or one value per state row.
+Sensitivities = tuple[float | np.ndarray, float | np.ndarray, float | np.ndarray]
+# Trajectory score keys -> model names, as in gold_country_scores.json.
+_SCORE_KEYS: tuple[tuple[str, str], ...] = (("lgbm", "LightGBM"), ("rf", "RandomForest"), ("xgb", "XGBoost"), ("gbr", "GBR"))
+
+
+@dataclass(frozen=True)
+class Projection:
+    """
+    Projector output as arrays: ``scores[name]`` is (steps x rows) per
+    model and "Ensemble", ``states`` the (steps x rows x
+    ``TEMPORAL_FEATURE_COLS``) state each step predicted from, when
+    recorded.  ``records()`` is the JSON form ``project_batch`` returns.
+    """
+
+    labels: list[str]
+    months_ahead: list[int]
+    horizons: list[str]
+    scores: dict[str, np.ndarray]
+    states: np.ndarray | None = None
+
+    def records(self) -> list[list[dict]]:
+        cols = TemporalFeatureEngineering.TEMPORAL_FEATURE_COLS
+        n = self.scores["Ensemble"].shape[1]
+        zeros = np.zeros((len(self.labels), n))
+        scores = {key: self.scores.get(name, zeros).tolist() for key, name in _SCORE_KEYS}
+        ensemble = self.scores["Ensemble"].tolist()
+        states = self.states.tolist() if self.states is not None else None
+        results: list[list[dict]] = [[] for _ in range(n)]
+        for t, (label, months_ahead, horizon_key) in enumerate(zip(self.labels, self.months_ahead, self.horizons)):
+            lgbm, rf, xgb, gbr, ens = scores["lgbm"][t], scores["rf"][t], scores["xgb"][t], scores["gbr"][t], ensemble[t]
+            for r in range(n):
+                step = {"step": label, "monthsAhead": months_ahead, "horizonModel": horizon_key, "scores": {"neglectScore": round(lgbm[r], 2), "ensembleScore": round(ens[r], 2), "lgbm": round(lgbm[r], 2), "rf": round(rf[r], 2), "xgb": round(xgb[r], 2), "gbr": round(gbr[r], 2)}}
+                if states is not None: step["stateSnapshot"] = {k: round(v, 4) for k, v in zip(cols, states[t][r])}
+                results[r].append(step)
+        return results
+
+
 class TemporalProjector:
     DEFAULT_BASE_KEYS: list[str] = ["LightGBM", "RandomForest", "XGBoost", "GBR"]
     STEP_LABELS: list[str] = ["q1", "q2", "q3", "q4", "q5", "q6", "q7", "q8"]
@@ -81,70 +126,98 @@ class TemporalProjector:
         cumulative_years = idx * step_years
         return "1yr" if cumulative_years <= 1.0 else "2yr"
 
-    def _predict_from_state(self, state: dict[str, float], horizon_key: str) -> dict[str, float]:
-        x_vec = np.array([state.get(c, 0.0) for c in TemporalFeatureEngineering.TEMPORAL_FEATURE_COLS], dtype=np.float64).reshape(1, -1)
-        x_scaled = self._scaler.transform(x_vec)
-        preds: dict[str, float] = {}
-        for name, mdl in self._models[horizon_key].items(): preds[name] = float(np.clip(mdl.predict(x_scaled)[0], 0.0, 100.0))
+    def _predict_into(self, states: np.ndarray, horizon_key: str, scores: dict[str, np.ndarray], t: int) -> None:
+        # One scaler transform and one predict per model for every state
+        # row, clipped straight into row ``t`` of the score buffers.
+        x_scaled = self._scaler.transform(states)
+        models = self._models[horizon_key]
+        for name, mdl in models.items(): np.clip(mdl.predict(x_scaled), 0.0, 100.0, out=scores[name][t])
         h_cv = self._cv[horizon_key]
-        weights = {k: max(h_cv.get(k, {}).get("mean", 0.0), 0.0) for k in self._base_keys}
+        weights = {k: blend_weight(h_cv.get(k, {})) for k in self._base_keys}
         total_w = max(sum(weights.values()), 1e-9)
-        ensemble = sum(weights[k] * preds.get(k, 0.0) for k in self._base_keys) / total_w
-        preds["Ensemble"] = float(np.clip(ensemble, 0.0, 100.0))
-        return preds
+        ensemble = sum(weights[k] * (scores[k][t] if k in models else 0.0) for k in self._base_keys) / total_w
+        np.clip(ensemble, 0.0, 100.0, out=scores["Ensemble"][t])
 
     @staticmethod
-    def _apply_feedback(state: dict[str, float], predicted_neglect: float, step_years: float) -> dict[str, float]:
-        s: dict[str, float] = dict(state)
-        prev_fgi = float(s.get("fgi_score", 50.0))
-        prev_funded = float(s.get("funded_pct", 50.0))
-        prev_cbpf = float(s.get("cbpf_share", 0.0))
-        prev_pin = float(s.get("pin_pct_pop", 0.0))
-        prev_log_cbpf = float(s.get("log_cbpf", 0.0))
-        prev_fgi_lag1 = float(s.get("fgi_score_lag1", prev_fgi))
-        pressure = float(np.clip(predicted_neglect / 100.0, 0.0, 1.0))
-        delta_funded = TemporalFeatureEngineering.NEGLECT_TO_FUNDING_SENSITIVITY * pressure * step_years * 100.0
-        s["funded_pct"] = float(np.clip(prev_funded + delta_funded, 0.0, 100.0))
-        implied_fgi = (1.0 - s["funded_pct"] / 100.0) * 100.0
-        s["fgi_score"] = float(np.clip(0.60 * implied_fgi + 0.40 * prev_fgi, 0.0, 100.0))
-        delta_cbpf = TemporalFeatureEngineering.NEGLECT_TO_CBPF_SENSITIVITY * pressure * step_years
-        s["cbpf_share"] = float(np.clip(prev_cbpf + delta_cbpf, 0.0, 1.0))
-        s["cmi_score"] = float(np.clip(s["fgi_score"] * (1.0 - s["cbpf_share"]), 0.0, 100.0))
-        delta_pin = TemporalFeatureEngineering.NEGLECT_TO_PIN_SENSITIVITY * pressure * step_years * 100.0
-        s["pin_pct_pop"] = float(np.clip(prev_pin + delta_pin, 0.0, 100.0))
-        cbpf_share_increase = max(s["cbpf_share"] - prev_cbpf, 0.0)
-        s["log_cbpf"] = float(np.clip(prev_log_cbpf + cbpf_share_increase * 1.5, 0.0, 25.0))
-        s["fgi_score_lag2"] = prev_fgi_lag1
-        s["fgi_score_lag1"] = prev_fgi
-        s["funded_pct_lag1"] = prev_funded
-        s["cbpf_share_lag1"] = prev_cbpf
-        s["pin_pct_pop_lag1"] = prev_pin
-        s["log_cbpf_lag1"] = prev_log_cbpf
-        s["delta_fgi_1yr"] = s["fgi_score"] - s["fgi_score_lag1"]
-        s["delta_funded_pct_1yr"] = s["funded_pct"] - s["funded_pct_lag1"]
-        s["delta_pin_pct_1yr"] = s["pin_pct_pop"] - s["pin_pct_pop_lag1"]
-        s["trend_fgi_2yr"] = (s["fgi_score"] - s["fgi_score_lag2"]) / 2.0
-        return s
+    def _apply_feedback(s: np.ndarray, predicted_neglect: np.ndarray, step_years: float, work: np.ndarray, sensitivities: Sensitivities | None = None, funding_shock: np.ndarray | None = None) -> None:
+        # Advances the (rows x features) state ``s`` one step in place;
+        # ``work`` is (3 x rows) scratch.  The lags rotate first, so the
+        # lag columns hold the previous values the update reads.
+        tfe = TemporalFeatureEngineering
+        f_sens, c_sens, p_sens = sensitivities or (tfe.NEGLECT_TO_FUNDING_SENSITIVITY, tfe.NEGLECT_TO_CBPF_SENSITIVITY, tfe.NEGLECT_TO_PIN_SENSITIVITY)
+        pressure, tmp, tmp2 = work
+        s[:, _LAG_DST] = s[:, _LAG_SRC]
+        np.divide(predicted_neglect, 100.0, out=pressure)
+        np.clip(pressure, 0.0, 1.0, out=pressure)
+
+        np.multiply(f_sens, pressure, out=tmp); tmp *= step_years; tmp *= 100.0
+        tmp += s[:, _FUNDED_L1]
+        if funding_shock is not None: tmp += funding_shock
+        np.clip(tmp, 0.0, 100.0, out=tmp); s[:, _FUNDED] = tmp
+        # implied fgi = (1 - funded / 100) * 100, blended 60/40 with the previous fgi
+        tmp /= 100.0; np.subtract(1.0, tmp, out=tmp); tmp *= 100.0; tmp *= 0.60
+        np.multiply(s[:, _FGI_L1], 0.40, out=tmp2); tmp += tmp2; np.clip(tmp, 0.0, 100.0, out=tmp); s[:, _FGI] = tmp
+
+        np.multiply(c_sens, pressure, out=tmp2); tmp2 *= step_years
+        tmp2 += s[:, _CBPF_L1]; np.clip(tmp2, 0.0, 1.0, out=tmp2); s[:, _CBPF] = tmp2
+        np.subtract(1.0, tmp2, out=tmp2); tmp2 *= tmp; np.clip(tmp2, 0.0, 100.0, out=tmp2); s[:, _CMI] = tmp2
+
+        np.multiply(p_sens, pressure, out=tmp2); tmp2 *= step_years; tmp2 *= 100.0
+        tmp2 += s[:, _PIN_L1]; np.clip(tmp2, 0.0, 100.0, out=tmp2); s[:, _PIN] = tmp2
+
+        np.subtract(s[:, _CBPF], s[:, _CBPF_L1], out=tmp2); np.maximum(tmp2, 0.0, out=tmp2); tmp2 *= 1.5
+        tmp2 += s[:, _LOG_CBPF_L1]; np.clip(tmp2, 0.0, 25.0, out=tmp2); s[:, _LOG_CBPF] = tmp2
+
+        np.subtract(s[:, _FGI], s[:, _FGI_L1], out=tmp); s[:, _D_FGI] = tmp
+        np.subtract(s[:, _FUNDED], s[:, _FUNDED_L1], out=tmp); s[:, _D_FUNDED] = tmp
+        np.subtract(s[:, _PIN], s[:, _PIN_L1], out=tmp); s[:, _D_PIN] = tmp
+        np.subtract(s[:, _FGI], s[:, _FGI_L2], out=tmp); tmp /= 2.0; s[:, _TREND_FGI] = tmp
+
+    @staticmethod
+    def initial_states(feat_df: pd.DataFrame) -> np.ndarray:
+        """(countries x ``TEMPORAL_FEATURE_COLS``) start states; absent columns are 0."""
+        states = np.zeros((len(feat_df), len(_COL)))
+        for c, j in _COL.items():
+            if c in feat_df.columns: states[:, j] = feat_df[c].to_numpy(dtype=np.float64)
+        return states
+
+    def simulate(self, states: np.ndarray, n_steps: int = 8, step_years: float = 0.25, record_states: bool = True, sensitivities: Sensitivities | None = None, funding_shocks: np.ndarray | None = None) -> Projection:
+        """
+        Project every row of ``states`` (rows x ``TEMPORAL_FEATURE_COLS``)
+        ``n_steps`` steps ahead.  A copy of ``states`` is advanced in place
+        and scores land in preallocated (steps x rows) buffers; the state
+        trajectory is only kept when ``record_states``.
+
+        ``sensitivities`` overrides the (funding, CBPF, PIN) feedback
+        sensitivities, each a scalar or one value per row.
+        ``funding_shocks`` (steps x rows) adds exogenous funded_pct points
+        to each step's feedback update.
+        """
+        s = np.array(states, dtype=np.float64, order="C")
+        n = len(s)
+        names = list(dict.fromkeys([*self._models["1yr"], *self._models["2yr"], "Ensemble"]))
+        scores = {name: np.zeros((n_steps, n)) for name in names}
+        trajectory = np.empty((n_steps, *s.shape)) if record_states else None
+        work = np.empty((3, n))
+        labels = [f"q{i}" for i in range(1, n_steps + 1)]
+        horizons = [self._horizon_for_step(label, step_years) for label in labels]
+        for t, horizon_key in enumerate(horizons):
+            if trajectory is not None: trajectory[t] = s
+            self._predict_into(s, horizon_key, scores, t)
+            self._apply_feedback(s, scores["Ensemble"][t], step_years, work, sensitivities, None if funding_shocks is None else funding_shocks[t])
+        return Projection(labels, [int(round(i * step_years * 12)) for i in range(1, n_steps + 1)], horizons, scores, trajectory)
 
     def project(self, initial_state: dict, n_steps: int = 8, step_years: float = 0.25) -> list[dict]:
-        labels = [f"q{i + 1}" for i in range(n_steps)]
-        state: dict[str, float] = {k: float(initial_state.get(k, 0.0)) for k in TemporalFeatureEngineering.TEMPORAL_FEATURE_COLS}
-        results: list[dict] = []
-        for label in labels:
-            horizon_key = self._horizon_for_step(label, step_years)
-            idx = int(label[1:])
-            months_ahead = int(round(idx * step_years * 12))
-            preds = self._predict_from_state(state, horizon_key)
-            results.append({"step": label, "monthsAhead": months_ahead, "horizonModel": horizon_key, "scores": {"neglectScore": round(preds.get("LightGBM", 0.0), 2), "ensembleScore": round(preds["Ensemble"], 2), "lgbm": round(preds.get("LightGBM", 0.0), 2), "rf": round(preds.get("RandomForest", 0.0), 2), "xgb": round(preds.get("XGBoost", 0.0), 2), "gbr": round(preds.get("GBR", 0.0), 2)}, "stateSnapshot": {k: round(state[k], 4) for k in TemporalFeatureEngineering.TEMPORAL_FEATURE_COLS}})
-            state = self._apply_feedback(state, preds["Ensemble"], step_years)
-        return results
+        state = np.array([[float(initial_state.get(k, 0.0)) for k in TemporalFeatureEngineering.TEMPORAL_FEATURE_COLS]], dtype=np.float64)
+        return self.simulate(state, n_steps, step_years).records()[0]
 
     def project_batch(self, feat_df: pd.DataFrame, n_steps: int = 8, step_years: float = 0.25) -> dict[str, list[dict]]:
-        results: dict[str, list[dict]] = {}
-        for _, row in feat_df.iterrows():
-            iso3 = str(row.get("country_iso3", ""))
-            results[iso3] = self.project(row.to_dict(), n_steps=n_steps, step_years=step_years)
-        return results
+        # All countries step together: n_steps scaler transforms and
+        # n_steps x models predicts in total, not per country.
+        if len(feat_df) == 0:
+            return {}
+        isos = feat_df["country_iso3"].astype(str).tolist() if "country_iso3" in feat_df.columns else [""] * len(feat_df)
+        return dict(zip(isos, self.simulate(self.initial_states(feat_df), n_steps, step_years).records()))
 
 
 NEGLECT_TO_FUNDING_SENSITIVITY = TemporalFeatureEngineering.NEGLECT_TO_FUNDING_SENSITIVITY
@@ -0,0 +1,58 @@
+"""
+StepRunner caching: a step run with ``only_step`` on stale upstream
+checkpoints must not be reused once those upstream steps rerun.
+"""
+from __future__ import annotations
+
+import pathlib
+import sys
+from types import SimpleNamespace
+
+_MODELS = pathlib.Path(__file__).resolve().parents[1]
+if str(_MODELS) not in sys.path:
+    sys.path.insert(0, str(_MODELS))
+
+from shared.checkpoint import CheckpointStore, Step, StepRunner
+
+
+def _runner(tmp_path: pathlib.Path, source: dict) -> StepRunner:
+    steps = [
+        Step("data", lambda inputs: {"x": source["x"]}, sources=lambda: {"x": str(source["x"])}),
+        Step("cv", lambda inputs: {"y": inputs["data"]["x"] * 2}, inputs=["data"]),
+    ]
+    return StepRunner(steps, SimpleNamespace(), CheckpointStore(tmp_path))
+
+
+def test_full_run_caches_every_step(tmp_path):
+    source = {"x": 5}
+    _runner(tmp_path, source).run()
+    runner = _runner(tmp_path, source)
+    runner.run()
+    assert {name: s["status"] for name, s in runner.status.items()} == {"data": "cached", "cv": "cached"}
+    assert runner.outputs("cv") == {"y": 10}
+
+
+def test_only_step_on_stale_inputs_is_not_reused(tmp_path):
+    source = {"x": 5}
+    _runner(tmp_path, source).run()
+
+    source["x"] = 10
+    stale = _runner(tmp_path, source)
+    assert stale.run(only_step="cv")["cv"] == {"y": 10}
+
+    runner = _runner(tmp_path, source)
+    runner.run()
+    assert runner.status["data"]["status"] == "ran"
+    assert runner.status["cv"]["status"] == "ran"
+    assert runner.outputs("cv") == {"y": 20}
+
+
+def test_only_step_on_current_inputs_is_reused(tmp_path):
+    source = {"x": 5}
+    _runner(tmp_path, source).run()
+    _runner(tmp_path, source).run(only_step="cv")
+
+    runner = _runner(tmp_path, source)
+    runner.run()
+    assert runner.status["cv"]["status"] == "cached"
+    assert runner.outputs("cv") == {"y": 10}
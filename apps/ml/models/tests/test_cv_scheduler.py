@@ -0,0 +1,34 @@
+"""
+Parity of shared.cv_scheduler.run_cv_jobs with cross_val_score: the
+scheduler scores predictions it already made, and must give the same
+per-fold scores as scoring each fold's fitted model.
+"""
+from __future__ import annotations
+
+import pathlib
+import sys
+
+import numpy as np
+import pytest
+from sklearn.linear_model import Ridge
+from sklearn.model_selection import KFold, cross_val_score
+
+_MODELS = pathlib.Path(__file__).resolve().parents[1]
+if str(_MODELS) not in sys.path:
+    sys.path.insert(0, str(_MODELS))
+
+from shared.cv_scheduler import CVJob, run_cv_jobs
+
+
+@pytest.mark.parametrize("scoring", ["r2", "neg_mean_squared_error", "neg_mean_absolute_error", "neg_root_mean_squared_error"])
+def test_run_cv_jobs_matches_cross_val_score(scoring: str) -> None:
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(120, 4))
+    y = X @ np.array([1.0, -2.0, 0.5, 0.0]) + rng.normal(scale=0.5, size=120)
+    cv = KFold(n_splits=4, shuffle=True, random_state=0)
+    job = CVJob(label="current", estimators={"ridge": Ridge(alpha=1.0)}, X=X, y=y, splits=list(cv.split(X)), scoring=scoring)
+
+    got = run_cv_jobs([job], n_workers=1)["current"]["ridge"]
+    expected = cross_val_score(Ridge(alpha=1.0), X, y, cv=cv, scoring=scoring)
+    assert got["mean"] == pytest.approx(expected.mean(), rel=1e-12)
+    assert got["std"] == pytest.approx(expected.std(), rel=1e-12)
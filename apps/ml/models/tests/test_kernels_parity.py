@@ -0,0 +1,77 @@
+"""
+Parity of shared.kernels with the pandas implementations it replaced
+(groupby().transform z-scores, Series min-max scaling and the per-row
+severity band): results must be bit-for-bit equal.
+"""
+from __future__ import annotations
+
+import pathlib
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+_MODELS = pathlib.Path(__file__).resolve().parents[1]
+if str(_MODELS) not in sys.path:
+    sys.path.insert(0, str(_MODELS))
+
+from shared.features import SEVERITY_EDGES, SEVERITY_LABELS, _norm01
+from shared.kernels import GroupOffsets, band, group_zscore, minmax_scale
+
+
+def _z_score(x: pd.Series) -> pd.Series:
+    mu, sigma = x.mean(), x.std()
+    return (x - mu) / sigma if sigma > 0 else pd.Series(0, index=x.index)
+
+
+def _severity_band(fgi):
+    if fgi >= 86: return "CRITICAL"
+    if fgi >= 61: return "HIGH"
+    if fgi >= 31: return "MEDIUM"
+    return "LOW"
+
+
+def _panel(seed: int) -> pd.DataFrame:
+    # Group sizes from 1 to well over 128 rows (where NumPy's pairwise
+    # summation starts splitting blocks), in shuffled row order.
+    rng = np.random.default_rng(seed)
+    sizes = [1, 1, 2, 3, 7, 64, 127, 128, 129, 200, 257, 513, 1000]
+    key = np.repeat(np.arange(len(sizes)), sizes)
+    v = rng.lognormal(3.0, 2.0, len(key)) * rng.choice([-1.0, 1.0], len(key))
+    df = pd.DataFrame({"year": 2000 + key % 3, "cluster": pd.Categorical([f"c{k}" for k in key]), "v": v})
+    df.loc[df["cluster"] == "c4", "v"] = 5.25                               # constant group
+    df.loc[rng.random(len(df)) < 0.05, "v"] = np.nan                       # scattered NaNs
+    df.loc[df["cluster"] == "c2", "v"] = np.nan                            # all-NaN group
+    df.loc[rng.random(len(df)) < 0.02, "cluster"] = np.nan                 # rows in no group
+    return df.sample(frac=1.0, random_state=seed).reset_index(drop=True)
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("by", [["cluster"], ["year", "cluster"]])
+def test_group_zscore_matches_groupby_transform(seed: int, by: list[str]) -> None:
+    df = _panel(seed)
+    expected = df.groupby(by, observed=True)["v"].transform(_z_score).to_numpy(dtype=np.float64)
+    got = group_zscore(df["v"], GroupOffsets.from_frame(df, by))
+    assert np.array_equal(got, expected, equal_nan=True)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_minmax_scale_matches_series(seed: int) -> None:
+    s = _panel(seed)["v"]
+    lo, hi = s.min(), s.max()
+    expected = ((s - lo) / (hi - lo + 1e-9)).to_numpy()
+    assert np.array_equal(minmax_scale(s), expected, equal_nan=True)
+    assert np.array_equal(_norm01(s).to_numpy(), expected, equal_nan=True)
+
+
+def test_minmax_scale_constant() -> None:
+    s = pd.Series([3.0] * 300)
+    assert np.array_equal(minmax_scale(s), ((s - 3.0) / (0.0 + 1e-9)).to_numpy())
+
+
+def test_band_matches_apply() -> None:
+    fgi = pd.Series([-5.0, 0.0, 30.999, 31.0, 60.5, 61.0, 85.999, 86.0, 100.0, 250.0, np.nan])
+    fgi = pd.concat([fgi, pd.Series(np.random.default_rng(0).uniform(-10, 110, 1000))], ignore_index=True)
+    expected = fgi.apply(_severity_band).to_numpy()
+    assert np.array_equal(band(fgi, SEVERITY_EDGES, SEVERITY_LABELS), expected)
@@ -1,19 +1,22 @@
 from __future__ import annotations
 
+import argparse
 import json
 import logging
 import pathlib
 import sys
+import tempfile
+import time
 import warnings
-from dataclasses import dataclass
+from dataclasses import dataclass, field, replace
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Literal, Optional, Tuple
+from typing import Any, ClassVar, Dict, Iterable, List, Literal, Mapping, Optional, Tuple
 
 import joblib
 import numpy as np
 import pandas as pd
 from sklearn.base import RegressorMixin
-from sklearn.model_selection import GroupKFold, KFold,TimeSeriesSplit, cross_val_score
+from sklearn.model_selection import GroupKFold, KFold,TimeSeriesSplit
 
 from sklearn.neighbors import NearestNeighbors
 from sklearn.pipeline import Pipeline
@@ -33,12 +36,45 @@ from shared.data_loader import (
     build_silver,
     build_gold,
     build_gold_multiyear,
+    source_fingerprints,
 )
+import shared.bronze_cache
+import shared.cv_scheduler
+import shared.data_loader
+import shared.early_stopping
+import shared.encoding
+import shared.features
+import shared.incremental
+import shared.kernels
+import shared.lags
+import shared.lazy
+import shared.multiyear_store
+import shared.temporal
+from shared.checkpoint import CheckpointStore, Step, StepRunner
+from shared.encoding import decode_keys
+from shared.cv_scheduler import CpuBudget, CVJob, FitTask, Split, fit_many, run_cv_jobs, share_readonly
+from shared.early_stopping import EarlyStoppingRegressor
+from shared.hyperparams import load_hyperparams
+from shared.incremental import UpdatePlan, full_plan, new_estimators, plan_update, warm_update_pipeline
+from shared.inference import (
+    CV_RESULTS_FILE,
+    FORECAST_CV_FILE,
+    PROJECTOR_CV_FILE,
+    TEMPORAL_SCALER_FILE,
+    forecast_model_path,
+    projector_model_path,
+    scoring_model_path,
+)
+from shared.lazy import LazyTables
+from shared.run_report import RunReport
+from shared.multiyear_store import MultiYearGoldStore
+from shared.temporal import TemporalFeatureEngineering
 from shared.features import ( 
     build_feature_matrix,
     FEATURE_COLS,
     build_feature_matrix_all_years,
-    build_forecast_dataset,
+    build_multi_horizon_dataset,
+    MultiHorizonDataset,
     FUTURE_STEPS,
     FORECAST_HORIZONS,
     STEP_TO_HORIZON,
@@ -52,6 +88,9 @@ from ensemble.blend import (
     weighted_average_ensemble,
     compute_agreement,
 )
+from ensemble.stacking import OOFStackingRegressor, fit_meta_model, oof_r2, stacking_cv_scores
+import ensemble.blend
+import ensemble.stacking
 
 
 logging.basicConfig(
@@ -69,13 +108,43 @@ class TrainConfig:
     data_dir: Path = Path("../../../data/")
     out_dir: Path = Path("models/artifacts")
     model_dir: Path = Path("models")
+    # Parquet cache of cleaned bronze tables; None disables caching.
+    bronze_cache_dir: Optional[Path] = Path("models/cache/bronze")
+    # Worker threads used to parse the bronze sources concurrently.
+    bronze_workers: int = 5
+    # Year-partitioned store for incremental multi-year gold rebuilds; None
+    # recomputes every year on each run.
+    multiyear_store_dir: Optional[Path] = Path("models/cache/gold_multiyear")
     random_state: int = 42
+    # Tuned model parameters written by search_hyperparams.py; used by
+    # build_models when the file exists.
+    hyperparams_path: Optional[Path] = Path("models/hyperparams.json")
 
 
     cv_splits: int = 5
+    # Total cores training may use (None: all available).  CV workers and
+    # model threads are carved out of this so they never oversubscribe it.
+    cpu_budget: Optional[int] = None
+    # Processes for the (model, fold, horizon) CV pool; None uses one per
+    # budgeted core, 1 runs the folds in-process.
+    cv_workers: Optional[int] = None
     cv_strategy: CVStrategy = "group_country" 
     scoring: str = "r2"
 
+    # Early stopping for the boosted models (LightGBM, XGBoost, GBR) of the
+    # forecast-horizon and projector sets: each CV fold holds out
+    # early_stopping_fraction of its training rows (the latest ones under
+    # time-ordered CV) and stops after early_stopping_patience rounds
+    # without improvement; full fits reuse the folds' median best
+    # iteration count.  Folds with fewer than early_stopping_min_rows
+    # training rows train without stopping.  The current-year set never
+    # stops early: at ~200 countries, holding rows out of its grouped
+    # folds lowered CV R2 more than stopping gained (LightGBM 0.85 -> 0.80).
+    early_stopping: bool = True
+    early_stopping_fraction: float = 0.2
+    early_stopping_patience: int = 30
+    early_stopping_min_rows: int = 100
+
     # Forecasting
     forecast_cv_strategy: CVStrategy = "time" 
     forecast_time_splits: int = 5
@@ -95,6 +164,24 @@ class TrainConfig:
     # Threshold above which a country is flagged as neglected (ensemble score >= value).
     neglect_flag_threshold: float = 65.0
 
+    # Also record per-stage Python-heap peaks (tracemalloc) in run_report.json.
+    # Off by default: tracing slows the tree-model fits several-fold.  RSS
+    # and timings are always recorded.
+    trace_memory: bool = False
+
+    # Persist each training step's outputs under out_dir/checkpoints and skip
+    # steps whose inputs, code and relevant config are unchanged.
+    checkpoint: bool = True
+
+    # Warm-start retraining: refresh the previous run's models on the rows
+    # added or revised since, instead of refitting from scratch.  A model set
+    # is fully retrained when the changed rows exceed incremental_max_delta
+    # of its last full retrain or any of their feature / target means is
+    # more than incremental_max_drift standard errors from the reference.
+    incremental: bool = False
+    incremental_max_delta: float = 0.25
+    incremental_max_drift: float = 4.0
+
 
 def clip_scores(x: np.ndarray, lo: float, hi: float) -> np.ndarray:
     return np.clip(x.astype(float), lo, hi)
@@ -116,13 +203,28 @@ def safe_int(x: Any, default: int = 0) -> int:
 def ensure_dir(p: Path) -> None:
     p.mkdir(parents=True, exist_ok=True)
 
-def build_models() -> Dict[str, RegressorMixin]:
+def group_labels(keys: pd.Series) -> np.ndarray:
+    """CV group labels: integer codes for encoded keys, raw values otherwise."""
+    if isinstance(keys.dtype, pd.CategoricalDtype):
+        return keys.cat.codes.to_numpy()
+    return keys.to_numpy()
+
+# Base model name -> definition module (build_model, warm_update).
+MODEL_DEFS = {
+    "LightGBM":     lgbm_def,
+    "RandomForest": rf_def,
+    "XGBoost":      xgb_def,
+    "GBR":          gbr_def,
+}
+
+def build_models(n_jobs: int = -1, hyperparams: Optional[Mapping[str, Mapping[str, Any]]] = None) -> Dict[str, RegressorMixin]:
+    # Base models only: "Stacking" is assembled from their fits and OOF
+    # predictions by CVStep.stacked.  hyperparams (see shared.hyperparams)
+    # override the definition modules' defaults per model name.
+    hyperparams = hyperparams or {}
     return {
-        "LightGBM":     lgbm_def.build_model(),
-        "RandomForest": rf_def.build_model(),
-        "XGBoost":      xgb_def.build_model(),
-        "GBR":          gbr_def.build_model(),
-        "Stacking":     stack_def.build_model(),
+        name: mod.build_model(n_jobs=n_jobs).set_params(**hyperparams.get(name, {}))
+        for name, mod in MODEL_DEFS.items()
     }
 
 BASE_KEYS: List[str] = ["LightGBM", "RandomForest", "XGBoost", "GBR"]
@@ -132,9 +234,25 @@ BASE_KEYS: List[str] = ["LightGBM", "RandomForest", "XGBoost", "GBR"]
 class DataStep:
     cfg: TrainConfig
 
-    def run(self) -> Tuple[Dict[str, pd.DataFrame], Dict[str, pd.DataFrame], Dict[str, pd.DataFrame]]:
+    # Per layer, the tables later steps read (features: current-year and
+    # multi-year inputs; artifacts: cluster and annual funding maps).  Only
+    # these are built by the data step and kept in its checkpoint.
+    OUTPUTS: ClassVar[Dict[str, Tuple[str, ...]]] = {
+        "bronze": ("fts_req", "fts_cluster", "pop_total"),
+        "silver": ("cbpf_index",),
+        "gold":   ("gold_fgi", "gold_efficiency"),
+    }
+
+    def run(self, prefetch: bool = True) -> Tuple[LazyTables, LazyTables, LazyTables]:
+        """
+        Return lazy bronze / silver / gold layers.  With ``prefetch`` every
+        bronze source is parsed up front in parallel (a full training run
+        needs all of them); otherwise tables load on first access.
+        """
         LOG.info("Loading data")
-        bronze = load_bronze(self.cfg.data_dir)
+        bronze = load_bronze(self.cfg.data_dir, cache_dir=self.cfg.bronze_cache_dir)
+        if prefetch:
+            bronze.materialize(workers=self.cfg.bronze_workers)
         silver = build_silver(bronze)
         gold = build_gold(bronze, silver)
 
@@ -154,7 +272,7 @@ class DataStep:
 class FeatureStep:
     cfg: TrainConfig
 
-    def build_current(self, bronze: Dict[str, pd.DataFrame], gold: Dict[str, pd.DataFrame]) -> Tuple[pd.DataFrame, np.ndarray, np.ndarray]:
+    def build_current(self, bronze: Mapping[str, pd.DataFrame], gold: Mapping[str, pd.DataFrame]) -> Tuple[pd.DataFrame, np.ndarray, np.ndarray]:
         feat, X, y = build_feature_matrix(
             gold["gold_fgi"],
             gold["gold_efficiency"],
@@ -162,9 +280,15 @@ class FeatureStep:
         )
         return feat, X, y
 
-    def build_multiyear(self, bronze: Dict[str, pd.DataFrame]) -> Tuple[pd.DataFrame, np.ndarray]:
+    def build_multiyear(
+        self,
+        bronze: Mapping[str, pd.DataFrame],
+        silver: Optional[Mapping[str, Any]] = None,
+    ) -> Tuple[pd.DataFrame, np.ndarray]:
         LOG.info("Building multi-year historical dataset for forecast model training")
-        gold_multiyear = build_gold_multiyear(bronze)
+        cbpf_index = silver.get("cbpf_index") if silver is not None else None
+        store = MultiYearGoldStore(self.cfg.multiyear_store_dir) if self.cfg.multiyear_store_dir is not None else None
+        gold_multiyear = build_gold_multiyear(bronze, cbpf_index=cbpf_index, store=store)
         feat_all, X_all, _ = build_feature_matrix_all_years(gold_multiyear)
         return feat_all, X_all
 
@@ -172,6 +296,30 @@ class FeatureStep:
 @dataclass
 class CVStep:
     cfg: TrainConfig
+    budget: CpuBudget = field(init=False)
+    # Tuned parameters per model set label and model name from
+    # cfg.hyperparams_path; untuned sets use the module defaults.
+    hyperparams: Dict[str, Dict[str, Dict[str, Any]]] = field(init=False, default_factory=dict)
+    # Per job label: OOF predictions of each base model, and the stacking
+    # meta-learner fit on them.
+    oof: Dict[str, Dict[str, np.ndarray]] = field(init=False, default_factory=dict)
+    stack_meta: Dict[str, Any] = field(init=False, default_factory=dict)
+    # Per job label and model: CV / full fit and predict seconds for the run report.
+    timings: Dict[str, Dict[str, Dict[str, float]]] = field(init=False, default_factory=dict)
+    # Per job label and boosted model: early-stopped iteration count for full fits.
+    iterations: Dict[str, Dict[str, int]] = field(init=False, default_factory=dict)
+
+    def __post_init__(self) -> None:
+        self.budget = CpuBudget.plan(self.cfg.cpu_budget, self.cfg.cv_workers)
+        self.hyperparams = load_hyperparams(self.cfg.hyperparams_path)
+        LOG.info(
+            "CPU budget: %d cores -> %d CV workers x %d model threads; full fits %d threads",
+            self.budget.cores, self.budget.cv_workers, self.budget.threads_per_worker, self.budget.fit_threads,
+        )
+
+    def params(self, label: str) -> Dict[str, Dict[str, Any]]:
+        """Tuned parameters per model name for the model set ``label`` ({} = module defaults)."""
+        return self.hyperparams.get(label, {})
 
     def _pipeline(self, model: RegressorMixin) -> Pipeline:
         return Pipeline(
@@ -181,6 +329,20 @@ class CVStep:
             ]
         )
 
+    def _early_stopping(self, name: str, model: RegressorMixin, time_ordered: bool) -> RegressorMixin:
+        stop = getattr(MODEL_DEFS.get(name), "fit_early_stopping", None)
+        if not self.cfg.early_stopping or stop is None:
+            return model
+        return EarlyStoppingRegressor(
+            model,
+            stop,
+            validation_fraction=self.cfg.early_stopping_fraction,
+            patience=self.cfg.early_stopping_patience,
+            time_ordered=time_ordered,
+            min_rows=self.cfg.early_stopping_min_rows,
+            random_state=self.cfg.random_state,
+        )
+
     def _get_splitter(
         self,
         X: np.ndarray,
@@ -192,7 +354,7 @@ class CVStep:
         if strategy == "group_country":
             if meta is None or "country_iso3" not in meta.columns:
                 return KFold(n_splits=n_splits, shuffle=True, random_state=self.cfg.random_state), None
-            groups = meta["country_iso3"].to_numpy()
+            groups = group_labels(meta["country_iso3"])
             n_groups = len(np.unique(groups))
             n_splits_safe = min(n_splits, n_groups)
             return GroupKFold(n_splits=n_splits_safe), groups
@@ -209,47 +371,157 @@ class CVStep:
 
             if time_col is None:
                 if "country_iso3" in meta.columns:
-                    groups = meta["country_iso3"].to_numpy()
+                    groups = group_labels(meta["country_iso3"])
                     return GroupKFold(n_splits=n_splits), groups
                 return KFold(n_splits=n_splits, shuffle=True, random_state=self.cfg.random_state), None
 
         
             order = np.argsort(meta[time_col].to_numpy())
-            X_ordered = X[order]  # only used to create correct fold sizes
             splitter = TimeSeriesSplit(n_splits=(time_splits or n_splits))
-            return splitter, ("__ORDER__", order, X_ordered.shape[0])
+            return splitter, ("__ORDER__", order, len(order))
 
         return KFold(n_splits=n_splits, shuffle=True, random_state=self.cfg.random_state), None
 
-    def _cv_scores(
+    def cv_job(
         self,
-        model: RegressorMixin,
+        label: str,
+        models: Dict[str, RegressorMixin],
         X: np.ndarray,
         y: np.ndarray,
         meta: Optional[pd.DataFrame],
         strategy: CVStrategy,
         n_splits: int,
         time_splits: Optional[int] = None,
-    ) -> np.ndarray:
-        pipe = self._pipeline(model)
+        header: str = "",
+        indent: int = 2,
+        rows: Optional[np.ndarray] = None,
+        early_stopping: bool = False,
+    ) -> CVJob:
+        """
+        Resolve the splitter into explicit folds so the job can be scheduled.
+        With ``rows``, ``X`` is a shared matrix and the dataset is ``X[rows]``.
+        ``early_stopping`` wraps the boosted models when cfg.early_stopping is on.
+        Unless the folds are time-ordered, the job carries one nested job
+        per fold for an honest stacking score (see ``_stack_from_oof``).
+        """
         splitter, groups = self._get_splitter(X, meta, strategy, n_splits, time_splits=time_splits)
 
-        if isinstance(groups, tuple) and groups and groups[0] == "__ORDER__":
+        time_ordered = isinstance(groups, tuple) and bool(groups) and groups[0] == "__ORDER__"
+        if time_ordered:
             _, order, _n = groups
-            Xo = X[order]
-            yo = y[order]
-            return cross_val_score(pipe, Xo, yo, cv=splitter, scoring=self.cfg.scoring)
+            y, groups = y[order], None
+            if rows is None:
+                X = X[order]
+            else:
+                rows = rows[order]
+
+        estimators = {
+            name: self._pipeline(self._early_stopping(name, mdl, time_ordered) if early_stopping else mdl)
+            for name, mdl in models.items()
+        }
+        # Folds depend only on the row count (and groups), not on X.
+        splits = list(splitter.split(np.zeros((len(y), 1)), y, groups))
+        nested = [] if time_ordered or not set(BASE_KEYS) <= set(models) else [
+            CVJob(
+                label=f"{label}/fold{k}",
+                estimators=estimators,
+                X=X,
+                y=y[train],
+                splits=self._inner_splits(meta, strategy, n_splits, train),
+                scoring=self.cfg.scoring,
+                rows=train if rows is None else rows[train],
+                report=False,
+            )
+            for k, (train, _test) in enumerate(splits)
+        ]
+        return CVJob(
+            label=label,
+            estimators=estimators,
+            X=X,
+            y=y,
+            splits=splits,
+            scoring=self.cfg.scoring,
+            header=header,
+            indent=indent,
+            rows=rows,
+            nested=nested,
+        )
 
-        if groups is None:
-            return cross_val_score(pipe, X, y, cv=splitter, scoring=self.cfg.scoring)
+    def _inner_splits(self, meta: Optional[pd.DataFrame], strategy: CVStrategy, n_splits: int, train: np.ndarray) -> List[Split]:
+        # The same kind of folds, drawn within one outer fold's training rows.
+        sub = None if meta is None else meta.iloc[train].reset_index(drop=True)
+        splitter, groups = self._get_splitter(np.zeros((len(train), 1)), sub, strategy, n_splits)
+        return list(splitter.split(np.zeros((len(train), 1)), None, groups))
+
+    def run_jobs(self, jobs: List[CVJob]) -> Dict[str, Dict[str, Dict[str, float]]]:
+        nested = [inner for job in jobs for inner in job.nested]
+        results = run_cv_jobs([*jobs, *nested], n_workers=self.budget.cv_workers, inner_threads=self.budget.threads_per_worker)
+        for job in jobs:
+            self.oof[job.label] = job.oof
+            for name, secs in job.timings.items():
+                self.record_timing(job.label, name, **secs)
+            for name, counts in job.iterations.items():
+                n_iter = int(round(float(np.median(counts))))
+                self.iterations.setdefault(job.label, {})[name] = n_iter
+                results[job.label][name]["n_estimators"] = n_iter
+                LOG.info("%s%-15s early stopping: %d rounds (folds %s)", " " * job.indent, name, n_iter, counts)
+            if all(k in job.oof for k in BASE_KEYS):
+                self._stack_from_oof(job, results[job.label])
+        return results
+
+    def _stack_from_oof(self, job: CVJob, cv: Dict[str, Dict[str, float]]) -> None:
+        # The meta-learner is scored on the base models' folds and fit on
+        # their OOF matrix.  Time-ordered folds need nothing more; otherwise
+        # each fold's meta-learner is fit on the OOF matrix of its nested
+        # job, whose base models never saw the fold's test rows.
+        oof = np.column_stack([job.oof[k] for k in BASE_KEYS])
+        for k in BASE_KEYS:
+            cv[k]["oof_r2"] = oof_r2(job.oof[k], job.y)
+        inner = [np.column_stack([n.oof[k] for k in BASE_KEYS]) for n in job.nested] or None
+        scores = stacking_cv_scores(oof, job.y, job.splits, stack_def.build_model(), scoring=self.cfg.scoring, inner_oof=inner)
+        cv["Stacking"] = {"mean": float(scores.mean()), "std": float(scores.std())}
+        LOG.info(
+            "%s%-15s R2=%.4f ± %.4f (%s, %s OOF meta-learner)", " " * job.indent, "Stacking", scores.mean(), scores.std(),
+            job.label, "nested" if inner else "time-ordered",
+        )
+        self.stack_meta[job.label] = fit_meta_model(oof, job.y, stack_def.build_model())
+
+    def stacked(self, label: str, fitted: Dict[str, Pipeline]) -> OOFStackingRegressor:
+        """The "Stacking" model for ``label`` over its full-fit base pipelines."""
+        return OOFStackingRegressor(
+            estimators=[(k, fitted[k]) for k in BASE_KEYS],
+            final_estimator=self.stack_meta[label],
+        )
+
+    def record_timing(self, label: str, name: str, **seconds: float) -> None:
+        """Add ``seconds`` (e.g. ``full_fit_s=1.2``) to the model's totals for ``label``."""
+        entry = self.timings.setdefault(label, {}).setdefault(name, {})
+        for key, value in seconds.items():
+            entry[key] = round(entry.get(key, 0) + value, 4)
 
-        return cross_val_score(pipe, X, y, cv=splitter, groups=groups, scoring=self.cfg.scoring)
+    def with_iterations(self, label: str, models: Dict[str, RegressorMixin]) -> Dict[str, RegressorMixin]:
+        """``models`` with each early-stopped model's n_estimators set to its CV best for ``label``."""
+        for name, n_iter in self.iterations.get(label, {}).items():
+            if name in models:
+                models[name].set_params(n_estimators=n_iter)
+        return models
 
     def fit_full(self, model: RegressorMixin, X: np.ndarray, y: np.ndarray) -> Pipeline:
         pipe = self._pipeline(model)
         pipe.fit(X, y)
         return pipe
 
+    def warm_update(self, label: str, name: str, pipe: Pipeline, X: np.ndarray, y: np.ndarray, n_rows: int) -> Pipeline:
+        """
+        Copy of ``label``'s ``pipe`` refreshed on the new rows ``(X, y)`` of
+        an ``n_rows`` training set.  The rounds added are the delta's share
+        of the rounds the fitted model actually holds, so an early-stopped
+        booster gets a proportionate top-up rather than one sized by the
+        configured n_estimators.
+        """
+        n_new = new_estimators(MODEL_DEFS[name].n_rounds(pipe.named_steps["model"]), len(y), n_rows)
+        return warm_update_pipeline(pipe, X, y, lambda m, Xs, ys: MODEL_DEFS[name].warm_update(m, Xs, ys, n_new))
+
     def cross_validate_models(
         self,
         models: Dict[str, RegressorMixin],
@@ -262,16 +534,8 @@ class CVStep:
         header: str = "",
         indent: int = 2,
     ) -> Dict[str, Dict[str, float]]:
-        if header:
-            LOG.info(header)
-
-        out: Dict[str, Dict[str, float]] = {}
-        pad = " " * indent
-        for name, mdl in models.items():
-            scores = self._cv_scores(mdl, X, y, meta, strategy, n_splits, time_splits=time_splits)
-            out[name] = {"mean": float(scores.mean()), "std": float(scores.std())}
-            LOG.info("%s%-15s R2=%.4f ± %.4f", pad, name, scores.mean(), scores.std())
-        return out
+        job = self.cv_job("models", models, X, y, meta, strategy, n_splits, time_splits=time_splits, header=header, indent=indent)
+        return self.run_jobs([job])["models"]
 
 
 @dataclass
@@ -279,14 +543,12 @@ class ScoringModelStep:
     cfg: TrainConfig
     cv: CVStep
 
-    def run(self, feat: pd.DataFrame, X: np.ndarray, y: np.ndarray) -> Tuple[pd.DataFrame, Dict[str, Pipeline], Dict[str, Dict[str, float]]]:
-        models = build_models()
-
+    def cv_job(self, feat: pd.DataFrame, X: np.ndarray, y: np.ndarray) -> CVJob:
         # meta for safer CV (prefer grouping by country)
         meta = feat[["country_iso3"]].copy() if "country_iso3" in feat.columns else None
-
-        cv_results = self.cv.cross_validate_models(
-            models=models,
+        return self.cv.cv_job(
+            "current",
+            models=build_models(n_jobs=self.cv.budget.threads_per_worker, hyperparams=self.cv.params("current")),
             X=X,
             y=y,
             meta=meta,
@@ -295,11 +557,46 @@ class ScoringModelStep:
             header="Cross-validating current-year models",
         )
 
-        LOG.info("Fitting current-year models on full dataset")
-        fitted: Dict[str, Pipeline] = {name: self.cv.fit_full(mdl, X, y) for name, mdl in models.items()}
+    def run(
+        self,
+        feat: pd.DataFrame,
+        X: np.ndarray,
+        y: np.ndarray,
+        cv_results: Optional[Dict[str, Dict[str, float]]] = None,
+        warm_from: Optional[Tuple[Dict[str, Pipeline], np.ndarray]] = None,
+    ) -> Tuple[pd.DataFrame, Dict[str, Pipeline], Dict[str, Dict[str, float]]]:
+        """
+        ``cv_results`` may be passed in when CV already ran in a shared
+        scheduler pass.  ``warm_from=(previous_models, delta_rows)`` refreshes
+        the previous models on rows ``delta_rows`` instead of refitting.
+        """
+        models = self.cv.with_iterations("current", build_models(n_jobs=self.cv.budget.fit_threads, hyperparams=self.cv.params("current")))
+
+        if cv_results is None:
+            cv_results = self.cv.run_jobs([self.cv_job(feat, X, y)])["current"]
+
+        fitted: Dict[str, Any] = {}
+        if warm_from is None:
+            LOG.info("Fitting current-year models on full dataset")
+            for name, mdl in models.items():
+                t0 = time.perf_counter()
+                fitted[name] = self.cv.fit_full(mdl, X, y)
+                self.cv.record_timing("current", name, full_fit_s=time.perf_counter() - t0)
+        else:
+            previous, delta = warm_from
+            LOG.info("Warm-starting current-year models on %d new rows", len(delta))
+            for name in models:
+                t0 = time.perf_counter()
+                fitted[name] = self.cv.warm_update("current", name, previous[name], X[delta], y[delta], n_rows=len(y))
+                self.cv.record_timing("current", name, warm_fit_s=time.perf_counter() - t0)
+        fitted["Stacking"] = self.cv.stacked("current", fitted)
 
         # Predict on full set (for artifacts)
-        preds = {name: clip_scores(pipe.predict(X), self.cfg.clip_min, self.cfg.clip_max) for name, pipe in fitted.items()}
+        preds: Dict[str, np.ndarray] = {}
+        for name, pipe in fitted.items():
+            t0 = time.perf_counter()
+            preds[name] = clip_scores(pipe.predict(X), self.cfg.clip_min, self.cfg.clip_max)
+            self.cv.record_timing("current", name, predict_s=time.perf_counter() - t0)
         preds["Ensemble"] = weighted_average_ensemble(preds, cv_results, BASE_KEYS)
         agreement = compute_agreement(preds, BASE_KEYS)
 
@@ -323,48 +620,103 @@ class ScoringModelStep:
 class ForecastStep:
     cfg: TrainConfig
     cv: CVStep
+    # Holds the memmapped forecast matrix for the lifetime of the step.
+    _shared_dir: Optional[tempfile.TemporaryDirectory] = field(init=False, default=None, repr=False)
+    _shared: Optional[Tuple[MultiHorizonDataset, MultiHorizonDataset]] = field(init=False, default=None, repr=False)
+
+    def shared_dataset(self, dataset: MultiHorizonDataset) -> MultiHorizonDataset:
+        """
+        ``dataset`` with ``X`` written once to a read-only memmap when
+        horizons train in a process pool, so workers map it instead of each
+        unpickling a copy.  Repeated calls with the same dataset reuse it.
+        """
+        if self.cv.budget.cv_workers <= 1 or isinstance(dataset.X, np.memmap):
+            return dataset
+        if self._shared is None or self._shared[0] is not dataset:
+            if self._shared_dir is None:
+                self._shared_dir = tempfile.TemporaryDirectory(prefix="crisislens-forecast-")
+            shared = replace(dataset, X=share_readonly(dataset.X, Path(self._shared_dir.name), "forecast_X"))
+            self._shared = (dataset, shared)
+        return self._shared[1]
+
+    def cv_jobs(self, dataset: MultiHorizonDataset) -> List[CVJob]:
+        # Every horizon's job reads the same shared X through its row indices.
+        dataset = self.shared_dataset(dataset)
+        jobs: List[CVJob] = []
+        for horizon_label, _horizon_years in FORECAST_HORIZONS:
+            rows = dataset.rows(horizon_label)
+            y_h = dataset.target(horizon_label)
+            meta_h = dataset.meta.iloc[rows].reset_index(drop=True)
+            n_countries = int(meta_h["country_iso3"].nunique()) if "country_iso3" in meta_h.columns else -1
+            LOG.info("Forecast horizon %s: %d training pairs (%s countries)", horizon_label, len(y_h), n_countries if n_countries >= 0 else "unknown")
+            jobs.append(self.cv.cv_job(
+                horizon_label,
+                models=build_models(n_jobs=self.cv.budget.threads_per_worker, hyperparams=self.cv.params(horizon_label)),
+                X=dataset.X,
+                y=y_h,
+                meta=meta_h,
+                strategy=self.cfg.forecast_cv_strategy,
+                n_splits=self.cfg.cv_splits,
+                time_splits=self.cfg.forecast_time_splits,
+                header=f"Cross-validating {horizon_label} forecast models",
+                indent=4,
+                rows=rows,
+                early_stopping=True,
+            ))
+        return jobs
 
     def train_forecast_models(
         self,
         feat_all: pd.DataFrame,
         X_all: np.ndarray,
+        cv_results: Optional[Dict[str, Dict[str, Dict[str, float]]]] = None,
+        dataset: Optional[MultiHorizonDataset] = None,
+        warm_from: Optional[Dict[str, Tuple[Dict[str, Pipeline], np.ndarray]]] = None,
     ) -> Tuple[Dict[str, Dict[str, Pipeline]], Dict[str, Dict[str, Dict[str, float]]]]:
+        """
+        ``warm_from`` maps a horizon label to ``(previous_models,
+        delta_rows)``; those horizons are refreshed on their new rows instead
+        of refit (``delta_rows`` index the horizon's training rows).
+        """
         # We train separate model sets per horizon label ("1yr", "2yr", etc.)
         forecast_models: Dict[str, Dict[str, Pipeline]] = {}
         forecast_cv: Dict[str, Dict[str, Dict[str, float]]] = {}
 
-        for horizon_label, horizon_years in FORECAST_HORIZONS:
-            X_h, y_h, meta_h = build_forecast_dataset(feat_all, horizon_years)
-
-            # Ensure meta_h is a DataFrame for our split logic
-            if not isinstance(meta_h, pd.DataFrame):
-                try:
-                    meta_h = pd.DataFrame(meta_h)
-                except Exception:
-                    meta_h = None  # type: ignore
-
-            n_pairs = len(y_h)
-            n_countries = int(meta_h["country_iso3"].nunique()) if (meta_h is not None and "country_iso3" in meta_h.columns) else -1
-            LOG.info("Forecast horizon %s: %d training pairs (%s countries)", horizon_label, n_pairs, n_countries if n_countries >= 0 else "unknown")
-
-            models = build_models()
-
-            h_cv = self.cv.cross_validate_models(
-                models=models,
-                X=X_h,
-                y=y_h,
-                meta=meta_h,
-                strategy=self.cfg.forecast_cv_strategy,
-                n_splits=self.cfg.cv_splits,
-                time_splits=self.cfg.forecast_time_splits,
-                header=f"Cross-validating {horizon_label} forecast models",
-                indent=4,
-            )
-
-            # Fit full horizon models
-            fitted = {name: self.cv.fit_full(mdl, X_h, y_h) for name, mdl in models.items()}
+        # One shared feature matrix; each horizon only selects its valid rows.
+        dataset = self.shared_dataset(dataset if dataset is not None else build_multi_horizon_dataset(feat_all, FORECAST_HORIZONS))
+        if cv_results is None:
+            cv_results = self.cv.run_jobs(self.cv_jobs(dataset))
+
+        warm_from = warm_from or {}
+        refit = [h for h, _years in FORECAST_HORIZONS if h not in warm_from]
+
+        # Horizons are independent: every (horizon, model) full fit is one
+        # task in a shared pool, reading X through its row indices.
+        workers, threads = self.cv.budget.pool(len(refit) * len(BASE_KEYS))
+        tasks = [
+            FitTask((horizon_label, name), self.cv._pipeline(mdl), dataset.X, dataset.target(horizon_label), dataset.rows(horizon_label))
+            for horizon_label in refit
+            for name, mdl in self.cv.with_iterations(horizon_label, build_models(n_jobs=threads, hyperparams=self.cv.params(horizon_label))).items()
+        ]
+        fit_seconds: Dict[Tuple[str, str], float] = {}
+        fitted_all = fit_many(tasks, n_workers=workers, inner_threads=threads, timings=fit_seconds) if tasks else {}
+        for (horizon_label, name), secs in fit_seconds.items():
+            self.cv.record_timing(horizon_label, name, full_fit_s=secs)
+
+        for horizon_label, (previous, delta) in warm_from.items():
+            LOG.info("Warm-starting %s forecast models on %d new rows", horizon_label, len(delta))
+            X_h = dataset.X[dataset.rows(horizon_label)]
+            y_h = dataset.target(horizon_label)
+            for name in BASE_KEYS:
+                t0 = time.perf_counter()
+                fitted_all[(horizon_label, name)] = self.cv.warm_update(horizon_label, name, previous[name], X_h[delta], y_h[delta], n_rows=len(y_h))
+                self.cv.record_timing(horizon_label, name, warm_fit_s=time.perf_counter() - t0)
+
+        for horizon_label, _horizon_years in FORECAST_HORIZONS:
+            fitted = {name: fitted_all[(horizon_label, name)] for name in BASE_KEYS}
+            fitted["Stacking"] = self.cv.stacked(horizon_label, fitted)
             forecast_models[horizon_label] = fitted
-            forecast_cv[horizon_label] = h_cv
+            forecast_cv[horizon_label] = cv_results[horizon_label]
 
         return forecast_models, forecast_cv
 
@@ -402,7 +754,11 @@ class ForecastStep:
             h_models = fitted_forecast[h_label]
             h_cv = forecast_cv[h_label]
 
-            preds = {name: clip_scores(pipe.predict(X_current), self.cfg.clip_min, self.cfg.clip_max) for name, pipe in h_models.items()}
+            preds: Dict[str, np.ndarray] = {}
+            for name, pipe in h_models.items():
+                t0 = time.perf_counter()
+                preds[name] = clip_scores(pipe.predict(X_current), self.cfg.clip_min, self.cfg.clip_max)
+                self.cv.record_timing(h_label, name, predict_s=time.perf_counter() - t0)
             preds["Ensemble"] = weighted_average_ensemble(preds, h_cv, BASE_KEYS)
             cache[label] = preds
 
@@ -444,6 +800,103 @@ class ForecastStep:
         return future
 
 
+@dataclass
+class ProjectorStep:
+    """
+    Model sets for ``TemporalProjector``: per forecast horizon, the base
+    models trained on the lagged ``TEMPORAL_FEATURE_COLS`` after the
+    temporal RobustScaler, which is how the projector feeds them.  CV runs
+    under ``projector_<horizon>`` labels, for the ensemble weights.
+    """
+
+    cfg: TrainConfig
+    cv: CVStep
+
+    @staticmethod
+    def label(horizon_label: str) -> str:
+        return f"projector_{horizon_label}"
+
+    def dataset(self, feat_all: pd.DataFrame) -> Tuple[pd.DataFrame, MultiHorizonDataset]:
+        """The lagged temporal features and their (unscaled) per-horizon training rows."""
+        tfe = TemporalFeatureEngineering
+        feat_t = tfe.compute_lag_features(feat_all)
+        return feat_t, tfe.build_temporal_multi_horizon_dataset(feat_t)
+
+    def training_sets(self, dataset: MultiHorizonDataset) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+        """Unscaled ``(X, y)`` of every projector model set, by ``projector_<horizon>`` label."""
+        return {self.label(h): (np.asarray(dataset.X[dataset.rows(h)]), dataset.target(h)) for h, _years in FORECAST_HORIZONS}
+
+    def train(
+        self,
+        feat_t: pd.DataFrame,
+        dataset: MultiHorizonDataset,
+    ) -> Tuple[Any, Dict[str, Dict[str, Pipeline]], Dict[str, Dict[str, Dict[str, float]]]]:
+        """Returns ``(scaler, {horizon: {model: pipeline}}, {horizon: cv_results})``."""
+        scaler, _X_scaled = TemporalFeatureEngineering.fit_temporal_scaler(feat_t)
+        X = scaler.transform(dataset.X)
+
+        jobs = [
+            self.cv.cv_job(
+                self.label(horizon_label),
+                models=build_models(n_jobs=self.cv.budget.threads_per_worker, hyperparams=self.cv.params(self.label(horizon_label))),
+                X=X,
+                y=dataset.target(horizon_label),
+                meta=dataset.meta.iloc[dataset.rows(horizon_label)].reset_index(drop=True),
+                strategy=self.cfg.forecast_cv_strategy,
+                n_splits=self.cfg.cv_splits,
+                time_splits=self.cfg.forecast_time_splits,
+                header=f"Cross-validating {horizon_label} projector models",
+                indent=4,
+                rows=dataset.rows(horizon_label),
+                early_stopping=True,
+            )
+            for horizon_label, _years in FORECAST_HORIZONS
+        ]
+        cv_results = self.cv.run_jobs(jobs)
+
+        workers, threads = self.cv.budget.pool(len(FORECAST_HORIZONS) * len(BASE_KEYS))
+        tasks = [
+            FitTask((horizon_label, name), self.cv._pipeline(mdl), X, dataset.target(horizon_label), dataset.rows(horizon_label))
+            for horizon_label, _years in FORECAST_HORIZONS
+            for name, mdl in self.cv.with_iterations(self.label(horizon_label), build_models(n_jobs=threads, hyperparams=self.cv.params(self.label(horizon_label)))).items()
+        ]
+        fit_seconds: Dict[Tuple[str, str], float] = {}
+        fitted = fit_many(tasks, n_workers=workers, inner_threads=threads, timings=fit_seconds)
+        for (horizon_label, name), secs in fit_seconds.items():
+            self.cv.record_timing(self.label(horizon_label), name, full_fit_s=secs)
+
+        models = {h: {name: fitted[(h, name)] for name in BASE_KEYS} for h, _years in FORECAST_HORIZONS}
+        return scaler, models, {h: cv_results[self.label(h)] for h, _years in FORECAST_HORIZONS}
+
+    def warm_update(
+        self,
+        scaler: Any,
+        previous: Dict[str, Dict[str, Pipeline]],
+        dataset: MultiHorizonDataset,
+        deltas: Dict[str, np.ndarray],
+    ) -> Dict[str, Dict[str, Pipeline]]:
+        """
+        ``previous`` refreshed on each horizon's new rows ``deltas[horizon]``
+        (positions in its training rows).  The rows go through the previous
+        run's temporal ``scaler``, which the projector keeps serving with,
+        so the existing trees see the inputs they were grown on.
+        """
+        X = scaler.transform(dataset.X)
+        models: Dict[str, Dict[str, Pipeline]] = {}
+        for horizon_label, _years in FORECAST_HORIZONS:
+            delta = deltas[horizon_label]
+            LOG.info("Warm-starting %s projector models on %d new rows", horizon_label, len(delta))
+            X_h, y_h = X[dataset.rows(horizon_label)], dataset.target(horizon_label)
+            models[horizon_label] = {}
+            for name in BASE_KEYS:
+                t0 = time.perf_counter()
+                models[horizon_label][name] = self.cv.warm_update(
+                    self.label(horizon_label), name, previous[horizon_label][name], X_h[delta], y_h[delta], n_rows=len(y_h),
+                )
+                self.cv.record_timing(self.label(horizon_label), name, warm_fit_s=time.perf_counter() - t0)
+        return models
+
+
 @dataclass
 class PeerStep:
     cfg: TrainConfig
@@ -478,27 +931,44 @@ class ArtifactStep:
         cv_results: Dict[str, Dict[str, float]],
     ) -> None:
         ensure_dir(self.cfg.out_dir)
-        ensure_dir(self.cfg.model_dir / "lgbm")
-        ensure_dir(self.cfg.model_dir / "rf")
-        ensure_dir(self.cfg.model_dir / "xgb")
-        ensure_dir(self.cfg.model_dir / "gbr")
-        ensure_dir(self.cfg.model_dir / "stack")
-
-        model_pkl_map = {
-            "LightGBM":     self.cfg.model_dir / "lgbm"  / "lgbm_neglect.pkl",
-            "RandomForest": self.cfg.model_dir / "rf"    / "rf_neglect.pkl",
-            "XGBoost":      self.cfg.model_dir / "xgb"   / "xgb_neglect.pkl",
-            "GBR":          self.cfg.model_dir / "gbr"   / "gbr_neglect.pkl",
-            "Stacking":     self.cfg.model_dir / "stack" / "stack_neglect.pkl",
-        }
-        for name, dest in model_pkl_map.items():
-            joblib.dump(fitted_current[name], dest)
-            LOG.info("Saved %s", dest.as_posix())
+        for name in [*BASE_KEYS, "Stacking"]:
+            self._dump(fitted_current[name], scoring_model_path(self.cfg.model_dir, name))
 
         with open(self.cfg.out_dir / "feature_names.json", "w") as f:
             json.dump(FEATURE_COLS, f, indent=2)
 
-        with open(self.cfg.out_dir / "cv_results.json", "w") as f:
+        with open(self.cfg.out_dir / CV_RESULTS_FILE, "w") as f:
+            json.dump(cv_results, f, indent=2)
+
+    def _dump(self, obj: Any, dest: Path) -> None:
+        ensure_dir(dest.parent)
+        joblib.dump(obj, dest)
+        LOG.info("Saved %s", dest.as_posix())
+
+    def save_forecast_models(
+        self,
+        fitted_forecast: Dict[str, Dict[str, Pipeline]],
+        forecast_cv: Dict[str, Dict[str, Dict[str, float]]],
+    ) -> None:
+        """Per-horizon forecast pipelines and their CV results, for the inference service."""
+        for horizon_label, fitted in fitted_forecast.items():
+            for name in [*BASE_KEYS, "Stacking"]:
+                self._dump(fitted[name], forecast_model_path(self.cfg.model_dir, horizon_label, name))
+        with open(self.cfg.out_dir / FORECAST_CV_FILE, "w") as f:
+            json.dump(forecast_cv, f, indent=2)
+
+    def save_projector(
+        self,
+        scaler: Any,
+        fitted: Dict[str, Dict[str, Pipeline]],
+        cv_results: Dict[str, Dict[str, Dict[str, float]]],
+    ) -> None:
+        """The temporal scaler and projector models ``TemporalProjector`` is built from."""
+        self._dump(scaler, self.cfg.out_dir / TEMPORAL_SCALER_FILE)
+        for horizon_label, models in fitted.items():
+            for name in BASE_KEYS:
+                self._dump(models[name], projector_model_path(self.cfg.model_dir, horizon_label, name))
+        with open(self.cfg.out_dir / PROJECTOR_CV_FILE, "w") as f:
             json.dump(cv_results, f, indent=2)
 
     def _score_at(self, step_preds: Dict[str, np.ndarray], k: str, i: int) -> float:
@@ -515,6 +985,8 @@ class ArtifactStep:
         cluster_bb_map: Dict[str, List[Dict[str, Any]]],
         annual_country_map: Dict[str, List[Dict[str, Any]]],
     ) -> List[Dict[str, Any]]:
+        feat = decode_keys(feat)
+
         # Stable row order
         iso3_list = feat["country_iso3"].astype(str).to_list() if "country_iso3" in feat.columns else []
         iso3_to_idx = {iso: i for i, iso in enumerate(iso3_list)}
@@ -595,12 +1067,12 @@ class ArtifactStep:
 
 def build_cluster_breakdown_map(gold_efficiency: pd.DataFrame) -> Dict[str, List[Dict[str, Any]]]:
     cluster_bb = (
-        gold_efficiency.groupby(["country_iso3", "cluster_name"])
+        gold_efficiency.groupby(["country_iso3", "cluster_name"], observed=True)
         .agg(bbr=("bbr", "mean"), bbr_z_score=("bbr_z_score", "mean"))
         .reset_index()
     )
     return (
-        cluster_bb.groupby("country_iso3")
+        cluster_bb.groupby("country_iso3", observed=True)
         .apply(lambda g: g[["cluster_name", "bbr", "bbr_z_score"]].to_dict("records"), include_groups=False)
         .to_dict()
     )
@@ -609,12 +1081,12 @@ def build_annual_funding_map(fts_req: pd.DataFrame) -> Dict[str, List[Dict[str,
     annual_country = (
         fts_req.dropna(subset=["req_usd", "funded_usd", "country_iso3"])
         .query("req_usd > 0")
-        .groupby(["country_iso3", "year"])[["req_usd", "funded_usd"]]
+        .groupby(["country_iso3", "year"], observed=True)[["req_usd", "funded_usd"]]
         .sum()
         .reset_index()
     )
     return (
-        annual_country.groupby("country_iso3")
+        annual_country.groupby("country_iso3", observed=True)
         .apply(lambda g: g[["year", "req_usd", "funded_usd"]].sort_values("year").to_dict("records"), include_groups=False)
         .to_dict()
     )
@@ -623,78 +1095,337 @@ def build_annual_funding_map(fts_req: pd.DataFrame) -> Dict[str, List[Dict[str,
 # -----------------------------------------------------------------------------
 # Orchestrator
 # -----------------------------------------------------------------------------
-@dataclass
-class TrainOrchestrator:
-    cfg: TrainConfig
+# Training DAG, in run order.  See TrainOrchestrator.steps for each step's
+# inputs and the config fields / code its checkpoint key covers.
+STEP_NAMES: Tuple[str, ...] = ("data", "features", "cv", "scoring", "forecast", "projector", "peers", "artifacts")
 
-    def run(self) -> None:
-        ensure_dir(self.cfg.out_dir)
-        ensure_dir(self.cfg.model_dir)
+MODEL_MODULES = (*MODEL_DEFS.values(), stack_def)
+# Code every model-fitting step runs: the CV / fit scheduler, stacking and
+# the ensemble weights.
+FIT_MODULES = (shared.cv_scheduler, ensemble.stacking, ensemble.blend)
+# Code that builds the bronze / silver / gold layers and the multi-year table.
+DATA_MODULES = (shared.data_loader, shared.bronze_cache, shared.encoding, shared.lazy, shared.multiyear_store, shared.kernels)
 
-        data_step = DataStep(self.cfg)
-        feat_step = FeatureStep(self.cfg)
-        cv_step = CVStep(self.cfg)
-        scoring_step = ScoringModelStep(self.cfg, cv_step)
-        forecast_step = ForecastStep(self.cfg, cv_step)
-        peer_step = PeerStep(self.cfg)
-        artifact_step = ArtifactStep(self.cfg)
 
-        bronze, _silver, gold = data_step.run()
+@dataclass
+class TrainOrchestrator:
+    cfg: TrainConfig
 
+    def __post_init__(self) -> None:
+        self.data_step = DataStep(self.cfg)
+        self.feat_step = FeatureStep(self.cfg)
+        self.cv_step = CVStep(self.cfg)
+        self.scoring_step = ScoringModelStep(self.cfg, self.cv_step)
+        self.forecast_step = ForecastStep(self.cfg, self.cv_step)
+        self.projector_step = ProjectorStep(self.cfg, self.cv_step)
+        self.peer_step = PeerStep(self.cfg)
+        self.artifact_step = ArtifactStep(self.cfg)
+        self.report = RunReport(trace_memory=self.cfg.trace_memory)
+        self._layers: Dict[str, LazyTables] = {}
+
+    def steps(self) -> List[Step]:
+        cv_config = ["random_state", "cv_splits", "cv_strategy", "scoring", "forecast_cv_strategy", "forecast_time_splits"]
+        early_stopping = ["early_stopping", "early_stopping_fraction", "early_stopping_patience", "early_stopping_min_rows"]
+        return [
+            Step("data", self._data,
+                 config=["data_dir"],
+                 code=[DataStep, *DATA_MODULES],
+                 sources=lambda: source_fingerprints(self.cfg.data_dir, self.cfg.bronze_cache_dir)),
+            Step("features", self._features, inputs=["data"],
+                 code=[FeatureStep, shared.features, shared.lags, *DATA_MODULES]),
+            Step("cv", self._cv, inputs=["features"],
+                 config=[*cv_config, *early_stopping, "incremental", "incremental_max_delta", "incremental_max_drift"],
+                 sources=lambda: {"hyperparams": json.dumps(self.cv_step.hyperparams, sort_keys=True)},
+                 code=[CVStep, ScoringModelStep.cv_job, ForecastStep.cv_jobs, build_models, shared.incremental, shared.early_stopping, *FIT_MODULES, *MODEL_MODULES]),
+            Step("scoring", self._scoring, inputs=["features", "cv"],
+                 config=["random_state", "clip_min", "clip_max"],
+                 code=[ScoringModelStep, CVStep, build_models, shared.incremental, shared.early_stopping, *FIT_MODULES, *MODEL_MODULES]),
+            Step("forecast", self._forecast, inputs=["features", "cv", "scoring"],
+                 config=["random_state", "clip_min", "clip_max", "interpolate_short_steps"],
+                 code=[ForecastStep, CVStep, build_models, shared.incremental, shared.early_stopping, *FIT_MODULES, *MODEL_MODULES]),
+            # Plans its own incremental updates (see _projector).
+            Step("projector", self._projector, inputs=["features"],
+                 config=[*cv_config, *early_stopping, "incremental", "incremental_max_delta", "incremental_max_drift"],
+                 sources=lambda: {"hyperparams": json.dumps(self.cv_step.hyperparams, sort_keys=True)},
+                 code=[ProjectorStep, CVStep, build_models, shared.temporal, shared.lags, shared.incremental, shared.early_stopping, *FIT_MODULES, *MODEL_MODULES]),
+            Step("peers", self._peers, inputs=["features", "scoring"],
+                 config=["peer_k", "peer_metric"],
+                 code=[PeerStep]),
+            # Writes files rather than returning data; cheap, so never cached.
+            Step("artifacts", self._artifacts, inputs=["data", "scoring", "forecast", "projector", "peers"], persist=False),
+        ]
+
+    def _data(self, inputs: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        bronze, silver, gold = self.data_step.run()
+        self._layers.update(bronze_parse=bronze.raw, bronze=bronze, silver=silver, gold=gold)
+        layers = {"bronze": bronze, "silver": silver, "gold": gold}
+        return {layer: {name: layers[layer][name] for name in names} for layer, names in DataStep.OUTPUTS.items()}
+
+    def _features(self, inputs: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        data = inputs["data"]
         # Current-year features
-        feat, X, y = feat_step.build_current(bronze, gold)
-
-        # Train scoring models
-        feat_scored, fitted_current, cv_results = scoring_step.run(feat, X, y)
+        with self.report.stage("current"):
+            feat, X, y = self.feat_step.build_current(data["bronze"], data["gold"])
 
         # Forecast features (multi-year)
-        feat_all, X_all = feat_step.build_multiyear(bronze)
+        with self.report.stage("multiyear"):
+            feat_all, X_all = self.feat_step.build_multiyear(data["bronze"], data["silver"])
+            forecast_data = build_multi_horizon_dataset(feat_all, FORECAST_HORIZONS)
+        return {"feat": feat, "X": X, "y": y, "feat_all": feat_all, "X_all": X_all, "forecast_data": forecast_data}
+
+    def _training_sets(self, features: Dict[str, Any]) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+        """``(X, y)`` of every model set: "current" and each forecast horizon."""
+        dataset = features["forecast_data"]
+        sets = {"current": (features["X"], features["y"])}
+        for horizon_label, _years in FORECAST_HORIZONS:
+            sets[horizon_label] = (np.asarray(dataset.X[dataset.rows(horizon_label)]), dataset.target(horizon_label))
+        return sets
+
+    def _plan_updates(self, sets: Dict[str, Tuple[np.ndarray, np.ndarray]], previous: Optional[Dict[str, Any]]) -> Dict[str, UpdatePlan]:
+        # ``previous`` is the last output of the step that trains ``sets``
+        # (with its "snapshots" and "hyperparams").
+        snapshots = (previous or {}).get("snapshots", {})
+        tuned = (previous or {}).get("hyperparams", {})
+        plans: Dict[str, UpdatePlan] = {}
+        for label, (X_l, y_l) in sets.items():
+            if not self.cfg.incremental:
+                plans[label] = full_plan(X_l, y_l, "incremental retraining disabled")
+                continue
+            if previous is not None and tuned.get(label, {}) != self.cv_step.params(label):
+                plans[label] = full_plan(X_l, y_l, "hyperparameters changed")
+                LOG.info("Retrain %-7s %-11s (%s)", label, plans[label].mode, plans[label].reason)
+                continue
+            plans[label] = plan_update(
+                snapshots.get(label), X_l, y_l,
+                max_delta=self.cfg.incremental_max_delta,
+                max_drift=self.cfg.incremental_max_drift,
+            )
+            LOG.info("Retrain %-7s %-11s (%s)", label, plans[label].mode, plans[label].reason)
+        return plans
+
+    def _cv(self, inputs: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        # Cross-validate current-year and every forecast horizon in one
+        # scheduler pass so all (model, fold, horizon) tasks share the pool.
+        # Model sets that will be warm-started keep their previous CV
+        # results and stacking meta-learner instead.
+        f = inputs["features"]
+        previous = self.runner.previous("cv") if self.cfg.incremental else None
+        plans = self._plan_updates(self._training_sets(f), previous)
+        jobs = [
+            job for job in [self.scoring_step.cv_job(f["feat"], f["X"], f["y"]), *self.forecast_step.cv_jobs(f["forecast_data"])]
+            if plans[job.label].mode == "full"
+        ]
+        cv_all = self.cv_step.run_jobs(jobs) if jobs else {}
+        for label, plan in plans.items():
+            if plan.mode == "incremental":
+                cv_all[label] = previous["cv_all"][label]
+                self.cv_step.oof[label] = previous["oof"][label]
+                self.cv_step.stack_meta[label] = previous["stack_meta"][label]
+                if label in previous.get("iterations", {}):
+                    self.cv_step.iterations[label] = previous["iterations"][label]
+        return {
+            "cv_all":      cv_all,
+            "oof":         dict(self.cv_step.oof),
+            "stack_meta":  dict(self.cv_step.stack_meta),
+            "iterations":  {label: dict(counts) for label, counts in self.cv_step.iterations.items()},
+            "timings":     {label: {k: dict(v) for k, v in t.items()} for label, t in self.cv_step.timings.items()},
+            "plans":       plans,
+            "snapshots":   {label: plan.snapshot for label, plan in plans.items()},
+            "hyperparams": self.cv_step.hyperparams,
+        }
+
+    def _restore_cv(self, cv_out: Dict[str, Any]) -> Dict[str, Dict[str, Dict[str, float]]]:
+        # When the cv step was skipped, load the state later steps read from CVStep.
+        if not set(cv_out["stack_meta"]) <= set(self.cv_step.stack_meta):
+            self.cv_step.oof.update(cv_out["oof"])
+            self.cv_step.stack_meta.update(cv_out["stack_meta"])
+            self.cv_step.iterations.update(cv_out.get("iterations", {}))
+            for label, t in cv_out["timings"].items():
+                for name, secs in t.items():
+                    self.cv_step.record_timing(label, name, **secs)
+        return cv_out["cv_all"]
+
+    def _warm_start(self, step: str, models_key: str, plans: Dict[str, UpdatePlan]) -> Dict[str, Tuple[Dict[str, Pipeline], np.ndarray]]:
+        """
+        ``{label: (previous_models, delta_rows)}`` for the model sets planned
+        as incremental whose previous models (from ``step``'s last
+        checkpoint) were trained on exactly the plan's base snapshot.
+        """
+        wanted = {label: plan for label, plan in plans.items() if plan.mode == "incremental"}
+        previous = self.runner.previous(step) if wanted else None
+        if previous is None:
+            if wanted:
+                LOG.warning("%s: no previous models to warm-start; refitting", step)
+            return {}
+        models = previous[models_key]
+        if step == "scoring":
+            models = {"current": models}
+        elif step == "projector":
+            models = {self.projector_step.label(h): m for h, m in models.items()}
+        warm: Dict[str, Tuple[Dict[str, Pipeline], np.ndarray]] = {}
+        for label, plan in wanted.items():
+            if previous.get("snapshot_ids", {}).get(label) == plan.base_id and label in models:
+                warm[label] = (models[label], plan.delta)
+            else:
+                LOG.warning("%s %s: previous models do not match the planned base; refitting", step, label)
+        return warm
+
+    def _scoring(self, inputs: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        f = inputs["features"]
+        cv_all = self._restore_cv(inputs["cv"])
+        plans = {"current": inputs["cv"]["plans"]["current"]}
+        warm = self._warm_start("scoring", "fitted_current", plans)
+        feat_scored, fitted_current, cv_results = self.scoring_step.run(
+            f["feat"], f["X"], f["y"], cv_results=cv_all["current"], warm_from=warm.get("current"),
+        )
+        return {
+            "feat_scored":    feat_scored,
+            "fitted_current": fitted_current,
+            "cv_results":     cv_results,
+            "snapshot_ids":   {"current": plans["current"].snapshot.id},
+        }
+
+    def _forecast(self, inputs: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        f = inputs["features"]
+        cv_all = self._restore_cv(inputs["cv"])
+        feat_scored = inputs["scoring"]["feat_scored"]
+        plans = {h: inputs["cv"]["plans"][h] for h, _years in FORECAST_HORIZONS}
 
         # Train per-horizon forecast models
-        fitted_forecast, forecast_cv = forecast_step.train_forecast_models(feat_all, X_all)
+        with self.report.stage("fit"):
+            fitted_forecast, forecast_cv = self.forecast_step.train_forecast_models(
+                f["feat_all"], f["X_all"],
+                cv_results={h: cv_all[h] for h, _years in FORECAST_HORIZONS},
+                dataset=f["forecast_data"],
+                warm_from=self._warm_start("forecast", "fitted_forecast", plans),
+            )
 
         # Produce future projections using current X (pipelines contain their own scaler).
         # current_preds enables true 6mo midpoint interpolation when interpolate_short_steps=True.
-        current_preds_for_interp: Dict[str, np.ndarray] = {
-            "LightGBM":     feat_scored["predicted_neglect"].to_numpy(),
-            "RandomForest": feat_scored["neglect_rf"].to_numpy(),
-            "XGBoost":      feat_scored["neglect_xgb"].to_numpy(),
-            "GBR":          feat_scored["neglect_gbr"].to_numpy(),
-            "Stacking":     feat_scored["neglect_stack"].to_numpy(),
-            "Ensemble":     feat_scored["neglect_ensemble"].to_numpy(),
+        with self.report.stage("project"):
+            current_preds_for_interp: Dict[str, np.ndarray] = {
+                "LightGBM":     feat_scored["predicted_neglect"].to_numpy(),
+                "RandomForest": feat_scored["neglect_rf"].to_numpy(),
+                "XGBoost":      feat_scored["neglect_xgb"].to_numpy(),
+                "GBR":          feat_scored["neglect_gbr"].to_numpy(),
+                "Stacking":     feat_scored["neglect_stack"].to_numpy(),
+                "Ensemble":     feat_scored["neglect_ensemble"].to_numpy(),
+            }
+            future = self.forecast_step.forecast_future(
+                X_current=f["X"],
+                fitted_forecast=fitted_forecast,
+                forecast_cv=forecast_cv,
+                current_preds=current_preds_for_interp,
+            )
+        return {
+            "fitted_forecast": fitted_forecast,
+            "forecast_cv":     forecast_cv,
+            "future":          future,
+            "snapshot_ids":    {h: plan.snapshot.id for h, plan in plans.items()},
+        }
+
+    def _projector(self, inputs: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        # The horizons share one temporal scaler, so they are warm-started
+        # together (on the previous scaler) or all retrained with a new one.
+        feat_t, dataset = self.projector_step.dataset(inputs["features"]["feat_all"])
+        sets = self.projector_step.training_sets(dataset)
+        previous = self.runner.previous("projector") if self.cfg.incremental else None
+        plans = self._plan_updates(sets, previous)
+        warm = self._warm_start("projector", "fitted", plans)
+        if len(warm) == len(plans):
+            scaler, cv_results = previous["scaler"], previous["cv_results"]
+            fitted = self.projector_step.warm_update(
+                scaler,
+                {h: warm[self.projector_step.label(h)][0] for h, _years in FORECAST_HORIZONS},
+                dataset,
+                {h: warm[self.projector_step.label(h)][1] for h, _years in FORECAST_HORIZONS},
+            )
+        else:
+            if warm:
+                LOG.info("Retrain projector sets in full: not every horizon can be warm-started")
+            plans = {
+                label: plan if plan.mode == "full" else full_plan(*sets[label], "another projector set is retrained")
+                for label, plan in plans.items()
+            }
+            scaler, fitted, cv_results = self.projector_step.train(feat_t, dataset)
+        return {
+            "scaler":       scaler,
+            "fitted":       fitted,
+            "cv_results":   cv_results,
+            "snapshots":    {label: plan.snapshot for label, plan in plans.items()},
+            "snapshot_ids": {label: plan.snapshot.id for label, plan in plans.items()},
+            "hyperparams":  {label: self.cv_step.params(label) for label in plans},
         }
-        future = forecast_step.forecast_future(
-            X_current=X,
-            fitted_forecast=fitted_forecast,
-            forecast_cv=forecast_cv,
-            current_preds=current_preds_for_interp,
-        )
 
+    def _peers(self, inputs: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
         # Peer mapping — X is scaled internally by compute_peers before fitting KNN.
-        peer_map = peer_step.compute_peers(feat_scored, X)
+        return {"peer_map": self.peer_step.compute_peers(inputs["scoring"]["feat_scored"], inputs["features"]["X"])}
+
+    def _artifacts(self, inputs: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        data, scoring = inputs["data"], inputs["scoring"]
 
         # Supporting maps for JSON
-        gold_efficiency = gold["gold_efficiency"]
-        fts_req = bronze["fts_req"]
-        cluster_bb_map = build_cluster_breakdown_map(gold_efficiency)
-        annual_country_map = build_annual_funding_map(fts_req)
+        cluster_bb_map = build_cluster_breakdown_map(data["gold"]["gold_efficiency"])
+        annual_country_map = build_annual_funding_map(data["bronze"]["fts_req"])
 
         # Save models + metadata
-        artifact_step.save_models(fitted_current, cv_results)
+        self.artifact_step.save_models(scoring["fitted_current"], scoring["cv_results"])
+        self.artifact_step.save_forecast_models(inputs["forecast"]["fitted_forecast"], inputs["forecast"]["forecast_cv"])
+        projector = inputs["projector"]
+        self.artifact_step.save_projector(projector["scaler"], projector["fitted"], projector["cv_results"])
 
         # Build and save country JSON
-        records = artifact_step.build_country_json(
-            feat=feat_scored,
-            future=future,
-            peer_map=peer_map,
+        records = self.artifact_step.build_country_json(
+            feat=scoring["feat_scored"],
+            future=inputs["forecast"]["future"],
+            peer_map=inputs["peers"]["peer_map"],
             cluster_bb_map=cluster_bb_map,
             annual_country_map=annual_country_map,
         )
-        out_path = artifact_step.save_country_json(records)
+        out_path = self.artifact_step.save_country_json(records)
+        return {"records": records, "out_path": out_path}
 
-        # Print summary
+    def _make_runner(self) -> StepRunner:
+        ensure_dir(self.cfg.out_dir)
+        ensure_dir(self.cfg.model_dir)
+        store = CheckpointStore(self.cfg.out_dir / "checkpoints") if self.cfg.checkpoint else None
+        self.runner = StepRunner(self.steps(), self.cfg, store=store, stage=self.report.stage)
+        return self.runner
+
+    def features(self) -> Dict[str, Any]:
+        """Outputs of the features step, running (or loading) the DAG up to it."""
+        runner = self._make_runner()
+        runner.run(until="features")
+        return runner.outputs("features")
+
+    def cv_job(self, label: str, features: Dict[str, Any]) -> CVJob:
+        """The CV job (models, data and folds) the cv step runs for ``label``."""
+        if label == "current":
+            return self.scoring_step.cv_job(features["feat"], features["X"], features["y"])
+        return next(job for job in self.forecast_step.cv_jobs(features["forecast_data"]) if job.label == label)
+
+    def run(self, from_step: Optional[str] = None, only_step: Optional[str] = None) -> None:
+        """
+        Run the training DAG.  Steps whose checkpoint is current are skipped;
+        ``from_step`` reruns that step and everything after it, ``only_step``
+        reruns just that step on the latest checkpoints of its inputs.
+        """
+        self._make_runner()
+        try:
+            outputs = self.runner.run(from_step=from_step, only_step=only_step)
+        finally:
+            self.report.add("steps", self.runner.status)
+            self.report.add("parallelism", self.cv_step.budget.as_dict())
+            self.report.add("models", self.cv_step.timings)
+            self.report.add("tables", {name: dict(layer.timings) for name, layer in self._layers.items()})
+            self.report.write(self.cfg.out_dir / "run_report.json")
+
+        if "artifacts" in outputs:
+            self.log_summary(outputs["artifacts"]["records"], outputs["artifacts"]["out_path"])
+
+    def log_summary(self, records: List[Dict[str, Any]], out_path: Path) -> None:
         LOG.info("Artifacts written: %s", self.cfg.out_dir.as_posix())
-        LOG.info("  feature_names.json, cv_results.json, gold_country_scores.json")
+        LOG.info("  feature_names.json, %s, %s, %s, %s, run_report.json", CV_RESULTS_FILE, FORECAST_CV_FILE, PROJECTOR_CV_FILE, TEMPORAL_SCALER_FILE)
         LOG.info("  gold_country_scores.json (%d countries)", len(records))
 
         n_neglect = sum(bool(r.get("neglectFlag")) for r in records)
@@ -720,7 +1451,15 @@ class TrainOrchestrator:
 # -----------------------------------------------------------------------------
 # Entrypoint
 # -----------------------------------------------------------------------------
-def main() -> None:
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Train the CrisisLens neglect scoring and forecast models.")
+    resume = parser.add_mutually_exclusive_group()
+    resume.add_argument("--from-step", choices=STEP_NAMES, help="rerun this step and every later one, reusing earlier checkpoints")
+    resume.add_argument("--only-step", choices=STEP_NAMES, help="rerun only this step, on the latest checkpoints of its inputs")
+    parser.add_argument("--no-checkpoint", action="store_true", help="run every step without reading or writing checkpoints")
+    parser.add_argument("--incremental", action="store_true", help="warm-start the previous run's models on new rows where drift allows")
+    args = parser.parse_args(argv)
+
     cfg = TrainConfig(
         data_dir=Path("../../../data/"),
         out_dir=Path("models/artifacts"),
@@ -731,8 +1470,10 @@ def main() -> None:
         cv_splits=5,
         forecast_time_splits=5,
         interpolate_short_steps=True,
+        checkpoint=not args.no_checkpoint,
+        incremental=args.incremental,
     )
-    TrainOrchestrator(cfg).run()
+    TrainOrchestrator(cfg).run(from_step=args.from_step, only_step=args.only_step)
 
 
 if __name__ == "__main__":
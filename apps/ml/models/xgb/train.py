@@ -1,7 +1,20 @@
+from scipy.stats import loguniform, randint, uniform
 from xgboost import XGBRegressor
 
 
-def build_model():
+# Searched by search_hyperparams.py (n_estimators is the halving budget).
+SEARCH_SPACE = {
+    "learning_rate":    loguniform(0.01, 0.2),
+    "max_depth":        randint(3, 9),
+    "min_child_weight": loguniform(0.5, 10.0),
+    "subsample":        uniform(0.6, 0.4),
+    "colsample_bytree": uniform(0.5, 0.5),
+    "reg_alpha":        loguniform(1e-3, 1.0),
+    "reg_lambda":       loguniform(1e-3, 1.0),
+}
+
+
+def build_model(n_jobs: int = -1):
     return XGBRegressor(
         n_estimators=400,
         learning_rate=0.04,
@@ -12,5 +25,25 @@ def build_model():
         reg_lambda=0.1,
         random_state=42,
         verbosity=0,
-        n_jobs=-1,
+        n_jobs=n_jobs,
     )
+
+
+def fit_early_stopping(model, X, y, X_val, y_val, patience: int) -> int:
+    # predict() uses the best iteration once early_stopping_rounds is set.
+    model.set_params(early_stopping_rounds=patience)
+    model.fit(X, y, eval_set=[(X_val, y_val)], verbose=False)
+    return int(model.best_iteration) + 1
+
+
+def n_rounds(model) -> int:
+    # Boosting rounds the fitted booster holds (after early stopping and
+    # earlier warm updates), not the n_estimators it was asked for.
+    return int(model.get_booster().num_boosted_rounds())
+
+
+def warm_update(model, X, y, n_estimators: int):
+    # Continue boosting from the fitted booster on X (the new rows) only.
+    booster = model.get_booster()
+    model.set_params(n_estimators=n_estimators)
+    return model.fit(X, y, xgb_model=booster)